@@ -2,14 +2,35 @@
 
 # Standard library imports
 from datetime import datetime
+import json
+import os
 import re
+import threading
 
 # Third-party imports
-from flask import Flask, jsonify, render_template, request
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    render_template,
+    request,
+    send_file,
+)
 
 # Local imports
 import config
-from emby_client import EmbyClient
+from emby_client import (
+    FIELD_PROFILES,
+    INDEXED_ITEM_TYPES,
+    EmbyClient,
+    build_completed_tasks,
+    build_processing_media,
+    filter_active_tasks,
+)
+from image_cache import ImageCache, default_cache_dir
+from poller import EmbyPoller
+from response_cache import ResponseCache
+from search_index import LibraryIndexer, SearchIndex
 
 app = Flask(__name__)
 
@@ -21,10 +42,121 @@ def get_emby_client() -> EmbyClient:
     """Get or create Emby client instance."""
     global emby
     if emby is None:
-        emby = EmbyClient(config.EMBY_SERVER_URL, config.EMBY_API_KEY)
+        emby = EmbyClient(
+            config.EMBY_SERVER_URL,
+            config.EMBY_API_KEY,
+            pool_connections=config.EMBY_POOL_CONNECTIONS,
+            pool_maxsize=config.EMBY_POOL_MAXSIZE,
+            pool_block=config.EMBY_POOL_BLOCK,
+            timeout=config.EMBY_REQUEST_TIMEOUT,
+            cache=(
+                ResponseCache(max_entries=config.EMBY_CACHE_MAX_ENTRIES)
+                if config.EMBY_CACHE_ENABLED
+                else None
+            ),
+            coalesce_requests=config.EMBY_COALESCE_REQUESTS,
+        )
     return emby
 
 
+# Disk cache for proxied images
+image_cache = None
+
+
+def get_image_cache() -> ImageCache:
+    """Get or create the image cache, or None when it is disabled."""
+    global image_cache
+    if image_cache is None and config.IMAGE_CACHE_ENABLED:
+        image_cache = ImageCache(
+            os.path.expanduser(config.IMAGE_CACHE_DIR or default_cache_dir()),
+            max_bytes=config.IMAGE_CACHE_MAX_MB * 1024 * 1024,
+        )
+    return image_cache
+
+
+# Local search index, loaded in the background on first use
+search_index = None
+search_indexer = None
+_search_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """Get the search index, starting its background loader on first use."""
+    global search_index, search_indexer
+    with _search_index_lock:
+        if search_index is None:
+            search_index = SearchIndex()
+            search_indexer = LibraryIndexer(
+                get_emby_client(),
+                search_index,
+                refresh_interval=config.SEARCH_INDEX_REFRESH_INTERVAL,
+            )
+            search_indexer.start()
+    return search_index
+
+
+# Background poller and formatted views derived from its snapshot
+poller = None
+emby_websocket = None
+_poller_lock = threading.Lock()
+_views = {}
+
+
+def get_poller() -> EmbyPoller:
+    """Get or start the background poller instance."""
+    global poller
+    with _poller_lock:
+        if poller is None:
+            poller = EmbyPoller(
+                get_emby_client(),
+                processing_interval=config.PROCESSING_REFRESH_INTERVAL,
+                status_interval=config.STATUS_REFRESH_INTERVAL,
+            )
+            poller.start()
+            if config.EMBY_WEBSOCKET_ENABLED:
+                start_websocket(poller)
+    return poller
+
+
+def start_websocket(state_poller: EmbyPoller):
+    """Feed task and session pushes from the Emby WebSocket into the poller."""
+    global emby_websocket
+    emby_websocket = get_emby_client().create_websocket(
+        on_tasks=lambda tasks: state_poller.update("tasks", tasks),
+        on_sessions=lambda sessions: state_poller.update("sessions", sessions),
+        on_library_changed=lambda data: (
+            search_indexer.on_library_changed(data) if search_indexer else None
+        ),
+        on_connection_change=state_poller.set_pushed,
+        url=config.EMBY_WEBSOCKET_URL or None,
+    )
+    emby_websocket.start()
+
+
+def poller_view(view_name: str, source: str, formatter):
+    """
+    Return formatter(value of source), memoized per snapshot version.
+
+    With the background poller enabled this never waits on Emby; the
+    formatted payload is rebuilt only when the underlying data changes.
+    """
+    if not config.BACKGROUND_POLLER_ENABLED:
+        fetchers = {
+            "system_info": get_emby_client().get_system_info,
+            "tasks": get_emby_client().get_scheduled_tasks,
+            "sessions": get_emby_client().get_sessions,
+        }
+        return formatter(fetchers[source]())
+
+    value, version = get_poller().get(source)
+    cached = _views.get(view_name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    payload = formatter(value)
+    _views[view_name] = (version, payload)
+    return payload
+
+
 # Global variable to cache server ID
 emby_server_id = None
 
@@ -107,28 +239,30 @@ def index():
     return render_template("index.html")
 
 
+def format_status(system_info):
+    """Format system info for the status endpoint."""
+    if not system_info:
+        return None
 
+    return {
+        "server_name": system_info.get("ServerName", "Unknown"),
+        "version": system_info.get("Version", "Unknown"),
+        "operating_system": system_info.get("OperatingSystem", "Unknown"),
+        "is_shutting_down": system_info.get("IsShuttingDown", False),
+        "has_pending_restart": system_info.get("HasPendingRestart", False),
+        "can_self_restart": system_info.get("CanSelfRestart", False),
+    }
 
 
 @app.route("/api/status")
 def get_status():
     """Get server status."""
-    client = get_emby_client()
-    system_info = client.get_system_info()
+    status = poller_view("status", "system_info", format_status)
 
-    if not system_info:
+    if not status:
         return jsonify({"error": "Could not connect to Emby server"}), 500
 
-    return jsonify(
-        {
-            "server_name": system_info.get("ServerName", "Unknown"),
-            "version": system_info.get("Version", "Unknown"),
-            "operating_system": system_info.get("OperatingSystem", "Unknown"),
-            "is_shutting_down": system_info.get("IsShuttingDown", False),
-            "has_pending_restart": system_info.get("HasPendingRestart", False),
-            "can_self_restart": system_info.get("CanSelfRestart", False),
-        }
-    )
+    return jsonify(status)
 
 
 @app.route("/api/server-details")
@@ -193,23 +327,39 @@ def get_server_details():
     )
 
 
+@app.route("/api/cache-stats")
+def get_cache_stats():
+    """Get Emby response cache, coalescing and WebSocket counters."""
+    stats = get_emby_client().cache_stats()
+    if get_image_cache() is not None:
+        stats["images"] = get_image_cache().stats()
+    if search_index is not None:
+        stats["search_index"] = search_index.stats()
+    if emby_websocket is not None:
+        stats["websocket"] = {
+            "connected": emby_websocket.connected,
+            "messages_received": emby_websocket.messages_received,
+            "keepalives_sent": emby_websocket.keepalives_sent,
+        }
+    return jsonify(stats)
+
+
 @app.route("/api/server-time")
 def get_server_time():
     """Get current server time."""
     return jsonify({"server_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
 
 
-@app.route("/api/current-processing")
-def get_current_processing():
-    """Get currently processing media."""
-    client = get_emby_client()
-    processing = client.get_processing_media()
+def format_processing(tasks):
+    """Format active scheduled tasks as currently processing media."""
+    processing = build_processing_media(filter_active_tasks(tasks))
 
     # Format the data for display
     formatted = []
     for item in processing:
         formatted.append(
             {
+                "id": item.get("id", ""),
                 "task_name": item.get("task_name", "Unknown"),
                 "state": item.get("state", "Unknown"),
                 "progress": round(item.get("progress", 0), 1),
@@ -221,14 +371,12 @@ def get_current_processing():
             }
         )
 
-    return jsonify(formatted)
+    return formatted
 
 
-@app.route("/api/completed-tasks")
-def get_completed_tasks():
-    """Get recently completed tasks."""
-    client = get_emby_client()
-    completed = client.get_completed_tasks(limit=15)
+def format_completed_tasks(tasks):
+    """Format the recently completed scheduled tasks."""
+    completed = build_completed_tasks(tasks, limit=15)
 
     # Format the data
     formatted = []
@@ -245,18 +393,25 @@ def get_completed_tasks():
             }
         )
 
-    return jsonify(formatted)
+    return formatted
 
 
-@app.route("/api/indexed-media")
-def get_indexed_media():
-    """Get recently indexed media."""
-    client = get_emby_client()
-    limit = request.args.get("limit", 50, type=int)
+@app.route("/api/current-processing")
+def get_current_processing():
+    """Get currently processing media."""
+    return jsonify(poller_view("processing", "tasks", format_processing))
 
-    items = client.get_recently_added(limit=limit)
 
-    # Format the data
+@app.route("/api/completed-tasks")
+def get_completed_tasks():
+    """Get recently completed tasks."""
+    return jsonify(
+        poller_view("completed", "tasks", format_completed_tasks)
+    )
+
+
+def format_indexed_media(items):
+    """Format recently added items for the indexed media list."""
     formatted = []
     for item in items:
         formatted.append(
@@ -272,17 +427,23 @@ def get_indexed_media():
             }
         )
 
-    return jsonify(formatted)
+    return formatted
 
 
-@app.route("/api/all-tasks")
-def get_all_tasks():
-    """Get all scheduled tasks."""
+@app.route("/api/indexed-media")
+def get_indexed_media():
+    """Get recently indexed media."""
     client = get_emby_client()
-    tasks = client.get_scheduled_tasks()
+    limit = request.args.get("limit", 50, type=int)
+
+    items = client.get_recently_added(limit=limit)
+    return jsonify(format_indexed_media(items))
 
+
+def format_all_tasks(tasks):
+    """Format every scheduled task for the task list."""
     if not tasks:
-        return jsonify([])
+        return []
 
     formatted = []
     for task in tasks:
@@ -304,17 +465,19 @@ def get_all_tasks():
             }
         )
 
-    return jsonify(formatted)
+    return formatted
 
 
-@app.route("/api/now-playing")
-def get_now_playing():
-    """Get currently playing items."""
-    client = get_emby_client()
-    sessions = client.get_sessions()
+@app.route("/api/all-tasks")
+def get_all_tasks():
+    """Get all scheduled tasks."""
+    return jsonify(poller_view("all_tasks", "tasks", format_all_tasks))
+
 
+def format_now_playing(sessions):
+    """Format sessions that are currently playing something."""
     active_sessions = []
-    for session in sessions:
+    for session in sessions or []:
         if "NowPlayingItem" in session:
             item = session["NowPlayingItem"]
             play_state = session.get("PlayState", {})
@@ -338,8 +501,8 @@ def get_now_playing():
                     "episode": item.get("IndexNumber", ""),
                     "year": item.get("ProductionYear", ""),
                     "runtime_ticks": item.get("RunTimeTicks", 0),
-                    "primary_image_tag": item.get("ImageTags", {}).get("Primary"),
-                    "backdrop_image_tag": item.get("BackdropImageTags", [None])[0],
+                    "primary_image_tag": (item.get("ImageTags") or {}).get("Primary"),
+                    "backdrop_image_tag": (item.get("BackdropImageTags") or [None])[0],
                 },
                 "play_state": {
                     "position_ticks": play_state.get("PositionTicks", 0),
@@ -357,98 +520,316 @@ def get_now_playing():
             }
             active_sessions.append(session_data)
 
-    return jsonify(active_sessions)
+    return active_sessions
 
 
-@app.route("/api/image/<item_id>")
-def get_image(item_id):
-    """Proxy images from Emby server with fallback to thumbnails."""
-    try:
-        import requests
+@app.route("/api/now-playing")
+def get_now_playing():
+    """Get currently playing items."""
+    return jsonify(poller_view("now_playing", "sessions", format_now_playing))
+
+
+def diff_keyed(previous, current, key):
+    """
+    Diff two lists of dicts by a key field.
+
+    Returns:
+        Dictionary with the changed or new entries ("upserted"), the keys
+        that disappeared ("removed") and the full key order ("order")
+    """
+    previous_by_key = {entry.get(key): entry for entry in previous or []}
+    current_keys = [entry.get(key) for entry in current]
+    current_key_set = set(current_keys)
+    return {
+        "upserted": [
+            entry for entry in current
+            if previous_by_key.get(entry.get(key)) != entry
+        ],
+        "removed": [k for k in previous_by_key if k not in current_key_set],
+        "order": current_keys,
+    }
+
+
+def format_sse(event: str, data) -> str:
+    """Encode one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route("/api/events")
+def stream_events():
+    """Push status, processing and now-playing changes as Server-Sent Events."""
+    if not config.BACKGROUND_POLLER_ENABLED:
+        # 204 tells EventSource not to reconnect; the page falls back to polling
+        return "", 204
+
+    state_poller = get_poller()
+
+    def generate():
+        sent = {}
+        version = None
+        yield f"retry: {config.SSE_RETRY_MS}\n\n"
+        while True:
+            try:
+                status = poller_view("status", "system_info", format_status)
+            except Exception as e:
+                print(f"Error formatting status event: {e}")
+                status = sent.get("status")
+            if "status" not in sent or sent["status"] != status:
+                sent["status"] = status
+                yield format_sse(
+                    "status",
+                    status or {"error": "Could not connect to Emby server"},
+                )
+
+            for event, view_name, source, formatter, key in (
+                ("processing", "processing", "tasks", format_processing, "id"),
+                (
+                    "now-playing", "now_playing", "sessions",
+                    format_now_playing, "session_id",
+                ),
+            ):
+                # A malformed item must not end the stream for every view
+                try:
+                    payload = poller_view(view_name, source, formatter)
+                except Exception as e:
+                    print(f"Error formatting {event} event: {e}")
+                    continue
+                if event not in sent or sent[event] != payload:
+                    yield format_sse(
+                        event, diff_keyed(sent.get(event), payload, key)
+                    )
+                    sent[event] = payload
+
+            # Doubles as a keep-alive so proxies do not drop idle streams
+            yield format_sse(
+                "server-time",
+                {"server_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
+            )
+            version = state_poller.wait_for_change(
+                version, timeout=config.SSE_HEARTBEAT_INTERVAL
+            )
 
-        # Use higher quality settings and preserve aspect ratio
-        # Only set maxHeight to avoid distortion
-        params = {"maxHeight": 450, "quality": 95}
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-        # Try Primary image first
-        image_url = (
-            f"{config.EMBY_SERVER_URL}/emby/Items/{item_id}/Images/Primary"
-        )
-        response = requests.get(
-            image_url,
-            params=params,
-            headers={"X-Emby-Token": config.EMBY_API_KEY},
-            timeout=5
-        )
 
-        # If Primary image not found, try Thumb
-        if response.status_code == 404:
-            image_url = (
-                f"{config.EMBY_SERVER_URL}/emby/Items/{item_id}/Images/Thumb"
-            )
-            response = requests.get(
-                image_url,
-                params=params,
-                headers={"X-Emby-Token": config.EMBY_API_KEY},
-                timeout=5
-            )
+# Tagged image URLs change whenever the image does, so their bytes never do
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+IMAGE_CHUNK_SIZE = 64 * 1024
 
-        if response.status_code == 200:
-            from flask import Response  # type: ignore
+# Heights Emby is asked to render; requested sizes snap up to one of these
+# so every page shares a handful of cacheable derivatives
+IMAGE_SIZE_BUCKETS = (80, 150, 200, 300, 450)
+image_fetch_slots = threading.BoundedSemaphore(config.IMAGE_FETCH_CONCURRENCY)
 
-            return Response(
-                response.content,
-                mimetype=response.headers.get("Content-Type", "image/jpeg"),
-            )
-        return "", 404
-    except Exception:
-        return "", 404
 
+def image_fetch_releaser(response):
+    """
+    Return a callable that closes an upstream image response and frees
+    its fetch slot, doing so only on the first call.
+    """
+    lock = threading.Lock()
+    released = []
 
-@app.route("/api/person-image/<person_id>")
-def get_person_image(person_id):
-    """Proxy person images from Emby server with fallback to thumbnails."""
-    try:
-        import requests
+    def release():
+        with lock:
+            if released:
+                return
+            released.append(True)
+        if response is not None:
+            response.close()
+        image_fetch_slots.release()
 
-        # Use higher quality settings and preserve aspect ratio
-        params = {"maxHeight": 200, "quality": 95}
+    return release
 
-        # Try Primary image first
-        image_url = (
-            f"{config.EMBY_SERVER_URL}/emby/Items/{person_id}/Images/Primary"
-        )
-        response = requests.get(
-            image_url,
-            params=params,
-            headers={"X-Emby-Token": config.EMBY_API_KEY},
-            timeout=5
-        )
 
-        # If Primary image not found, try Thumb
-        if response.status_code == 404:
-            image_url = (
-                f"{config.EMBY_SERVER_URL}/emby/Items/{person_id}/Images/Thumb"
+def stream_image(chunks, release):
+    """
+    Yield an upstream image body, releasing the fetch when it ends.
+
+    The WSGI server normally closes the response (see call_on_close), but
+    the development server can skip that when the browser disconnects;
+    closing this generator, even from garbage collection, still releases.
+    """
+    try:
+        yield from chunks
+    finally:
+        release()
+
+
+def image_response(response: Response, etag: str, last_modified, tagged: bool):
+    """
+    Attach validators and caching headers to an image response.
+
+    Tagged URLs are cacheable forever; untagged ones must be revalidated,
+    which is cheap because the validators turn repeats into 304s.
+    """
+    if etag:
+        response.headers["ETag"] = etag
+    if last_modified:
+        response.headers["Last-Modified"] = last_modified
+    # The body depends on the negotiated format
+    response.vary.add("Accept")
+    if tagged:
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def image_size_bucket(requested, default: int) -> int:
+    """Snap a requested image height up to the nearest size bucket."""
+    try:
+        size = int(requested)
+    except (TypeError, ValueError):
+        return default
+    for bucket in IMAGE_SIZE_BUCKETS:
+        if size <= bucket:
+            return bucket
+    return IMAGE_SIZE_BUCKETS[-1]
+
+
+def negotiate_image_format() -> str:
+    """
+    Pick the output format Emby should encode the image in.
+
+    Returns "webp" when the browser lists it explicitly in Accept, or ""
+    to keep Emby's default (JPEG for posters). Emby cannot encode AVIF.
+    """
+    for mimetype, quality in request.accept_mimetypes:
+        if mimetype == "image/webp" and quality > 0:
+            return "webp"
+    return ""
+
+
+def proxy_image(item_id: str, default_size: int):
+    """
+    Proxy an item image from Emby over the client's pooled session.
+
+    The ``size`` query parameter picks a height bucket and the Accept
+    header the format, so Emby renders each variant once at the size
+    it is shown. Requests carrying the image ``tag`` are served from the
+    disk cache; the tag changes whenever the image does, so entries never
+    go stale. Untagged requests forward the browser's validators to Emby
+    so an unchanged image costs a 304 on both hops.
+    """
+    try:
+        cache = get_image_cache()
+        tag = request.args.get("tag")
+        size = image_size_bucket(request.args.get("size"), default_size)
+        image_format = negotiate_image_format()
+        etag = None
+        if tag:
+            key = ImageCache.make_key(
+                item_id, "Primary", size, tag, image_format
             )
-            response = requests.get(
-                image_url,
-                params=params,
-                headers={"X-Emby-Token": config.EMBY_API_KEY},
-                timeout=5
+            etag = f'"{key}"'
+            # The ETag is derived from the URL, so no lookup is needed
+            if request.if_none_match.contains(key):
+                return image_response(Response(status=304), etag, None, True)
+            if cache is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    path, meta = cached
+                    try:
+                        served = send_file(
+                            path,
+                            mimetype=meta["content_type"],
+                            conditional=False,
+                            max_age=IMMUTABLE_MAX_AGE,
+                        )
+                        return image_response(
+                            served, etag, meta.get("last_modified"), True
+                        )
+                    except OSError:
+                        # Evicted between lookup and open; fetch it again
+                        pass
+
+        headers = {}
+        if not tag:
+            for name in ("If-None-Match", "If-Modified-Since"):
+                if request.headers.get(name):
+                    headers[name] = request.headers[name]
+
+        # Each upstream fetch holds a pooled connection for as long as its
+        # body is streaming, so cap how many run at once
+        if not image_fetch_slots.acquire(timeout=config.EMBY_REQUEST_TIMEOUT):
+            return "", 503
+        response = None
+        release = image_fetch_releaser(None)
+        served = None
+        try:
+            # Use higher quality settings and preserve aspect ratio
+            # Only set maxHeight to avoid distortion
+            params = {"maxHeight": size, "quality": 95}
+            if image_format:
+                params["format"] = image_format
+            response = get_emby_client().get_image(
+                item_id, params=params, headers=headers, stream=True
             )
-
-        if response.status_code == 200:
-            from flask import Response  # type: ignore
-
-            return Response(
-                response.content,
-                mimetype=response.headers.get("Content-Type", "image/jpeg"),
+            release = image_fetch_releaser(response)
+
+            if response is None:
+                return "", 404
+            last_modified = response.headers.get("Last-Modified")
+            if response.status_code == 304:
+                return image_response(
+                    Response(status=304),
+                    response.headers.get("ETag"),
+                    last_modified,
+                    False,
+                )
+
+            # Relay the body chunk by chunk instead of buffering it
+            content_type = response.headers.get("Content-Type", "image/jpeg")
+            chunks = response.iter_content(chunk_size=IMAGE_CHUNK_SIZE)
+            if tag and cache is not None:
+                chunks = cache.tee(
+                    key,
+                    chunks,
+                    {"content_type": content_type, "last_modified": last_modified},
+                )
+            streamed = Response(
+                stream_image(chunks, release), mimetype=content_type
             )
-        return "", 404
+            if "Content-Encoding" not in response.headers:
+                content_length = response.headers.get("Content-Length")
+                if content_length:
+                    streamed.headers["Content-Length"] = content_length
+            streamed = image_response(
+                streamed,
+                etag or response.headers.get("ETag"),
+                last_modified,
+                bool(tag),
+            )
+            # Runs once the body is sent, abandoned or skipped (304/HEAD)
+            streamed.call_on_close(release)
+            served = streamed
+            return served
+        finally:
+            if served is None:
+                release()
     except Exception:
         return "", 404
 
 
+@app.route("/api/image/<item_id>")
+def get_image(item_id):
+    """Proxy images from Emby server with fallback to thumbnails."""
+    return proxy_image(item_id, default_size=450)
+
+
+@app.route("/api/person-image/<person_id>")
+def get_person_image(person_id):
+    """Proxy person images from Emby server with fallback to thumbnails."""
+    return proxy_image(person_id, default_size=200)
+
+
 @app.route("/api/libraries")
 def get_libraries():
     """Get all media libraries."""
@@ -477,12 +858,14 @@ def media():
     return render_template("media.html")
 
 
-
-
-
 @app.route("/api/media")
 def get_media():
-    """Get media items with metadata, optionally filtered by library."""
+    """
+    Get media items with metadata, optionally filtered by library.
+
+    Only the fields the grid cards show are fetched; pass fields=detail
+    (or another FIELD_PROFILES name) for overview, genres, people, etc.
+    """
     client = get_emby_client()
     limit = request.args.get("limit", 100, type=int)
     sort_by = request.args.get("sortBy", "SortName")
@@ -490,6 +873,9 @@ def get_media():
     library_id = request.args.get("libraryId", None)
     collection_type = request.args.get("collectionType", "movies")
     start_index = request.args.get("startIndex", 0, type=int)
+    profile = request.args.get("fields", "card")
+    if profile not in FIELD_PROFILES:
+        return jsonify({"error": f"Unknown fields profile: {profile}"}), 400
 
     # Map collection type to Emby Item Types
     item_types = "Movie" # Default
@@ -500,6 +886,26 @@ def get_media():
     elif collection_type == "boxsets":
         item_types = "BoxSet"
     
+    # Large pages are relayed as they download instead of parsed whole
+    if limit >= config.EMBY_STREAM_MIN_ITEMS:
+        stream = client.stream_items_by_library(
+            parent_id=library_id,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            include_item_types=item_types,
+            start_index=start_index,
+            profile=profile,
+        )
+        return Response(
+            stream_json_array(
+                format_media_item(item)
+                for item in stream or ()
+                if item.get("Id")
+            ),
+            mimetype="application/json",
+        )
+
     # Use the new generic method
     items = client.get_items_by_library(
         parent_id=library_id, 
@@ -507,46 +913,49 @@ def get_media():
         sort_by=sort_by, 
         sort_order=sort_order,
         include_item_types=item_types,
-        start_index=start_index
+        start_index=start_index,
+        profile=profile,
     )
 
-    # Format the data
-    formatted = []
-    for item in items:
-        # Skip items without IDs
-        item_id = item.get("Id", "")
-        if not item_id:
-            continue
+    # Skip items without IDs
+    return jsonify([format_media_item(item) for item in items if item.get("Id")])
 
-        # Calculate runtime
-        runtime_ticks = item.get("RunTimeTicks", 0)
-        runtime_minutes = int(runtime_ticks / 10000000 / 60) if runtime_ticks else 0
-
-        # Get primary image tag
-        image_tags = item.get("ImageTags", {})
-        primary_image_tag = image_tags.get("Primary")
 
-        formatted.append(
-            {
-                "id": item_id,
-                "name": item.get("Name", "Unknown"),
-                "year": item.get("ProductionYear", ""),
-                "overview": item.get("Overview", ""),
-                "genres": item.get("Genres", []),
-                "community_rating": item.get("CommunityRating", 0),
-                "official_rating": item.get("OfficialRating", ""),
-                "runtime_minutes": runtime_minutes,
-                "path": item.get("Path", "N/A"),
-                "premiere_date": format_datetime(item.get("PremiereDate", "")),
-                "date_created": format_datetime(item.get("DateCreated", "")),
-                "people": item.get("People", [])[:5],  # Limit to top 5 cast
-                "parent_id": item.get("ParentId", ""),
-                "type": item.get("Type", "Unknown"), # Include type for frontend logic
-                "primary_image_tag": primary_image_tag
-            }
-        )
+def format_media_item(item):
+    """Format an Emby item for /api/media."""
+    # Calculate runtime
+    runtime_ticks = item.get("RunTimeTicks", 0)
+    runtime_minutes = int(runtime_ticks / 10000000 / 60) if runtime_ticks else 0
 
-    return jsonify(formatted)
+    # Get primary image tag
+    image_tags = item.get("ImageTags", {})
+    primary_image_tag = image_tags.get("Primary")
+
+    return {
+        "id": item.get("Id", ""),
+        "name": item.get("Name", "Unknown"),
+        "year": item.get("ProductionYear", ""),
+        "overview": item.get("Overview", ""),
+        "genres": item.get("Genres", []),
+        "community_rating": item.get("CommunityRating", 0),
+        "official_rating": item.get("OfficialRating", ""),
+        "runtime_minutes": runtime_minutes,
+        "path": item.get("Path", "N/A"),
+        "premiere_date": format_datetime(item.get("PremiereDate", "")),
+        "date_created": format_datetime(item.get("DateCreated", "")),
+        "people": item.get("People", [])[:5],  # Limit to top 5 cast
+        "parent_id": item.get("ParentId", ""),
+        "type": item.get("Type", "Unknown"), # Include type for frontend logic
+        "primary_image_tag": primary_image_tag
+    }
+
+
+def stream_json_array(values):
+    """Yield a JSON array body one element at a time."""
+    yield "["
+    for index, value in enumerate(values):
+        yield ("," if index else "") + json.dumps(value)
+    yield "]"
 
 
 @app.route("/api/item/<item_id>")
@@ -586,6 +995,7 @@ def get_item_details(item_id):
             "video_resolution": f"{video_stream.get('Width', 'N/A')}x{video_stream.get('Height', 'N/A')}",
             "audio_streams": len(audio_streams),
             "container": item.get("Container", "N/A"),
+            "primary_image_tag": item.get("ImageTags", {}).get("Primary"),
         }
     )
 
@@ -627,6 +1037,71 @@ def get_cast():
     return jsonify(formatted)
 
 
+def format_search_result(item):
+    """Format an item or person summary for /api/search."""
+    return {
+        "id": item.get("Id"),
+        "name": item.get("Name", "Unknown"),
+        "type": item.get("Type", "Unknown"),
+        "year": item.get("ProductionYear", ""),
+        "series_name": item.get("SeriesName", ""),
+        "library_id": item.get("LibraryId", ""),
+        "primary_image_tag": (item.get("ImageTags") or {}).get("Primary"),
+    }
+
+
+@app.route("/api/search")
+def search():
+    """
+    Search items and people.
+
+    Answered from the local index once it is loaded; until then (or with
+    SEARCH_INDEX_ENABLED off) the query is passed to Emby's SearchTerm.
+    """
+    query = request.args.get("q", "").strip()
+    limit = request.args.get("limit", 50, type=int)
+    types = request.args.get("types", "")
+    library_id = request.args.get("libraryId", None)
+    item_types = [t for t in types.split(",") if t] or None
+    if not query:
+        return jsonify({"results": [], "source": "index"})
+
+    if config.SEARCH_INDEX_ENABLED and get_search_index().loaded:
+        items = get_search_index().search(
+            query, limit=limit, item_types=item_types, library_id=library_id
+        )
+        source = "index"
+    else:
+        client = get_emby_client()
+        items = []
+        wants_people = item_types is None or "Person" in item_types
+        other_types = [t for t in item_types or [] if t != "Person"]
+        if item_types is None or other_types:
+            items = client.get_items_by_library(
+                parent_id=library_id,
+                limit=limit,
+                search_term=query,
+                include_item_types=(
+                    ",".join(other_types) or INDEXED_ITEM_TYPES
+                ),
+                profile="card",
+            )
+        if wants_people and not library_id and len(items) < limit:
+            # Build a new list: the one from get_items_by_library may be a
+            # shared, cached response.
+            items = list(items) + client.get_persons(
+                limit=limit - len(items), search_term=query
+            )
+        source = "emby"
+
+    return jsonify(
+        {
+            "results": [format_search_result(item) for item in items],
+            "source": source,
+        }
+    )
+
+
 @app.route("/api/person/<person_id>")
 def get_person_details(person_id):
     """Get detailed information about a specific person."""
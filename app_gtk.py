@@ -2,7 +2,9 @@
 """GTK Desktop Application for Emby Assistant."""
 
 # Standard library imports
+import os
 import threading
+import webbrowser
 from datetime import datetime
 
 # Third-party imports
@@ -14,11 +16,35 @@ gi.require_version("GdkPixbuf", "2.0")
 # noqa: E402 - gi.require_version must be called before importing from gi
 from gi.repository import GdkPixbuf, GLib, Gtk, Pango  # noqa: E402
 
-import requests  # noqa: E402
-
 # Local imports
 import config  # noqa: E402
-from emby_client import EmbyClient  # noqa: E402
+from emby_client import (  # noqa: E402
+    EmbyClient,
+    build_completed_tasks,
+    build_processing_media,
+    filter_active_tasks,
+)
+from gtk_virtual import VirtualGrid, VirtualList  # noqa: E402
+from image_cache import ImageCache, default_cache_dir  # noqa: E402
+from pixbuf_cache import PixbufCache  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from search_index import LibraryIndexer, SearchIndex  # noqa: E402
+from thumbnail_loader import (  # noqa: E402
+    PRIORITY_DIALOG,
+    PRIORITY_GRID,
+    PRIORITY_VISIBLE,
+    ThumbnailLoader,
+)
+
+# Badge colors for scheduled task states
+TASK_STATE_COLORS = {
+    "Running": "#10b981",
+    "Idle": "#6b7280",
+    "Cancelling": "#ef4444",
+}
+
+# Items per media grid page; the next page is fetched near the end
+MOVIES_PAGE_SIZE = 200
 
 
 class EmbyMonitorApp(Gtk.Window):
@@ -31,15 +57,66 @@ class EmbyMonitorApp(Gtk.Window):
         # Initialize Emby client
         try:
             config.validate_config()
-            self.emby = EmbyClient(config.EMBY_SERVER_URL, config.EMBY_API_KEY)
+            self.emby = EmbyClient(
+                config.EMBY_SERVER_URL,
+                config.EMBY_API_KEY,
+                pool_connections=config.EMBY_POOL_CONNECTIONS,
+                pool_maxsize=config.EMBY_POOL_MAXSIZE,
+                pool_block=config.EMBY_POOL_BLOCK,
+                timeout=config.EMBY_REQUEST_TIMEOUT,
+                cache=(
+                    ResponseCache(max_entries=config.EMBY_CACHE_MAX_ENTRIES)
+                    if config.EMBY_CACHE_ENABLED
+                    else None
+                ),
+                coalesce_requests=config.EMBY_COALESCE_REQUESTS,
+            )
         except ValueError as e:
             self.show_error_dialog(f"Configuration Error: {e}")
             exit(1)
 
+        # Thumbnails load on a fixed worker pool instead of a thread each
+        self.thumbnails = ThumbnailLoader(workers=config.GTK_THUMBNAIL_WORKERS)
+        self.connect("destroy", lambda _: self.thumbnails.stop())
+
+        # Searches are answered locally once the library index is loaded
+        self.search_index = None
+        self.indexer = None
+        if config.SEARCH_INDEX_ENABLED:
+            self.search_index = SearchIndex()
+            self.indexer = LibraryIndexer(
+                self.emby,
+                self.search_index,
+                refresh_interval=config.SEARCH_INDEX_REFRESH_INTERVAL,
+            )
+            self.indexer.start()
+            self.connect("destroy", lambda _: self.indexer.stop())
+
+        # Server id for "Open in Emby" links, cached from status polls
+        self.server_id = None
+
+        # Pending debounced searches and the latest request per view
+        self.search_timers = {}
+        self.request_generations = {}
+
+        # Scaled thumbnails stay in memory; encoded images persist on disk
+        self.pixbuf_cache = PixbufCache(
+            max_bytes=config.GTK_PIXBUF_CACHE_MB * 1024 * 1024
+        )
+        self.image_cache = None
+        if config.IMAGE_CACHE_ENABLED:
+            try:
+                self.image_cache = ImageCache(
+                    os.path.expanduser(
+                        config.IMAGE_CACHE_DIR or default_cache_dir()
+                    ),
+                    max_bytes=config.IMAGE_CACHE_MAX_MB * 1024 * 1024,
+                )
+            except OSError as e:
+                print(f"Image cache disabled: {e}")
+
         # Set window icon
         try:
-            import os
-
             icon_path = os.path.join(
                 os.path.dirname(__file__), "icon", "emby-assistant-128.png"
             )
@@ -121,7 +198,10 @@ class EmbyMonitorApp(Gtk.Window):
     def show_progress(self):
         """Show main progress bar."""
         self.main_progress_bar.show()
-        self.main_progress_timer = GLib.timeout_add(100, self._pulse_progress)
+        if not getattr(self, "main_progress_timer", None):
+            self.main_progress_timer = GLib.timeout_add(
+                100, self._pulse_progress
+            )
 
     def hide_progress(self):
         """Hide main progress bar."""
@@ -213,6 +293,13 @@ class EmbyMonitorApp(Gtk.Window):
 
         self.processing_listbox = Gtk.ListBox()
         self.processing_listbox.set_selection_mode(Gtk.SelectionMode.NONE)
+        placeholder = Gtk.Label(label="✨ No active processing tasks")
+        placeholder.set_margin_top(50)
+        placeholder.set_margin_bottom(50)
+        placeholder.show()
+        self.processing_listbox.set_placeholder(placeholder)
+        # Rows by task Id, reconciled on every refresh
+        self.processing_rows = {}
         scrolled.add(self.processing_listbox)
 
         vbox.pack_start(scrolled, True, True, 0)
@@ -264,15 +351,14 @@ class EmbyMonitorApp(Gtk.Window):
 
         vbox.pack_start(hbox, False, False, 0)
 
-        # Scrolled window for media items
-        scrolled = Gtk.ScrolledWindow()
-        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-
-        self.media_listbox = Gtk.ListBox()
-        self.media_listbox.set_selection_mode(Gtk.SelectionMode.NONE)
-        scrolled.add(self.media_listbox)
-
-        vbox.pack_start(scrolled, True, True, 0)
+        # Virtualized list: only rows near the viewport are built
+        self.media_view = VirtualList(
+            self.create_media_row,
+            estimated_height=170,
+            release_widget=self.release_card,
+            placeholder="🎬 No indexed media found",
+        )
+        vbox.pack_start(self.media_view, True, True, 0)
 
         return vbox
 
@@ -282,14 +368,14 @@ class EmbyMonitorApp(Gtk.Window):
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         vbox.set_border_width(10)
 
-        scrolled = Gtk.ScrolledWindow()
-        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-
-        self.tasks_listbox = Gtk.ListBox()
-        self.tasks_listbox.set_selection_mode(Gtk.SelectionMode.NONE)
-        scrolled.add(self.tasks_listbox)
-
-        vbox.pack_start(scrolled, True, True, 0)
+        self.tasks_view = VirtualList(
+            self.create_task_row,
+            estimated_height=90,
+            placeholder="📋 No tasks found",
+            key=lambda task: task["id"],
+            update_widget=self.update_task_row,
+        )
+        vbox.pack_start(self.tasks_view, True, True, 0)
 
         return vbox
 
@@ -302,10 +388,7 @@ class EmbyMonitorApp(Gtk.Window):
         # Title
         title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         badge = Gtk.Label()
-        badge.set_markup(
-            f"<span background='#10b981' foreground='white' "
-            f"size='small'> {item['state']} </span>"
-        )
+        badge.set_markup(self.state_badge_markup(item["state"], "#10b981"))
         title_box.pack_start(badge, False, False, 0)
 
         title = Gtk.Label(label=item["task_name"])
@@ -339,6 +422,11 @@ class EmbyMonitorApp(Gtk.Window):
         progress.set_show_text(True)
         vbox.pack_start(progress, False, False, 0)
 
+        # Widgets update_processing_row() changes in place
+        row.item = item
+        row.badge = badge
+        row.progress = progress
+
         # Time
         if item.get("started_at"):
             time_label = Gtk.Label()
@@ -351,6 +439,71 @@ class EmbyMonitorApp(Gtk.Window):
         row.add(vbox)
         return row
 
+    def state_badge_markup(self, state, color):
+        """Return the markup for a colored task state badge."""
+        return (
+            f"<span background='{color}' foreground='white' "
+            f"size='small'> {state} </span>"
+        )
+
+    def task_shows_progress(self, task):
+        """Whether a task row has a progress bar."""
+        return task["state"] == "Running" and task["current_progress"] > 0
+
+    def set_progress(self, progress, percent):
+        """Update a progress bar's fraction and label."""
+        progress.set_fraction(percent / 100.0)
+        progress.set_text(f"{percent:.1f}%")
+
+    def update_task_row(self, row, task):
+        """
+        Update a task row in place for a refreshed task.
+
+        Returns:
+            False if the row's layout changed and it must be rebuilt
+        """
+        previous = row.item
+        if (
+            task["name"] != previous["name"]
+            or task["category"] != previous["category"]
+            or task["last_end"] != previous["last_end"]
+            or task["last_status"] != previous["last_status"]
+            or self.task_shows_progress(task)
+            != self.task_shows_progress(previous)
+        ):
+            return False
+        if task["state"] != previous["state"]:
+            row.badge.set_markup(
+                self.state_badge_markup(
+                    task["state"],
+                    TASK_STATE_COLORS.get(task["state"], "#6b7280"),
+                )
+            )
+        if row.progress is not None:
+            self.set_progress(row.progress, task["current_progress"])
+        row.item = task
+        return True
+
+    def update_processing_row(self, row, item):
+        """
+        Update a processing row in place for a refreshed task.
+
+        Returns:
+            False if the row's layout changed and it must be rebuilt
+        """
+        previous = row.item
+        for field in ("task_name", "category", "description", "started_at"):
+            if item[field] != previous[field]:
+                return False
+        if item["state"] != previous["state"]:
+            row.badge.set_markup(
+                self.state_badge_markup(item["state"], "#10b981")
+            )
+        if item["progress"] != previous["progress"]:
+            self.set_progress(row.progress, item["progress"])
+        row.item = item
+        return True
+
     def create_completed_row(self, task):
         """Create a row for a completed task."""
         row = Gtk.ListBoxRow()
@@ -420,13 +573,14 @@ class EmbyMonitorApp(Gtk.Window):
         poster_box.pack_start(poster_image, True, False, 0)
         vbox.pack_start(poster_box, False, False, 0)
 
-        # Load poster asynchronously
+        # Load poster asynchronously; the grid only builds cards in view
         if movie.get("Id"):
-            threading.Thread(
-                target=self.load_thumbnail,
-                args=(movie["Id"], poster_image, False),
-                daemon=True,
-            ).start()
+            event_box.thumbnail_job = self.queue_thumbnail(
+                movie["Id"],
+                poster_image,
+                priority=PRIORITY_VISIBLE,
+                tag=movie.get("ImageTags", {}).get("Primary"),
+            )
 
         # Movie title
         title_text = GLib.markup_escape_text(movie.get("Name", "Unknown"))
@@ -435,6 +589,9 @@ class EmbyMonitorApp(Gtk.Window):
         title_label.set_halign(Gtk.Align.CENTER)
         title_label.set_line_wrap(True)
         title_label.set_max_width_chars(20)
+        # Cards share a fixed cell height in the virtual grid
+        title_label.set_lines(2)
+        title_label.set_ellipsize(Pango.EllipsizeMode.END)
         vbox.pack_start(title_label, False, False, 0)
 
         # Year
@@ -458,7 +615,7 @@ class EmbyMonitorApp(Gtk.Window):
 
     def create_media_row(self, item):
         """Create a row for a media item."""
-        row = Gtk.ListBoxRow()
+        row = Gtk.EventBox()
 
         # Main horizontal box to hold thumbnail and content
         main_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=15)
@@ -480,11 +637,12 @@ class EmbyMonitorApp(Gtk.Window):
             main_hbox.pack_start(thumbnail_box, False, False, 0)
 
             # Load thumbnail asynchronously
-            threading.Thread(
-                target=self.load_thumbnail,
-                args=(item["id"], thumbnail_image, False),
-                daemon=True,
-            ).start()
+            row.thumbnail_job = self.queue_thumbnail(
+                item["id"],
+                thumbnail_image,
+                priority=PRIORITY_VISIBLE,
+                tag=item.get("image_tag"),
+            )
         elif item["type"] == "Person" and item.get("id"):
             # Create a box to hold the image with fixed dimensions
             thumbnail_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
@@ -500,11 +658,13 @@ class EmbyMonitorApp(Gtk.Window):
             main_hbox.pack_start(thumbnail_box, False, False, 0)
 
             # Load person thumbnail asynchronously
-            threading.Thread(
-                target=self.load_thumbnail,
-                args=(item["id"], thumbnail_image, True),
-                daemon=True,
-            ).start()
+            row.thumbnail_job = self.queue_thumbnail(
+                item["id"],
+                thumbnail_image,
+                is_person=True,
+                priority=PRIORITY_VISIBLE,
+                tag=item.get("image_tag"),
+            )
 
         # Content vbox (text information)
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
@@ -567,25 +727,17 @@ class EmbyMonitorApp(Gtk.Window):
 
     def create_task_row(self, task):
         """Create a row for a task."""
-        row = Gtk.ListBoxRow()
+        row = Gtk.EventBox()
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
         vbox.set_border_width(10)
 
         # Title with state
         title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
 
-        state_colors = {
-            "Running": "#10b981",
-            "Idle": "#6b7280",
-            "Cancelling": "#ef4444",
-        }
-        color = state_colors.get(task["state"], "#6b7280")
+        color = TASK_STATE_COLORS.get(task["state"], "#6b7280")
 
         badge = Gtk.Label()
-        badge.set_markup(
-            f"<span background='{color}' foreground='white' "
-            f"size='small'> {task['state']} </span>"
-        )
+        badge.set_markup(self.state_badge_markup(task["state"], color))
         title_box.pack_start(badge, False, False, 0)
 
         title = Gtk.Label()
@@ -603,7 +755,8 @@ class EmbyMonitorApp(Gtk.Window):
         vbox.pack_start(cat_label, False, False, 0)
 
         # Progress if running
-        if task["state"] == "Running" and task["current_progress"] > 0:
+        progress = None
+        if self.task_shows_progress(task):
             progress = Gtk.ProgressBar()
             progress.set_fraction(task["current_progress"] / 100.0)
             progress.set_text(f"{task['current_progress']:.1f}%")
@@ -620,75 +773,137 @@ class EmbyMonitorApp(Gtk.Window):
             exec_label.set_halign(Gtk.Align.START)
             vbox.pack_start(exec_label, False, False, 0)
 
+        # Widgets update_task_row() changes in place
+        row.item = task
+        row.badge = badge
+        row.progress = progress
+
         row.add(vbox)
         return row
 
-    def load_thumbnail(self, item_id, image_widget, is_person=False):
-        """Load thumbnail image for a media item asynchronously with fallback."""
-        try:
-            # Set dimensions based on type - use higher quality
-            if is_person:
-                max_width = 200
-                max_height = 200
-            else:
-                max_width = 300
-                max_height = 450
-
-            # Only set maxHeight to preserve aspect ratio, use higher quality
-            params = f"maxHeight={max_height}&quality=95"
+    def queue_thumbnail(
+        self,
+        item_id,
+        image_widget,
+        is_person=False,
+        priority=PRIORITY_GRID,
+        group=None,
+        tag=None,
+    ):
+        """Show a cached thumbnail now, or queue its load on the worker pool."""
+        if self.show_cached_thumbnail(item_id, image_widget, is_person, tag):
+            return None
+        return self.thumbnails.submit(
+            self.load_thumbnail,
+            item_id,
+            image_widget,
+            is_person,
+            tag,
+            priority=priority,
+            group=group,
+        )
 
-            # Try Primary image first
-            image_url = (
-                f"{config.EMBY_SERVER_URL}/emby/Items/{item_id}/"
-                f"Images/Primary?{params}"
-            )
-            response = requests.get(
-                image_url,
-                headers={"X-Emby-Token": config.EMBY_API_KEY},
-                timeout=5
-            )
+    def show_cached_thumbnail(self, item_id, image_widget, is_person, tag):
+        """Set the thumbnail from the pixbuf cache; return True on a hit."""
+        _, max_height = self._thumbnail_size(is_person)
+        pixbuf = self.pixbuf_cache.get((item_id, max_height, tag))
+        if pixbuf is None:
+            return False
+        image_widget.set_from_pixbuf(pixbuf)
+        return True
 
-            # If Primary not found, try Thumb as fallback
-            if response.status_code == 404:
-                image_url = (
-                    f"{config.EMBY_SERVER_URL}/emby/Items/{item_id}/"
-                    f"Images/Thumb?{params}"
-                )
-                response = requests.get(
-                    image_url,
-                    headers={"X-Emby-Token": config.EMBY_API_KEY},
-                    timeout=5
+    def release_card(self, widget):
+        """Cancel the queued thumbnail of a card that was scrolled away."""
+        job = getattr(widget, "thumbnail_job", None)
+        if job is not None:
+            job.cancel()
+
+    def _thumbnail_size(self, is_person):
+        """Return the (max width, max height) a thumbnail is scaled to."""
+        return (200, 200) if is_person else (300, 450)
+
+    def _thumbnail_chunks(self, item_id, max_height, tag):
+        """
+        Yield the encoded thumbnail bytes from disk or from Emby.
+
+        Tagged images are content-addressed, so they are read from the
+        on-disk cache when present and written to it while downloading.
+        """
+        disk_key = None
+        if self.image_cache is not None and tag:
+            disk_key = ImageCache.make_key(item_id, "Primary", max_height, tag)
+            cached = self.image_cache.get(disk_key)
+            if cached is not None:
+                with open(cached[0], "rb") as f:
+                    yield f.read()
+                return
+
+        # Only set maxHeight to preserve aspect ratio, use higher quality
+        params = {"maxHeight": max_height, "quality": 95}
+
+        # Primary image with Thumb fallback, over the pooled session
+        response = self.emby.get_image(item_id, params=params, stream=True)
+        if response is None:
+            return
+        try:
+            chunks = response.iter_content(chunk_size=64 * 1024)
+            if disk_key is not None:
+                chunks = self.image_cache.tee(
+                    disk_key,
+                    chunks,
+                    {
+                        "content_type": response.headers.get(
+                            "Content-Type", "image/jpeg"
+                        ),
+                        "last_modified": response.headers.get(
+                            "Last-Modified"
+                        ),
+                    },
                 )
+            yield from chunks
+        finally:
+            response.close()
+
+    def load_thumbnail(self, item_id, image_widget, is_person=False, tag=None):
+        """Load thumbnail image for a media item asynchronously with fallback."""
+        try:
+            # Set dimensions based on type - use higher quality
+            max_width, max_height = self._thumbnail_size(is_person)
 
-            if response.status_code == 200:
-                # Load image from bytes
-                loader = GdkPixbuf.PixbufLoader()
-                loader.write(response.content)
+            # Feed the decoder chunk by chunk instead of buffering the body
+            loader = GdkPixbuf.PixbufLoader()
+            received = False
+            try:
+                for chunk in self._thumbnail_chunks(item_id, max_height, tag):
+                    loader.write(chunk)
+                    received = True
+            finally:
                 loader.close()
-                pixbuf = loader.get_pixbuf()
-
-                # Scale image while maintaining aspect ratio
-                if pixbuf:
-                    orig_width = pixbuf.get_width()
-                    orig_height = pixbuf.get_height()
-
-                    # Calculate scaling factor to fit within max dimensions
-                    # while maintaining aspect ratio
-                    width_ratio = max_width / orig_width
-                    height_ratio = max_height / orig_height
-                    scale_ratio = min(width_ratio, height_ratio)
-
-                    # Calculate new dimensions
-                    new_width = int(orig_width * scale_ratio)
-                    new_height = int(orig_height * scale_ratio)
-
-                    # Scale the pixbuf
-                    scaled_pixbuf = pixbuf.scale_simple(
-                        new_width, new_height, GdkPixbuf.InterpType.BILINEAR
-                    )
+            pixbuf = loader.get_pixbuf() if received else None
+
+            # Scale image while maintaining aspect ratio
+            if pixbuf:
+                orig_width = pixbuf.get_width()
+                orig_height = pixbuf.get_height()
+
+                # Calculate scaling factor to fit within max dimensions
+                # while maintaining aspect ratio
+                width_ratio = max_width / orig_width
+                height_ratio = max_height / orig_height
+                scale_ratio = min(width_ratio, height_ratio)
+
+                # Calculate new dimensions
+                new_width = int(orig_width * scale_ratio)
+                new_height = int(orig_height * scale_ratio)
+
+                # Scale the pixbuf
+                scaled_pixbuf = pixbuf.scale_simple(
+                    new_width, new_height, GdkPixbuf.InterpType.BILINEAR
+                )
+                self.pixbuf_cache.put((item_id, max_height, tag), scaled_pixbuf)
 
-                    # Update image widget on main thread
-                    GLib.idle_add(image_widget.set_from_pixbuf, scaled_pixbuf)
+                # Update image widget on main thread
+                GLib.idle_add(image_widget.set_from_pixbuf, scaled_pixbuf)
         except Exception:
             # If image load fails, keep the default icon
             pass
@@ -732,43 +947,45 @@ class EmbyMonitorApp(Gtk.Window):
         def worker():
              try:
                  system_info = self.emby.get_system_info()
-                 GLib.idle_add(on_worker_done, system_info)
+                 GLib.idle_add(self._render_server_status, system_info)
              except Exception:
-                 GLib.idle_add(on_worker_done, None)
+                 GLib.idle_add(self._render_server_status, None)
 
-        def on_worker_done(system_info):
-            if not system_info:
-                if hasattr(self, 'status_indicator'):
-                    self.status_indicator.set_markup(
-                        "<span size='large' foreground='red'>⚫</span>"
-                    )
-                if hasattr(self, 'server_name_label'):
-                    self.server_name_label.set_markup(
-                        "<span foreground='red'>Could not connect to server</span>"
-                    )
-                return False
+        threading.Thread(target=worker, daemon=True).start()
 
+    def _render_server_status(self, system_info):
+        """Show system info (None when unreachable); runs on the main loop."""
+        if not system_info:
             if hasattr(self, 'status_indicator'):
                 self.status_indicator.set_markup(
-                    "<span size='large' foreground='green'>🟢</span>"
+                    "<span size='large' foreground='red'>⚫</span>"
                 )
             if hasattr(self, 'server_name_label'):
                 self.server_name_label.set_markup(
-                    f"<b>{system_info.get('ServerName', 'Unknown')}</b>"
-                )
-            if hasattr(self, 'version_label'):
-                self.version_label.set_text(
-                    f"Version: {system_info.get('Version', 'Unknown')}"
-                )
-            if hasattr(self, 'os_label'):
-                self.os_label.set_text(
-                    f"OS: {system_info.get('OperatingSystem', 'Unknown')}"
+                    "<span foreground='red'>Could not connect to server</span>"
                 )
-
-            self.update_statusbar("Server status updated")
             return False
 
-        threading.Thread(target=worker, daemon=True).start()
+        self.server_id = system_info.get("Id") or self.server_id
+        if hasattr(self, 'status_indicator'):
+            self.status_indicator.set_markup(
+                "<span size='large' foreground='green'>🟢</span>"
+            )
+        if hasattr(self, 'server_name_label'):
+            self.server_name_label.set_markup(
+                f"<b>{system_info.get('ServerName', 'Unknown')}</b>"
+            )
+        if hasattr(self, 'version_label'):
+            self.version_label.set_text(
+                f"Version: {system_info.get('Version', 'Unknown')}"
+            )
+        if hasattr(self, 'os_label'):
+            self.os_label.set_text(
+                f"OS: {system_info.get('OperatingSystem', 'Unknown')}"
+            )
+
+        self.update_statusbar("Server status updated")
+        return False
 
     def load_current_processing(self):
         """Load currently processing media."""
@@ -778,40 +995,51 @@ class EmbyMonitorApp(Gtk.Window):
         def worker():
             try:
                 processing = self.emby.get_processing_media()
-                GLib.idle_add(on_worker_done, processing)
+                GLib.idle_add(self._render_processing, processing)
             except Exception as e:
                 print(f"Error loading processing: {e}")
 
-        def on_worker_done(processing):
-            # Clear existing items
-            for child in self.processing_listbox.get_children():
-                self.processing_listbox.remove(child)
-
-            if not processing:
-                label = Gtk.Label(label="✨ No active processing tasks")
-                label.set_margin_top(50)
-                label.set_margin_bottom(50)
-                self.processing_listbox.add(label)
-            else:
-                for item in processing:
-                    formatted_item = {
-                        "task_name": item.get("task_name", "Unknown"),
-                        "state": item.get("state", "Unknown"),
-                        "progress": round(item.get("progress", 0), 1),
-                        "category": item.get("category", "Unknown"),
-                        "description": item.get("description", ""),
-                        "started_at": self.format_datetime(
-                            item.get("last_execution_time", "")
-                        ),
-                    }
-                    self.processing_listbox.add(
-                        self.create_processing_row(formatted_item)
-                    )
+        threading.Thread(target=worker, daemon=True).start()
 
-            self.processing_listbox.show_all()
-            return False
+    def _render_processing(self, processing):
+        """Reconcile the processing list by task Id; runs on the main loop."""
+        items = []
+        for item in processing or []:
+            items.append(
+                {
+                    "id": item.get("id") or item.get("task_name", ""),
+                    "task_name": item.get("task_name", "Unknown"),
+                    "state": item.get("state", "Unknown"),
+                    "progress": round(item.get("progress", 0), 1),
+                    "category": item.get("category", "Unknown"),
+                    "description": item.get("description", ""),
+                    "started_at": self.format_datetime(
+                        item.get("last_execution_time", "")
+                    ),
+                }
+            )
 
-        threading.Thread(target=worker, daemon=True).start()
+        # Drop rows of tasks that finished
+        wanted = {item["id"] for item in items}
+        for key in list(self.processing_rows):
+            if key not in wanted:
+                self.processing_listbox.remove(self.processing_rows.pop(key))
+
+        # Update surviving rows in place; only new tasks build widgets
+        for index, item in enumerate(items):
+            row = self.processing_rows.get(item["id"])
+            if row is not None and not self.update_processing_row(row, item):
+                self.processing_listbox.remove(row)
+                row = None
+            if row is None:
+                row = self.create_processing_row(item)
+                self.processing_rows[item["id"]] = row
+                self.processing_listbox.insert(row, index)
+                row.show_all()
+            elif row.get_index() != index:
+                self.processing_listbox.remove(row)
+                self.processing_listbox.insert(row, index)
+        return False
 
     def load_completed_tasks(self):
         """Load recently completed tasks."""
@@ -821,42 +1049,43 @@ class EmbyMonitorApp(Gtk.Window):
         def worker():
             try:
                 completed = self.emby.get_completed_tasks(limit=15)
-                GLib.idle_add(on_worker_done, completed)
+                GLib.idle_add(self._render_completed_tasks, completed)
             except Exception as e:
                  print(f"Error loading completed tasks: {e}")
 
-        def on_worker_done(completed):
-            # Clear existing items
-            for child in self.completed_listbox.get_children():
-                self.completed_listbox.remove(child)
-
-            if not completed:
-                label = Gtk.Label(label="📋 No completed tasks")
-                label.set_margin_top(50)
-                label.set_margin_bottom(50)
-                self.completed_listbox.add(label)
-            else:
-                for task in completed:
-                    formatted_task = {
-                        "name": task.get("name", "Unknown"),
-                        "category": task.get("category", "Unknown"),
-                        "status": task.get("status", "Unknown"),
-                        "completed_at": self.format_datetime(
-                            task.get("end_time", "")
-                        ),
-                        "duration": self.calculate_duration(
-                            task.get("start_time", ""),
-                            task.get("end_time", "")
-                        ),
-                    }
-                    self.completed_listbox.add(
-                        self.create_completed_row(formatted_task)
-                    )
+        threading.Thread(target=worker, daemon=True).start()
 
-            self.completed_listbox.show_all()
-            return False
+    def _render_completed_tasks(self, completed):
+        """Fill the completed tasks list; runs on the main loop."""
+        # Clear existing items
+        for child in self.completed_listbox.get_children():
+            self.completed_listbox.remove(child)
+
+        if not completed:
+            label = Gtk.Label(label="📋 No completed tasks")
+            label.set_margin_top(50)
+            label.set_margin_bottom(50)
+            self.completed_listbox.add(label)
+        else:
+            for task in completed:
+                formatted_task = {
+                    "name": task.get("name", "Unknown"),
+                    "category": task.get("category", "Unknown"),
+                    "status": task.get("status", "Unknown"),
+                    "completed_at": self.format_datetime(
+                        task.get("end_time", "")
+                    ),
+                    "duration": self.calculate_duration(
+                        task.get("start_time", ""),
+                        task.get("end_time", "")
+                    ),
+                }
+                self.completed_listbox.add(
+                    self.create_completed_row(formatted_task)
+                )
 
-        threading.Thread(target=worker, daemon=True).start()
+        self.completed_listbox.show_all()
+        return False
 
     def create_movies_tab(self):
         """Create the movies browser tab."""
@@ -874,7 +1103,7 @@ class EmbyMonitorApp(Gtk.Window):
         self.library_combo.append("all", "All Libraries")
         self.library_combo.set_active(0)
         self.library_combo.set_active(0)
-        self.library_combo.connect("changed", lambda w: self.load_movies())
+        self.library_combo.connect("changed", self.on_library_changed)
         controls_box.pack_start(self.library_combo, False, False, 0)
 
         # Search bar
@@ -885,22 +1114,23 @@ class EmbyMonitorApp(Gtk.Window):
 
         vbox.pack_start(controls_box, False, False, 0)
 
-        # Scrolled window
-        scrolled = Gtk.ScrolledWindow()
-        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-
-        # FlowBox with better spacing
-        self.movies_flowbox = Gtk.FlowBox()
-        self.movies_flowbox.set_valign(Gtk.Align.START)
-        self.movies_flowbox.set_max_children_per_line(6)
-        self.movies_flowbox.set_min_children_per_line(2)
-        self.movies_flowbox.set_selection_mode(Gtk.SelectionMode.NONE)
-        self.movies_flowbox.set_homogeneous(True)
-        self.movies_flowbox.set_column_spacing(20)
-        self.movies_flowbox.set_row_spacing(20)
-        scrolled.add(self.movies_flowbox)
+        # Virtualized grid: only cards near the viewport are built, so
+        # their posters load as they scroll into view
+        self.movies_view = VirtualGrid(
+            self.create_movie_card,
+            cell_width=320,
+            cell_height=570,
+            spacing=20,
+            release_widget=self.release_card,
+            placeholder="🎬 No media found",
+        )
+        vbox.pack_start(self.movies_view, True, True, 0)
 
-        vbox.pack_start(scrolled, True, True, 0)
+        # Pages after the first are fetched as the grid nears its end
+        self.movies_paging = None
+        adjustment = self.movies_view.get_vadjustment()
+        adjustment.connect("value-changed", self.on_movies_scrolled)
+        adjustment.connect("changed", self.on_movies_scrolled)
 
         # Initial Load
         self.load_libraries()
@@ -908,18 +1138,58 @@ class EmbyMonitorApp(Gtk.Window):
 
         return vbox
 
+    def on_library_changed(self, combo):
+        """Reload the grid for the selected library."""
+        # A search still waiting on its debounce timer would replace
+        # this listing with results for the previous library
+        self.cancel_search("movies")
+        self.load_movies()
+
     def on_movie_search_changed(self, entry):
-        """Handle movie search."""
-        query = entry.get_text()
-        self.load_movies(query)
+        """Handle movie search once typing pauses."""
+        self.debounce_search("movies", self.load_movies, entry.get_text())
+
+    def debounce_search(self, name, callback, query):
+        """Run callback(query) once no new input arrived for a short delay."""
+        timer = self.search_timers.pop(name, None)
+        if timer:
+            GLib.source_remove(timer)
+
+        def fire():
+            self.search_timers.pop(name, None)
+            callback(query)
+            return False
+
+        self.search_timers[name] = GLib.timeout_add(
+            config.GTK_SEARCH_DEBOUNCE_MS, fire
+        )
+
+    def cancel_search(self, name):
+        """Drop a pending debounced search and make in-flight ones stale."""
+        timer = self.search_timers.pop(name, None)
+        if timer:
+            GLib.source_remove(timer)
+        self.next_request(name)
+
+    def next_request(self, name):
+        """Start a new request generation; earlier ones become stale."""
+        generation = self.request_generations.get(name, 0) + 1
+        self.request_generations[name] = generation
+        return generation
+
+    def is_current_request(self, name, generation):
+        """Whether generation is still the latest request for name."""
+        return self.request_generations.get(name) == generation
 
     def load_libraries(self):
         """Load libraries into combo box."""
         def worker():
             try:
-                libraries = self.emby.get_libraries()
-                # Sort libraries by name
-                libraries.sort(key=lambda x: x.get("Name", "").lower())
+                # Sort a copy: cached client results are shared
+                libraries = sorted(
+                    self.emby.get_libraries(),
+                    key=lambda x: x.get("Name", "").lower(),
+                )
                 GLib.idle_add(on_worker_done, libraries)
             except Exception as e:
                  print(f"Error loading libraries: {e}")
@@ -946,9 +1216,15 @@ class EmbyMonitorApp(Gtk.Window):
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def search_index_ready(self):
+        """True once the local search index has finished its first load."""
+        return self.search_index is not None and self.search_index.loaded
+
     def load_movies(self, query=None):
         """Load movies browser."""
         self.show_progress()
+        generation = self.next_request("movies")
+        self.stop_movies_paging()
 
         # Capture state on main thread
         library_id = self.library_combo.get_active_id()
@@ -972,42 +1248,106 @@ class EmbyMonitorApp(Gtk.Window):
              # else keep default (mixed)
 
         def worker():
-            try:
-                # Run blocking call in background thread
-                media = self.emby.get_items_by_library(
-                    parent_id=parent_id, 
-                    limit=200, 
-                    search_term=query,
-                    include_item_types=include_types
+            if not self.is_current_request("movies", generation):
+                return
+            if query and self.search_index_ready():
+                media = self.search_index.search(
+                    query,
+                    limit=200,
+                    item_types=include_types.split(","),
+                    library_id=parent_id,
                 )
-                # Schedule UI update on main thread
-                GLib.idle_add(on_worker_done, media)
-            except Exception as e:
-                print(f"Error loading movies: {e}")
-                GLib.idle_add(self.hide_progress)
-
-        def on_worker_done(media):
-            # Clear existing items
-            for child in self.movies_flowbox.get_children():
-                self.movies_flowbox.remove(child)
-
-            if not media:
-                label = Gtk.Label(label="🎬 No media found")
-                label.set_margin_top(50)
-                label.set_margin_bottom(50)
-                self.movies_flowbox.add(label)
+                paging = {"pager": None, "pages": (page for page in [media])}
             else:
-                for item in media:
-                    card = self.create_movie_card(item)
-                    self.movies_flowbox.add(card)
-
-            self.update_statusbar(f"Loaded {len(media)} items")
-            self.hide_progress()
-            self.movies_flowbox.show_all()
-            return False
+                paging = {
+                    "pager": self.emby.iter_items_by_library(
+                        parent_id=parent_id,
+                        search_term=query,
+                        include_item_types=include_types,
+                        page_size=MOVIES_PAGE_SIZE,
+                        profile="card",
+                    )
+                }
+                paging["pages"] = paging["pager"].pages()
+            paging.update(generation=generation, loading=True, done=False)
+            self.fetch_movies_page(paging, first=True)
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def fetch_movies_page(self, paging, first=False):
+        """Pull the next page of a movies listing on a worker thread."""
+        if not self.is_current_request("movies", paging["generation"]):
+            # Superseded: stop the pager instead of fetching more pages
+            paging["pages"].close()
+            return
+        try:
+            page = next(paging["pages"], None)
+        except Exception as e:
+            print(f"Error loading movies: {e}")
+            page = None
+        GLib.idle_add(self.on_movies_page, paging, page, first)
+
+    def on_movies_page(self, paging, page, first):
+        """Show a page of the movies listing; runs on the main loop."""
+        paging["loading"] = False
+        # A newer search or library switch owns the grid now
+        if not self.is_current_request("movies", paging["generation"]):
+            paging["pages"].close()
+            return False
+        if first:
+            self.movies_paging = paging
+            # Replacing the items drops old cards and their queued posters
+            self.movies_view.set_items(page or [], reset_scroll=True)
+        elif page:
+            self.movies_view.extend_items(page)
+
+        pager = paging["pager"]
+        loaded = len(self.movies_view.items)
+        total = pager.total_record_count if pager else loaded
+        if page is None or (total is not None and loaded >= total):
+            paging["done"] = True
+        if page is None and pager is not None and not pager.complete:
+            self.update_statusbar(
+                f"Loaded {loaded} items (library listing incomplete)"
+            )
+        else:
+            self.update_statusbar(
+                f"Loaded {loaded} of {total} items"
+                if total and total > loaded
+                else f"Loaded {loaded} items"
+            )
+        self.hide_progress()
+        # The first page may not fill the window yet
+        self.on_movies_scrolled()
+        return False
+
+    def stop_movies_paging(self):
+        """Drop the current movies listing and cancel its prefetch."""
+        paging, self.movies_paging = self.movies_paging, None
+        # A page being fetched is closed by on_movies_page instead, as a
+        # generator cannot be closed while another thread runs it
+        if paging is not None and not paging["loading"]:
+            paging["pages"].close()
+
+    def on_movies_scrolled(self, *args):
+        """Fetch the next page once the grid is scrolled near its end."""
+        paging = self.movies_paging
+        if paging is None or paging["loading"] or paging["done"]:
+            return
+        adjustment = self.movies_view.get_vadjustment()
+        remaining = (
+            adjustment.get_upper()
+            - adjustment.get_value()
+            - adjustment.get_page_size()
+        )
+        if remaining > adjustment.get_page_size():
+            return
+        paging["loading"] = True
+        self.show_progress()
+        threading.Thread(
+            target=self.fetch_movies_page, args=(paging,), daemon=True
+        ).start()
+
     def load_indexed_media(self):
         """Load indexed media."""
         self.show_progress()
@@ -1030,18 +1370,10 @@ class EmbyMonitorApp(Gtk.Window):
                 GLib.idle_add(self.hide_progress)
 
         def on_worker_done(items):
-            # Clear existing items
-            for child in self.media_listbox.get_children():
-                self.media_listbox.remove(child)
-
-            if not items:
-                label = Gtk.Label(label="🎬 No indexed media found")
-                label.set_margin_top(50)
-                label.set_margin_bottom(50)
-                self.media_listbox.add(label)
-            else:
-                for item in items:
-                    formatted_item = {
+            formatted_items = []
+            for item in items or []:
+                formatted_items.append(
+                    {
                         "id": item.get("Id", ""),
                         "name": item.get("Name", "Unknown"),
                         "type": item.get("Type", "Unknown"),
@@ -1052,12 +1384,12 @@ class EmbyMonitorApp(Gtk.Window):
                         "series_name": item.get("SeriesName", ""),
                         "season": item.get("ParentIndexNumber", ""),
                         "episode": item.get("IndexNumber", ""),
+                        "image_tag": item.get("ImageTags", {}).get("Primary"),
                     }
-                    self.media_listbox.add(
-                        self.create_media_row(formatted_item)
-                    )
+                )
 
-            self.media_listbox.show_all()
+            # Replacing the items drops old rows and their queued thumbnails
+            self.media_view.set_items(formatted_items, reset_scroll=True)
             self.update_statusbar(f"Loaded {len(items)} media items")
             self.hide_progress()
             return False
@@ -1069,63 +1401,94 @@ class EmbyMonitorApp(Gtk.Window):
         def worker():
              try:
                  tasks = self.emby.get_scheduled_tasks()
-                 GLib.idle_add(on_worker_done, tasks)
+                 GLib.idle_add(self._render_all_tasks, tasks)
              except Exception as e:
                  print(f"Error loading tasks: {e}")
 
-        def on_worker_done(tasks):
-            # Clear existing items
-            for child in self.tasks_listbox.get_children():
-                self.tasks_listbox.remove(child)
-
-            if not tasks:
-                label = Gtk.Label(label="📋 No tasks found")
-                label.set_margin_top(50)
-                label.set_margin_bottom(50)
-                self.tasks_listbox.add(label)
-            else:
-                for task in tasks:
-                    last_result = task.get("LastExecutionResult", {})
-                    formatted_task = {
-                        "name": task.get("Name", "Unknown"),
-                        "category": task.get("Category", "Unknown"),
-                        "state": task.get("State", "Unknown"),
-                        "current_progress": round(
-                            task.get("CurrentProgressPercentage", 0), 1
-                        ),
-                        "last_start": self.format_datetime(
-                            last_result.get("StartTimeUtc", "")
-                        ),
-                        "last_end": self.format_datetime(
-                            last_result.get("EndTimeUtc", "")
-                        ),
-                        "last_status": last_result.get("Status", "N/A"),
-                    }
-                    self.tasks_listbox.add(
-                        self.create_task_row(formatted_task)
-                    )
-
-            self.tasks_listbox.show_all()
-            return False
-
         threading.Thread(target=worker, daemon=True).start()
 
+    def _render_all_tasks(self, tasks):
+        """Update the scheduled tasks view; runs on the main loop."""
+        formatted_tasks = []
+        if tasks:
+            for task in tasks:
+                last_result = task.get("LastExecutionResult", {})
+                formatted_task = {
+                    "id": task.get("Id") or task.get("Name", ""),
+                    "name": task.get("Name", "Unknown"),
+                    "category": task.get("Category", "Unknown"),
+                    "state": task.get("State", "Unknown"),
+                    "current_progress": round(
+                        task.get("CurrentProgressPercentage", 0), 1
+                    ),
+                    "last_start": self.format_datetime(
+                        last_result.get("StartTimeUtc", "")
+                    ),
+                    "last_end": self.format_datetime(
+                        last_result.get("EndTimeUtc", "")
+                    ),
+                    "last_status": last_result.get("Status", "N/A"),
+                }
+                formatted_tasks.append(formatted_task)
+
+        # Keyed by task Id: unchanged rows are updated, not rebuilt
+        self.tasks_view.set_items(formatted_tasks)
+        return False
+
     def refresh_all(self):
         """Refresh all data."""
         self.update_statusbar("Refreshing all data...")
-        self.load_server_status()
-        self.load_current_processing()
-        self.load_completed_tasks()
+
+        # Status and the three task views need two independent requests;
+        # fetch them together and derive every task view from one list
+        def worker():
+            try:
+                results = self.emby.fan_out(
+                    {
+                        "system_info": self.emby.get_system_info,
+                        "tasks": self.emby.get_scheduled_tasks,
+                    }
+                )
+            except Exception as e:
+                print(f"Error refreshing dashboard: {e}")
+                results = {"system_info": None, "tasks": None}
+            tasks = results["tasks"]
+            GLib.idle_add(self._render_server_status, results["system_info"])
+            if tasks is None:
+                return
+            GLib.idle_add(
+                self._render_processing,
+                build_processing_media(filter_active_tasks(tasks)),
+            )
+            GLib.idle_add(
+                self._render_completed_tasks,
+                build_completed_tasks(tasks, limit=15),
+            )
+            GLib.idle_add(self._render_all_tasks, tasks)
+
+        threading.Thread(target=worker, daemon=True).start()
         self.load_libraries()
         self.load_movies()
         self.load_indexed_media()
-        self.load_all_tasks()
 
     def start_refresh_timers(self):
         """Start auto-refresh timers."""
-        # Refresh processing every 5 seconds
+        # Task progress is pushed over the Emby WebSocket when available
+        self.emby_websocket = None
+        if config.EMBY_WEBSOCKET_ENABLED:
+            self.emby_websocket = self.emby.create_websocket(
+                on_tasks=self.on_tasks_pushed,
+                on_library_changed=(
+                    self.indexer.on_library_changed if self.indexer else None
+                ),
+                url=config.EMBY_WEBSOCKET_URL or None,
+            )
+            self.emby_websocket.start()
+            self.connect("destroy", lambda _: self.emby_websocket.stop())
+
+        # Refresh processing every 5 seconds while nothing is pushed
         GLib.timeout_add_seconds(
-            5, lambda: (self.load_current_processing(), True)[1]
+            5, lambda: (self.poll_current_processing(), True)[1]
         )
 
         # Refresh status every 30 seconds
@@ -1138,6 +1501,19 @@ class EmbyMonitorApp(Gtk.Window):
             1, lambda: (self.update_server_time(), True)[1]
         )
 
+    def poll_current_processing(self):
+        """Poll processing over REST unless the WebSocket is connected."""
+        if self.emby_websocket is None or not self.emby_websocket.connected:
+            self.load_current_processing()
+
+    def on_tasks_pushed(self, tasks):
+        """Render a pushed task list; called on the WebSocket thread."""
+        processing = build_processing_media(filter_active_tasks(tasks))
+        # Emby pushes every second; only redraw when something changed
+        if processing != getattr(self, "_pushed_processing", None):
+            self._pushed_processing = processing
+            GLib.idle_add(self._render_processing, processing)
+
     def update_server_time(self):
          """Update server time display."""
          now = datetime.now()
@@ -1167,26 +1543,20 @@ class EmbyMonitorApp(Gtk.Window):
 
     def show_movie_details(self, movie_data):
         """Show detailed movie information dialog."""
-        # Get full item details
         item_id = movie_data.get("Id")
         if not item_id:
             return
 
-        movie = self.emby.get_item_details(item_id)
-        if not movie:
-            self.show_error_dialog("Failed to load movie details")
-            return
-
-        # Create dialog
+        # Open right away with what the card knows; details load async
         dialog = Gtk.Dialog(
-            title=movie.get("Name", "Movie Details"),
+            title=movie_data.get("Name", "Movie Details"),
             parent=self,
             flags=0,
         )
         dialog.set_default_size(900, 700)
 
         # Add buttons to footer
-        emby_btn = dialog.add_button("🔗 Open in Emby", Gtk.ResponseType.APPLY)
+        dialog.add_button("🔗 Open in Emby", Gtk.ResponseType.APPLY)
         dialog.add_button(Gtk.STOCK_CLOSE, Gtk.ResponseType.CLOSE)
 
         # Create scrolled window
@@ -1207,15 +1577,70 @@ class EmbyMonitorApp(Gtk.Window):
         main_hbox.pack_start(poster_box, False, False, 0)
 
         # Load poster asynchronously
-        threading.Thread(
-            target=self.load_thumbnail,
-            args=(item_id, poster_image, False),
-            daemon=True,
-        ).start()
+        self.queue_thumbnail(
+            item_id,
+            poster_image,
+            priority=PRIORITY_DIALOG,
+            group="movie-dialog",
+            tag=movie_data.get("ImageTags", {}).get("Primary"),
+        )
 
-        # Details vbox
+        # Details vbox, showing a skeleton until the item arrives
         details_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
+        details_vbox.pack_start(
+            self.create_loading_placeholder(movie_data.get("Name", "")),
+            False,
+            False,
+            0,
+        )
 
+        main_hbox.pack_start(details_vbox, True, True, 0)
+        scrolled.add(main_hbox)
+
+        dialog.get_content_area().pack_start(scrolled, True, True, 0)
+        dialog.show_all()
+
+        closed = threading.Event()
+
+        def fetch_details():
+            try:
+                movie = self.emby.get_item_details(item_id)
+            except Exception as e:
+                print(f"Error loading movie details: {e}")
+                movie = None
+            if not closed.is_set():
+                GLib.idle_add(on_details, movie)
+
+        def on_details(movie):
+            if closed.is_set():
+                return False
+            for child in details_vbox.get_children():
+                details_vbox.remove(child)
+            if movie:
+                self.fill_movie_details(details_vbox, movie)
+            else:
+                details_vbox.pack_start(
+                    Gtk.Label(label="Failed to load movie details"),
+                    False,
+                    False,
+                    0,
+                )
+            details_vbox.show_all()
+            return False
+
+        threading.Thread(target=fetch_details, daemon=True).start()
+
+        # Handle button responses
+        response = dialog.run()
+        closed.set()
+        if response == Gtk.ResponseType.APPLY:
+            self.open_in_emby(item_id)
+
+        dialog.destroy()
+        self.thumbnails.cancel_group("movie-dialog")
+
+    def fill_movie_details(self, details_vbox, movie):
+        """Add the loaded movie's details to the dialog's details box."""
         # Title and year
         title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         title_label = Gtk.Label(label=movie.get("Name", "Unknown"))
@@ -1341,11 +1766,14 @@ class EmbyMonitorApp(Gtk.Window):
                     actor_vbox.pack_start(actor_image, False, False, 0)
 
                     # Load actor image
-                    threading.Thread(
-                        target=self.load_thumbnail,
-                        args=(actor.get("Id"), actor_image, True),
-                        daemon=True,
-                    ).start()
+                    self.queue_thumbnail(
+                        actor.get("Id"),
+                        actor_image,
+                        is_person=True,
+                        priority=PRIORITY_DIALOG,
+                        group="movie-dialog",
+                        tag=actor.get("PrimaryImageTag"),
+                    )
 
                     # Actor name
                     actor_name = Gtk.Label(label=actor.get("Name", ""))
@@ -1371,28 +1799,41 @@ class EmbyMonitorApp(Gtk.Window):
                 cast_frame.add(cast_scroll)
                 details_vbox.pack_start(cast_frame, False, False, 0)
 
-        main_hbox.pack_start(details_vbox, True, True, 0)
-        scrolled.add(main_hbox)
-
-        dialog.get_content_area().pack_start(scrolled, True, True, 0)
-        dialog.show_all()
-
-        # Handle button responses
-        response = dialog.run()
-        if response == Gtk.ResponseType.APPLY:
-            # Open in Emby with correct Server ID
-            import webbrowser
-            
-            # Get server ID
-            server_id = item_id # Fallback
-            sys_info = self.emby.get_system_info()
-            if sys_info:
-                server_id = sys_info.get("Id", item_id)
-                
-            emby_url = f"{config.EMBY_SERVER_URL}/web/index.html#!/item?id={item_id}&serverId={server_id}"
+    def create_loading_placeholder(self, title=""):
+        """Return a skeleton shown in a dialog while its data loads."""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        if title:
+            title_label = Gtk.Label(label=title)
+            title_label.set_halign(Gtk.Align.START)
+            title_label.set_line_wrap(True)
+            title_label.modify_font(Pango.FontDescription("bold 16"))
+            box.pack_start(title_label, False, False, 0)
+
+        loading_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        spinner = Gtk.Spinner()
+        spinner.start()
+        loading_box.pack_start(spinner, False, False, 0)
+        loading_label = Gtk.Label()
+        loading_label.set_markup("<span color='#666'>Loading…</span>")
+        loading_box.pack_start(loading_label, False, False, 0)
+        box.pack_start(loading_box, False, False, 0)
+        return box
+
+    def open_in_emby(self, item_id):
+        """Open an item in the Emby web UI without blocking the main loop."""
+        def worker():
+            server_id = self.server_id
+            if not server_id:
+                sys_info = self.emby.get_system_info()
+                if sys_info:
+                    server_id = self.server_id = sys_info.get("Id")
+            emby_url = (
+                f"{config.EMBY_SERVER_URL}/web/index.html#!/item"
+                f"?id={item_id}&serverId={server_id or item_id}"
+            )
             webbrowser.open(emby_url)
 
-        dialog.destroy()
+        threading.Thread(target=worker, daemon=True).start()
 
     def show_server_details(self):
         """Show detailed server information dialog."""
@@ -1590,22 +2031,16 @@ class EmbyMonitorApp(Gtk.Window):
         
         vbox.pack_start(hbox, False, False, 0)
 
-        # Scrolled window
-        scrolled = Gtk.ScrolledWindow()
-        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-
-        # FlowBox for grid layout
-        self.cast_flowbox = Gtk.FlowBox()
-        self.cast_flowbox.set_valign(Gtk.Align.START)
-        self.cast_flowbox.set_max_children_per_line(8)
-        self.cast_flowbox.set_min_children_per_line(2)
-        self.cast_flowbox.set_selection_mode(Gtk.SelectionMode.NONE)
-        self.cast_flowbox.set_homogeneous(True)
-        self.cast_flowbox.set_column_spacing(15)
-        self.cast_flowbox.set_row_spacing(15)
-        scrolled.add(self.cast_flowbox)
-
-        vbox.pack_start(scrolled, True, True, 0)
+        # Virtualized grid of person cards
+        self.cast_view = VirtualGrid(
+            self.create_person_card,
+            cell_width=220,
+            cell_height=270,
+            spacing=15,
+            release_widget=self.release_card,
+            placeholder="No people found.",
+        )
+        vbox.pack_start(self.cast_view, True, True, 0)
         
         # Load initial cast
         self.load_cast()
@@ -1613,41 +2048,39 @@ class EmbyMonitorApp(Gtk.Window):
         return vbox
 
     def on_cast_search_changed(self, entry):
-        """Handle cast search input."""
-        query = entry.get_text()
-        self.load_cast(query)
+        """Handle cast search input once typing pauses."""
+        self.debounce_search("cast", self.load_cast, entry.get_text())
 
     def load_cast(self, query=None):
         """Load cast members."""
         self.show_progress()
-        
-        # Clear existing
-        for child in self.cast_flowbox.get_children():
-            self.cast_flowbox.remove(child)
+        generation = self.next_request("cast")
 
         def fetch_cast():
-            # Correctly call get_persons with labeled arguments
-            persons = self.emby.get_persons(limit=50, search_term=query)
+            if not self.is_current_request("cast", generation):
+                return
+            if query and self.search_index_ready():
+                persons = self.search_index.search(
+                    query, limit=50, item_types=["Person"]
+                )
+            else:
+                # Correctly call get_persons with labeled arguments
+                persons = self.emby.get_persons(limit=50, search_term=query)
             
-            GLib.idle_add(self.populate_cast_grid, persons)
+            GLib.idle_add(self.populate_cast_grid, persons, generation)
 
         threading.Thread(target=fetch_cast, daemon=True).start()
 
-    def populate_cast_grid(self, persons):
-        """Populate the cast flowbox with person cards."""
+    def populate_cast_grid(self, persons, generation=None):
+        """Show the fetched people in the cast grid."""
+        # Drop results of searches superseded while they were in flight
+        if generation is not None and not self.is_current_request(
+            "cast", generation
+        ):
+            return False
         self.hide_progress()
-        if not persons:
-            label = Gtk.Label(label="No people found.")
-            label.set_sensitive(False)
-            self.cast_flowbox.add(label)
-            self.cast_flowbox.show_all()
-            return
-
-        for person in persons:
-            card = self.create_person_card(person)
-            self.cast_flowbox.add(card)
-        
-        self.cast_flowbox.show_all()
+        # Replacing the items drops old cards and their queued thumbnails
+        self.cast_view.set_items(persons or [], reset_scroll=True)
 
     def create_person_card(self, person):
         """Create a card for a person."""
@@ -1668,17 +2101,21 @@ class EmbyMonitorApp(Gtk.Window):
         vbox.pack_start(image_box, False, False, 0)
 
         if person.get("Id"):
-            threading.Thread(
-                target=self.load_thumbnail,
-                args=(person["Id"], image, True),
-                daemon=True
-            ).start()
+            event_box.thumbnail_job = self.queue_thumbnail(
+                person["Id"],
+                image,
+                is_person=True,
+                priority=PRIORITY_VISIBLE,
+                tag=person.get("ImageTags", {}).get("Primary"),
+            )
 
         # Name
         name_label = Gtk.Label(label=person.get("Name", "Unknown"))
         name_label.set_justify(Gtk.Justification.CENTER)
         name_label.set_line_wrap(True)
         name_label.set_max_width_chars(15)
+        name_label.set_lines(2)
+        name_label.set_ellipsize(Pango.EllipsizeMode.END)
         name_label.set_markup(f"<span weight='bold' size='10240'>{GLib.markup_escape_text(person.get('Name', 'Unknown'))}</span>")
         vbox.pack_start(name_label, False, False, 0)
 
@@ -1690,12 +2127,9 @@ class EmbyMonitorApp(Gtk.Window):
         person_id = person_data.get("Id")
         if not person_id: return
 
-        # Fetch details
-        person = self.emby.get_item_details(person_id)
-        credits = self.emby.get_person_credits(person_id)
-
+        # Open right away; details and credits load concurrently
         dialog = Gtk.Dialog(
-            title=person.get("Name", "Person Details"),
+            title=person_data.get("Name", "Person Details"),
             parent=self,
             flags=0,
             buttons=(Gtk.STOCK_CLOSE, Gtk.ResponseType.CLOSE)
@@ -1720,20 +2154,98 @@ class EmbyMonitorApp(Gtk.Window):
         img_box.pack_start(image, False, False, 0)
         hbox.pack_start(img_box, False, False, 0)
         
-        threading.Thread(
-             target=self.load_thumbnail,
-             args=(person_id, image, True),
-             daemon=True
-        ).start()
+        self.queue_thumbnail(
+            person_id,
+            image,
+            is_person=True,
+            priority=PRIORITY_DIALOG,
+            group="person-dialog",
+            tag=person_data.get("ImageTags", {}).get("Primary"),
+        )
 
         # Info
         info_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         
-        name = Gtk.Label(label=person.get("Name"))
+        name = Gtk.Label(label=person_data.get("Name"))
         name.set_halign(Gtk.Align.START)
         name.modify_font(Pango.FontDescription("bold 18"))
         info_vbox.pack_start(name, False, False, 0)
 
+        bio_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        bio_box.pack_start(self.create_loading_placeholder(), False, False, 0)
+        info_vbox.pack_start(bio_box, True, True, 0)
+
+        hbox.pack_start(info_vbox, True, True, 0)
+        content_box.pack_start(hbox, False, False, 0)
+
+        # Credits (Appears In)
+        credits_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        credits_box.pack_start(
+            self.create_loading_placeholder(), False, False, 0
+        )
+        content_box.pack_start(credits_box, True, True, 0)
+
+        scrolled.add(content_box)
+        dialog.get_content_area().pack_start(scrolled, True, True, 0)
+        dialog.show_all()
+
+        closed = threading.Event()
+
+        def fetch(getter, on_done):
+            try:
+                result = getter(person_id)
+            except Exception as e:
+                print(f"Error loading person details: {e}")
+                result = None
+            if not closed.is_set():
+                GLib.idle_add(on_done, result)
+
+        def clear(box):
+            for child in box.get_children():
+                box.remove(child)
+
+        def show_error(box, message):
+            label = Gtk.Label(label=message)
+            label.set_halign(Gtk.Align.START)
+            box.pack_start(label, False, False, 0)
+
+        def on_person(person):
+            if closed.is_set():
+                return False
+            clear(bio_box)
+            if person:
+                self.fill_person_info(bio_box, person)
+            else:
+                show_error(bio_box, "Failed to load person details")
+            bio_box.show_all()
+            return False
+
+        def on_credits(credits):
+            if closed.is_set():
+                return False
+            clear(credits_box)
+            if credits is None:
+                show_error(credits_box, "Failed to load credits")
+            else:
+                self.fill_person_credits(credits_box, credits)
+            credits_box.show_all()
+            return False
+
+        for getter, on_done in (
+            (self.emby.get_item_details, on_person),
+            (self.emby.get_person_credits, on_credits),
+        ):
+            threading.Thread(
+                target=fetch, args=(getter, on_done), daemon=True
+            ).start()
+
+        dialog.run()
+        closed.set()
+        dialog.destroy()
+        self.thumbnails.cancel_group("person-dialog")
+
+    def fill_person_info(self, info_vbox, person):
+        """Add a loaded person's birth details and biography."""
         if person.get("PremiereDate"):
              bdate = self.format_datetime(person["PremiereDate"]).split(' ')[0]
              born = Gtk.Label()
@@ -1760,10 +2272,8 @@ class EmbyMonitorApp(Gtk.Window):
             bio_scroll.add(bio)
             info_vbox.pack_start(bio_scroll, True, True, 0)
 
-        hbox.pack_start(info_vbox, True, True, 0)
-        content_box.pack_start(hbox, False, False, 0)
-
-        # Credits (Appears In)
+    def fill_person_credits(self, credits_box, credits):
+        """Add the "Appears In" strip for a person's loaded credits."""
         if credits:
             credits_frame = Gtk.Frame(label="Appears In")
             credits_scroll = Gtk.ScrolledWindow()
@@ -1784,11 +2294,13 @@ class EmbyMonitorApp(Gtk.Window):
                  card.pack_start(c_img, False, False, 0)
                  
                  if credit.get("Id"):
-                     threading.Thread(
-                         target=self.load_thumbnail,
-                         args=(credit["Id"], c_img, False),
-                         daemon=True
-                     ).start()
+                     self.queue_thumbnail(
+                         credit["Id"],
+                         c_img,
+                         priority=PRIORITY_DIALOG,
+                         group="person-dialog",
+                         tag=credit.get("ImageTags", {}).get("Primary"),
+                     )
 
                  c_title = Gtk.Label(label=credit.get("Name", ""))
                  c_title.set_line_wrap(True)
@@ -1800,13 +2312,7 @@ class EmbyMonitorApp(Gtk.Window):
 
             credits_scroll.add(credits_flow)
             credits_frame.add(credits_scroll)
-            content_box.pack_start(credits_frame, True, True, 0)
-
-        scrolled.add(content_box)
-        dialog.get_content_area().pack_start(scrolled, True, True, 0)
-        dialog.show_all()
-        dialog.run()
-        dialog.destroy()
+            credits_box.pack_start(credits_frame, True, True, 0)
 
 
 def main():
@@ -0,0 +1,1453 @@
+"""
+Local stand-in for an Emby server, backed by a seeded synthetic library.
+
+Implements the endpoints emby-assistant uses (users, items, persons,
+libraries, scheduled tasks, sessions, system info, activity log, images
+and the /embywebsocket push feed), so EmbyClient, app.py and app_gtk.py
+can run offline and benchmarks have a reproducible upstream. The same
+seed always yields the same library; task progress and playback advance
+with the clock.
+
+Optional item fields are only returned when listed in Fields, like
+Emby, so field profiles change response sizes here too. Latency, jitter
+and random 5xx errors can be injected, and /stub/stats reports request
+counts and bytes served (POST /stub/reset clears them).
+
+Usage:
+    python benchmarks/emby_stub.py [--items 100000] [--persons 20000]
+        [--port 8096] [--latency-ms 0] [--jitter-ms 0] [--error-rate 0]
+        [--churn-interval 0] [--keepalive-timeout 60] [--seed 1]
+
+    EMBY_SERVER_URL=http://127.0.0.1:8096 EMBY_API_KEY=stub python app.py
+"""
+
+# Standard library imports
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import select
+import struct
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+SERVER_ID = "0123456789abcdef0123456789abcdef"
+USER_ID = "a1b2c3d4e5f60718293a4b5c6d7e8f90"
+
+# Ids are numeric strings like Emby's; each kind gets its own range
+LIBRARY_ID_BASE = 100
+ITEM_ID_BASE = 1_000_000
+PERSON_ID_BASE = 9_000_000
+
+# Fields Emby returns without being asked for
+BASE_FIELDS = (
+    "Name", "ServerId", "Id", "Type", "IsFolder",
+    "SeriesName", "SeriesId", "IndexNumber", "ParentIndexNumber",
+)
+
+# (name, collection type, folder, share of items)
+LIBRARIES = (
+    ("Movies", "movies", "movies", 0.35),
+    ("TV Shows", "tvshows", "tv", 0.45),
+    ("Music", "music", "music", 0.15),
+    ("Home Videos", "homevideos", "videos", 0.05),
+)
+
+WORDS = (
+    "shadow river night golden silent iron last city storm glass winter "
+    "broken hidden crimson northern lost dark wild blue empire garden "
+    "secret burning distant eternal fallen frozen heart hollow island "
+    "kingdom light midnight mountain ocean paper quiet rain road saint "
+    "silver sky song star stone summer sun tale thunder tide tower valley "
+    "voice wolf world dream echo fire ghost harbor legend machine mirror "
+    "moon orchard paradise queen rebel ridge rose runner signal spirit"
+).split()
+FIRST_NAMES = (
+    "Ada Alan Anna Ben Carla Chen Dana David Elena Emil Farah Felix Grace "
+    "Hana Hugo Ines Ivan Jade Jonas Kara Kenji Lara Leo Maya Milo Nadia "
+    "Omar Paula Pavel Quinn Rosa Ravi Sara Sven Tara Theo Uma Victor Wen "
+    "Xavier Yara Yusuf Zoe"
+).split()
+LAST_NAMES = (
+    "Abbott Alvarez Berg Brooks Castillo Chandra Dalton Duarte Eriksen "
+    "Fischer Garner Haddad Ibarra Jensen Kowalski Lindqvist Moreau Nakamura "
+    "Okafor Petrov Quintero Rossi Sato Schneider Takahashi Ueda Varga "
+    "Whitaker Xu Yilmaz Zielinski"
+).split()
+GENRES = (
+    "Action Adventure Animation Comedy Crime Documentary Drama Family "
+    "Fantasy History Horror Music Mystery Romance Science-Fiction Thriller "
+    "War Western"
+).split()
+OFFICIAL_RATINGS = ("G", "PG", "PG-13", "R", "NC-17", "TV-14", "TV-MA")
+STUDIOS = ("Northlight", "Blue Harbor", "Ironwood", "Meridian", "Paper Crane")
+LANGUAGES = ("eng", "fre", "ger", "spa", "jpn", "ita")
+# Optional fields whose values are drawn at random rather than derived
+RANDOM_FIELDS = frozenset((
+    "OfficialRating", "RunTimeTicks", "PremiereDate", "Size",
+    "OriginalTitle", "Overview", "Genres", "Studios", "Tags", "ProviderIds",
+    "MediaStreams",
+))
+
+# Runtime range in minutes of playable item types
+RUNTIMES = {
+    "Movie": (80, 180),
+    "Episode": (20, 60),
+    "Audio": (2, 7),
+    "Video": (1, 30),
+}
+ROLES = ("Actor", "Actor", "Actor", "Actor", "Director", "Writer", "Producer")
+
+TASKS = (
+    # (name, category, period s, duration s)
+    ("Scan media library", "Library", 600, 120),
+    ("Refresh people", "Library", 1800, 90),
+    ("Thumbnail image extraction", "Library", 900, 240),
+    ("Extract chapter images", "Library", 3600, 300),
+    ("Download missing subtitles", "Library", 1200, 60),
+    ("Refresh guide", "Live TV", 7200, 180),
+    ("Clean cache directory", "Maintenance", 3600, 20),
+    ("Clean transcode directory", "Maintenance", 3600, 10),
+    ("Rotate log file", "Maintenance", 86400, 5),
+    ("Optimize database", "Maintenance", 86400, 45),
+    ("Check for plugin updates", "Application", 21600, 15),
+    ("Check for application updates", "Application", 21600, 10),
+)
+CLIENTS = (
+    ("Emby Web", "Firefox"), ("Emby for Android", "Pixel 8"),
+    ("Emby Theater", "Living Room PC"), ("Emby for iOS", "iPad"),
+    ("Emby for Roku", "Roku Ultra"), ("Emby for Samsung", "Samsung TV"),
+)
+
+TICKS_PER_SECOND = 10_000_000
+EPOCH = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+
+def emby_date(seconds: float) -> str:
+    """Format seconds after EPOCH the way Emby does (7 decimal digits)."""
+    value = EPOCH + timedelta(seconds=seconds)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.0000000Z")
+
+
+def utc_now_iso(offset: float = 0) -> str:
+    """Format the current time (plus offset seconds) like Emby."""
+    value = datetime.now(timezone.utc) + timedelta(seconds=offset)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.0000000Z")
+
+
+def title(rng: random.Random, low: int = 1, high: int = 4) -> str:
+    """Return a random capitalized title of low..high words."""
+    return " ".join(
+        rng.choice(WORDS).capitalize() for _ in range(rng.randint(low, high))
+    )
+
+
+def sort_name(name: str) -> str:
+    """Return Emby's SortName for a name (lowercase, no leading article)."""
+    lowered = name.lower()
+    for article in ("the ", "a ", "an "):
+        if lowered.startswith(article):
+            return lowered[len(article):]
+    return lowered
+
+
+class SyntheticLibrary:
+    """
+    Deterministic Emby library of any size.
+
+    Sortable and filterable attributes of every item are generated up
+    front into compact records; bulky fields (overview, people, media
+    streams) are derived from the item's own seed when requested, so a
+    100k-item library stays small in memory and cheap to build.
+    """
+
+    def __init__(
+        self,
+        items: int = 100_000,
+        persons: int = 20_000,
+        sessions: int = 6,
+        seed: int = 1,
+    ):
+        """
+        Generate the library.
+
+        Args:
+            items: Total number of items across all libraries
+            persons: Number of people credited on items
+            sessions: Number of client sessions, about half playing
+            seed: Seed making the whole library reproducible
+        """
+        self.seed = seed
+        self.session_count = sessions
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._versions: Dict[int, int] = {}
+        self._orders: "OrderedDict[Tuple, List[int]]" = OrderedDict()
+        self._credits: Optional[Dict[int, List[int]]] = None
+
+        rng = random.Random(seed)
+        self.persons = self._make_persons(rng, persons)
+        self.person_order = sorted(
+            range(len(self.persons)), key=lambda p: self.persons[p][1]
+        )
+        self.records: List[Tuple] = []
+        self.library_ranges: List[Tuple[int, int]] = []
+        for library, (_, collection, _, share) in enumerate(LIBRARIES):
+            start = len(self.records)
+            count = (
+                items - start
+                if library == len(LIBRARIES) - 1
+                else int(items * share)
+            )
+            self._make_items(rng, library, collection, count)
+            self.library_ranges.append((start, len(self.records)))
+
+    # Generation
+
+    def _make_persons(self, rng: random.Random, count: int) -> List[Tuple]:
+        """Return (name, sort key, born, has image) for every person."""
+        persons = []
+        for _ in range(count):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            if rng.random() < 0.3:
+                name += f" {rng.choice(LAST_NAMES)}"
+            born = rng.uniform(-70, -18) * 365 * 86400
+            persons.append((name, name.lower(), born, rng.random() < 0.8))
+        return persons
+
+    def _make_items(
+        self, rng: random.Random, library: int, collection: str, count: int
+    ):
+        """
+        Append count records to one library.
+
+        A record is (type, library, name, sort name, year, created,
+        rating, parent index, season, episode, has image).
+        """
+        def add(item_type, name, year, parent=-1, season=None, episode=None):
+            created = rng.uniform(0, 10 * 365 * 86400)
+            rating = round(rng.uniform(3, 9.5), 1)
+            self.records.append(
+                (
+                    item_type, library, name, sort_name(name), year,
+                    created, rating, parent, season, episode,
+                    rng.random() < 0.92,
+                )
+            )
+
+        if collection == "movies":
+            for i in range(count):
+                if i % 40 == 39:
+                    add("BoxSet", f"{title(rng, 1, 2)} Collection", None)
+                else:
+                    add("Movie", title(rng), rng.randint(1950, 2025))
+        elif collection == "tvshows":
+            added = 0
+            while added < count:
+                series = len(self.records)
+                year = rng.randint(1990, 2025)
+                add("Series", title(rng, 1, 3), year)
+                added += 1
+                seasons = rng.randint(1, 6)
+                for season in range(1, seasons + 1):
+                    for episode in range(1, rng.randint(6, 13)):
+                        if added >= count:
+                            return
+                        add(
+                            "Episode", title(rng, 1, 3), year + season - 1,
+                            series, season, episode,
+                        )
+                        added += 1
+        elif collection == "music":
+            added = 0
+            while added < count:
+                album = len(self.records)
+                year = rng.randint(1960, 2025)
+                add("MusicAlbum", title(rng, 1, 3), year)
+                added += 1
+                for track in range(1, rng.randint(8, 15)):
+                    if added >= count:
+                        return
+                    add("Audio", title(rng, 1, 4), year, album, 1, track)
+                    added += 1
+        else:
+            for _ in range(count):
+                add("Video", title(rng, 2, 4), rng.randint(2005, 2025))
+
+    # Lookups
+
+    def item_id(self, index: int) -> str:
+        return str(ITEM_ID_BASE + index)
+
+    def person_id(self, index: int) -> str:
+        return str(PERSON_ID_BASE + index)
+
+    def library_id(self, library: int) -> str:
+        return str(LIBRARY_ID_BASE + library)
+
+    def item_index(self, item_id: str) -> Optional[int]:
+        """Return the record index of an item id, or None."""
+        if item_id.isdigit():
+            index = int(item_id) - ITEM_ID_BASE
+            if 0 <= index < len(self.records):
+                return index
+        return None
+
+    def person_index(self, person_id: str) -> Optional[int]:
+        """Return the index of a person id, or None."""
+        if person_id.isdigit():
+            index = int(person_id) - PERSON_ID_BASE
+            if 0 <= index < len(self.persons):
+                return index
+        return None
+
+    def version(self, index: int) -> int:
+        """Return how many times an item has been updated by churn."""
+        return self._versions.get(index, 0)
+
+    def touch(self, indices: List[int]):
+        """Mark items as updated (new image tag and DateModified)."""
+        with self._lock:
+            for index in indices:
+                self._versions[index] = self._versions.get(index, 0) + 1
+
+    def image_tag(self, kind: str, index: int) -> str:
+        """Return a stable image tag for an item or person."""
+        version = self.version(index) if kind == "item" else 0
+        raw = f"{self.seed}:{kind}:{index}:{version}".encode()
+        return hashlib.md5(raw).hexdigest()
+
+    # Item documents
+
+    def item(self, index: int, fields: frozenset) -> Dict:
+        """Build the Emby item document of a record with optional fields."""
+        (item_type, library, name, sort, year, created, rating, parent,
+         season, episode, has_image) = self.records[index]
+        folder = item_type in ("Series", "BoxSet", "MusicAlbum")
+        doc = {
+            "Name": name,
+            "ServerId": SERVER_ID,
+            "Id": self.item_id(index),
+            "Type": item_type,
+            "IsFolder": folder,
+        }
+        if item_type == "Episode":
+            doc["SeriesName"] = self.records[parent][2]
+            doc["SeriesId"] = self.item_id(parent)
+        if season is not None:
+            doc["ParentIndexNumber"] = season
+            doc["IndexNumber"] = episode
+
+        lib_folder = LIBRARIES[library][2]
+        extension = "flac" if item_type == "Audio" else "mkv"
+        optional = {
+            "ImageTags": lambda rng: (
+                {"Primary": self.image_tag("item", index)}
+                if has_image else {}
+            ),
+            "BackdropImageTags": lambda rng: (
+                [self.image_tag("backdrop", index)] if has_image else []
+            ),
+            "ProductionYear": lambda rng: year,
+            "CommunityRating": lambda rng: rating,
+            "CriticRating": lambda rng: int(rating * 10),
+            "OfficialRating": lambda rng: rng.choice(OFFICIAL_RATINGS),
+            "RunTimeTicks": lambda rng: (
+                rng.randint(*RUNTIMES[item_type]) * 60 * TICKS_PER_SECOND
+                if item_type in RUNTIMES else None
+            ),
+            "DateCreated": lambda rng: emby_date(created),
+            "DateModified": lambda rng: emby_date(
+                created + 86400 * self.version(index)
+            ),
+            "PremiereDate": lambda rng: (
+                f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                "T00:00:00.0000000Z" if year else None
+            ),
+            "ParentId": lambda rng: (
+                self.item_id(parent) if parent >= 0
+                else self.library_id(library)
+            ),
+            "Path": lambda rng: (
+                None if folder else
+                f"/media/{lib_folder}/{name} ({year})/{name}.{extension}"
+            ),
+            "Container": lambda rng: None if folder else extension,
+            "Size": lambda rng: (
+                None if folder else rng.randint(50, 8000) * 1024 * 1024
+            ),
+            "SortName": lambda rng: sort,
+            "OriginalTitle": lambda rng: (
+                title(rng, 1, 3) if rng.random() < 0.2 else None
+            ),
+            "Overview": lambda rng: " ".join(
+                rng.choices(WORDS, k=rng.randint(30, 90))
+            ).capitalize() + ".",
+            "Genres": lambda rng: rng.sample(GENRES, rng.randint(1, 3)),
+            "Studios": lambda rng: [
+                {"Name": s, "Id": str(zlib.crc32(s.encode()) % 10**6)}
+                for s in rng.sample(STUDIOS, rng.randint(1, 2))
+            ],
+            "Tags": lambda rng: rng.sample(WORDS, rng.randint(0, 3)),
+            "ProviderIds": lambda rng: {
+                "Imdb": f"tt{rng.randint(10**6, 10**7)}",
+                "Tmdb": str(rng.randint(1, 10**6)),
+            },
+            "People": lambda rng: self._people(index),
+            "MediaStreams": lambda rng: self._media_streams(rng, item_type),
+            "PrimaryImageAspectRatio": lambda rng: (
+                1.0 if item_type in ("MusicAlbum", "Audio") else 0.6667
+            ),
+        }
+        # Each field draws from its own seed, so only requested fields are
+        # generated and a value never depends on which others were asked for
+        for field in fields.intersection(optional):
+            rng = (
+                random.Random(f"{self.seed}:{index}:{field}")
+                if field in RANDOM_FIELDS else None
+            )
+            value = optional[field](rng)
+            if value is not None:
+                doc[field] = value
+        return doc
+
+    def _people(self, index: int) -> List[Dict]:
+        """Return the cast and crew of an item."""
+        people = []
+        for person, role in self._credited(index):
+            name, _, _, has_image = self.persons[person]
+            entry = {
+                "Name": name,
+                "Id": self.person_id(person),
+                "Type": role,
+            }
+            if role == "Actor":
+                entry["Role"] = FIRST_NAMES[
+                    (person + index) % len(FIRST_NAMES)
+                ]
+            if has_image:
+                entry["PrimaryImageTag"] = self.image_tag("person", person)
+            people.append(entry)
+        return people
+
+    def _credited(self, index: int) -> List[Tuple[int, str]]:
+        """Return (person index, role) pairs credited on an item."""
+        item_type = self.records[index][0]
+        if not self.persons or item_type in ("BoxSet", "Audio"):
+            return []
+        # Multiplicative hashing instead of a seeded Random: this runs for
+        # every item when the person -> items map is built
+        mixed = (index + 1) * 2654435761 + self.seed * 40503
+        count = (2 + mixed % 4) if item_type == "Video" else (4 + mixed % 9)
+        persons = len(self.persons)
+        return [
+            (
+                (mixed >> 3) * (k + 1) % persons,
+                ROLES[(mixed + k) % len(ROLES)],
+            )
+            for k in range(count)
+        ]
+
+    def _media_streams(self, rng: random.Random, item_type: str) -> List[Dict]:
+        """Return plausible video/audio/subtitle streams for an item."""
+        if item_type in ("Series", "BoxSet", "MusicAlbum"):
+            return []
+        streams = []
+        if item_type != "Audio":
+            width, height = rng.choice(
+                ((1920, 1080), (3840, 2160), (1280, 720), (720, 480))
+            )
+            streams.append({
+                "Codec": rng.choice(("h264", "hevc", "av1")),
+                "Type": "Video",
+                "Index": 0,
+                "Width": width,
+                "Height": height,
+                "BitRate": rng.randint(2, 40) * 1_000_000,
+                "AspectRatio": "16:9",
+                "RealFrameRate": rng.choice((23.976, 25.0, 29.97)),
+                "DisplayTitle": f"{height}p",
+            })
+        for _ in range(rng.randint(1, 3)):
+            language = rng.choice(LANGUAGES)
+            streams.append({
+                "Codec": rng.choice(("aac", "ac3", "eac3", "dts", "flac")),
+                "Type": "Audio",
+                "Index": len(streams),
+                "Language": language,
+                "Channels": rng.choice((2, 6, 8)),
+                "SampleRate": 48000,
+                "DisplayTitle": f"{language.upper()} Audio",
+            })
+        if item_type != "Audio":
+            for _ in range(rng.randint(0, 4)):
+                language = rng.choice(LANGUAGES)
+                streams.append({
+                    "Codec": "subrip",
+                    "Type": "Subtitle",
+                    "Index": len(streams),
+                    "Language": language,
+                    "IsExternal": rng.random() < 0.5,
+                    "DisplayTitle": f"{language.upper()} Subtitle",
+                })
+        return streams
+
+    def person(self, index: int, fields: frozenset) -> Dict:
+        """Build the Emby document of a person."""
+        name, _, born, has_image = self.persons[index]
+        doc = {
+            "Name": name,
+            "ServerId": SERVER_ID,
+            "Id": self.person_id(index),
+            "Type": "Person",
+            "IsFolder": False,
+            "ImageTags": (
+                {"Primary": self.image_tag("person", index)}
+                if has_image else {}
+            ),
+        }
+        rng = random.Random(f"{self.seed}:person:{index}")
+        if "Overview" in fields:
+            doc["Overview"] = " ".join(
+                rng.choices(WORDS, k=rng.randint(20, 80))
+            ).capitalize() + "."
+        if "PremiereDate" in fields:
+            doc["PremiereDate"] = emby_date(born)
+        if "ProductionLocations" in fields:
+            doc["ProductionLocations"] = [f"{title(rng, 1, 1)} City"]
+        if "DateCreated" in fields:
+            doc["DateCreated"] = emby_date(abs(born) % (10 * 365 * 86400))
+        return doc
+
+    def credits(self, person: int) -> List[int]:
+        """Return the record indices a person is credited on."""
+        with self._lock:
+            if self._credits is None:
+                credits: Dict[int, List[int]] = {}
+                for index in range(len(self.records)):
+                    for credited, _ in self._credited(index):
+                        credits.setdefault(credited, []).append(index)
+                self._credits = credits
+            return self._credits.get(person, [])
+
+    # Queries
+
+    def query(
+        self,
+        sort_by: str = "SortName",
+        descending: bool = False,
+        types: Optional[frozenset] = None,
+        exclude_types: Optional[frozenset] = None,
+        parent: Optional[str] = None,
+        search: Optional[str] = None,
+        person: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Return matching record indices in sort order.
+
+        Results are memoized per filter combination, so paging through
+        one listing filters and sorts the library only once.
+        """
+        key = (sort_by, descending, types, exclude_types, parent, search,
+               person)
+        with self._lock:
+            cached = self._orders.get(key)
+            if cached is not None:
+                self._orders.move_to_end(key)
+                return cached
+
+        if person is not None:
+            candidates = self.credits(person)
+        elif parent is not None:
+            candidates = self._children(parent)
+        else:
+            candidates = range(len(self.records))
+        records = self.records
+        needle = search.lower() if search else None
+        matches = [
+            index for index in candidates
+            if (types is None or records[index][0].lower() in types)
+            and (exclude_types is None
+                 or records[index][0].lower() not in exclude_types)
+            and (needle is None or needle in records[index][3])
+        ]
+        sort_key = {
+            "DateCreated": lambda i: records[i][5],
+            "ProductionYear": lambda i: (records[i][4] or 0, records[i][3]),
+            "PremiereDate": lambda i: (records[i][4] or 0, records[i][3]),
+            "CommunityRating": lambda i: records[i][6],
+        }.get(sort_by, lambda i: records[i][3])
+        matches.sort(key=sort_key, reverse=descending)
+
+        with self._lock:
+            self._orders[key] = matches
+            while len(self._orders) > 64:
+                self._orders.popitem(last=False)
+        return matches
+
+    def _children(self, parent: str) -> List[int]:
+        """Return the records under a library or a series/album."""
+        if parent.isdigit() and LIBRARY_ID_BASE <= int(parent) < (
+            LIBRARY_ID_BASE + len(LIBRARIES)
+        ):
+            start, end = self.library_ranges[int(parent) - LIBRARY_ID_BASE]
+            return list(range(start, end))
+        index = self.item_index(parent)
+        if index is None:
+            return []
+        start, end = self.library_ranges[self.records[index][1]]
+        return [i for i in range(start, end) if self.records[i][7] == index]
+
+    def search_persons(self, search: Optional[str]) -> List[int]:
+        """Return person indices sorted by name, optionally filtered."""
+        if not search:
+            return self.person_order
+        needle = search.lower()
+        with self._lock:
+            key = ("persons", needle)
+            cached = self._orders.get(key)
+            if cached is None:
+                cached = [
+                    p for p in self.person_order
+                    if needle in self.persons[p][1]
+                ]
+                self._orders[key] = cached
+            return cached
+
+    # Live state
+
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+    def tasks(self) -> List[Dict]:
+        """Return scheduled tasks; runs follow a fixed schedule over time."""
+        now = self.elapsed()
+        tasks = []
+        for number, (name, category, period, duration) in enumerate(TASKS):
+            offset = (self.seed * 7919 + number * 613) % period
+            phase = (now + offset) % period
+            task_id = hashlib.md5(f"task:{name}".encode()).hexdigest()
+            running = phase < duration
+            last_end = -(phase - duration) if not running else -phase - (
+                period - duration
+            )
+            failed = random.Random(
+                f"{self.seed}:{number}:{int((now + offset) // period)}"
+            ).random() < 0.1
+            task = {
+                "Name": name,
+                "State": "Running" if running else "Idle",
+                "Id": task_id,
+                "Key": name.replace(" ", ""),
+                "Category": category,
+                "Description": f"{name} on the stub server.",
+                "IsHidden": False,
+                "Triggers": [
+                    {"Type": "IntervalTrigger",
+                     "IntervalTicks": period * TICKS_PER_SECOND}
+                ],
+                "LastExecutionResult": {
+                    "StartTimeUtc": utc_now_iso(last_end - duration),
+                    "EndTimeUtc": utc_now_iso(last_end),
+                    "Status": "Failed" if failed and not running
+                    else "Completed",
+                    "Name": name,
+                    "Key": name.replace(" ", ""),
+                    "Id": task_id,
+                },
+            }
+            if running:
+                task["CurrentProgressPercentage"] = round(
+                    phase / duration * 100, 1
+                )
+            tasks.append(task)
+        return tasks
+
+    def sessions(self) -> List[Dict]:
+        """Return client sessions; about half are playing something."""
+        now = self.elapsed()
+        playable = [
+            i for i in range(0, len(self.records), 97)
+            if self.records[i][0] in ("Movie", "Episode", "Audio", "Video")
+        ]
+        sessions = []
+        for number in range(self.session_count):
+            client, device = CLIENTS[number % len(CLIENTS)]
+            session = {
+                "Id": hashlib.md5(f"session:{number}".encode()).hexdigest(),
+                "UserId": USER_ID,
+                "UserName": f"{FIRST_NAMES[number % len(FIRST_NAMES)]}",
+                "Client": client,
+                "DeviceName": device,
+                "DeviceId": f"device-{number}",
+                "ApplicationVersion": "4.8.0",
+                "RemoteEndPoint": f"192.168.1.{20 + number}",
+                "LastActivityDate": utc_now_iso(),
+                "PlayState": {},
+            }
+            if number % 2 == 0 and playable:
+                # Each session plays items back to back
+                span = 1800
+                slot = int((now + number * 311) // span)
+                index = playable[(slot * 31 + number) % len(playable)]
+                item = self.item(
+                    index,
+                    frozenset(("ImageTags", "BackdropImageTags",
+                               "ProductionYear", "RunTimeTicks")),
+                )
+                runtime = item.get("RunTimeTicks") or span * TICKS_PER_SECOND
+                position = ((now + number * 311) % span) / span * runtime
+                transcoding = number % 4 == 0
+                session["NowPlayingItem"] = item
+                session["PlayState"] = {
+                    "PositionTicks": int(position),
+                    "CanSeek": True,
+                    "IsPaused": number % 3 == 2,
+                    "IsMuted": False,
+                    "PlayMethod": "Transcode" if transcoding else "DirectPlay",
+                }
+                if transcoding:
+                    session["TranscodingInfo"] = {
+                        "VideoCodec": "h264",
+                        "AudioCodec": "aac",
+                        "Container": "ts",
+                        "Bitrate": 8_000_000,
+                        "IsVideoDirect": False,
+                        "IsAudioDirect": False,
+                        "TranscodeReasons": ["VideoCodecNotSupported"],
+                    }
+            sessions.append(session)
+        return sessions
+
+
+def png_bytes(width: int, height: int, color: Tuple[int, int, int]) -> bytes:
+    """Encode a solid-color RGB PNG."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return (
+            struct.pack(">I", len(data)) + body
+            + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+        )
+
+    row = b"\x00" + bytes(color) * width
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(row * height, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+@lru_cache(maxsize=256)
+def poster(tag: str, height: int, square: bool) -> bytes:
+    """Return a placeholder poster colored after its image tag."""
+    color = tuple(int(tag[i:i + 2], 16) for i in (0, 2, 4))
+    width = height if square else max(height * 2 // 3, 1)
+    return png_bytes(width, height, color)
+
+
+class StubState:
+    """Injection settings and counters shared by all request handlers."""
+
+    def __init__(
+        self,
+        library: SyntheticLibrary,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        api_key: str = "",
+        churn_interval: float = 0,
+        keepalive_timeout: float = 60,
+    ):
+        self.library = library
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.api_key = api_key
+        self.churn_interval = churn_interval
+        self.keepalive_timeout = keepalive_timeout
+        self.rng = random.Random(library.seed)
+        self.lock = threading.Lock()
+        self.listeners: List["StubHandler"] = []
+        self.reset()
+
+    def reset(self):
+        """Clear the request counters."""
+        with self.lock:
+            self.requests: Counter = Counter()
+            self.bytes_sent = 0
+            self.injected_errors = 0
+            self.not_modified = 0
+            self.websocket_connections = 0
+            self.websocket_messages = 0
+            self.websocket_keepalives = 0
+            self.started = time.time()
+
+    def delay(self) -> float:
+        """Return the injected latency for one request, in seconds."""
+        with self.lock:
+            return max(
+                self.latency + self.rng.uniform(-self.jitter, self.jitter), 0
+            )
+
+    def should_fail(self) -> bool:
+        """Roll for an injected server error."""
+        if self.error_rate <= 0:
+            return False
+        with self.lock:
+            failed = self.rng.random() < self.error_rate
+            if failed:
+                self.injected_errors += 1
+            return failed
+
+    def stats(self) -> Dict:
+        """Return counters since start or the last reset."""
+        with self.lock:
+            total = sum(self.requests.values())
+            return {
+                "uptime_seconds": round(time.time() - self.started, 3),
+                "requests": total,
+                "by_route": dict(self.requests.most_common()),
+                "bytes_sent": self.bytes_sent,
+                "injected_errors": self.injected_errors,
+                "not_modified": self.not_modified,
+                "websocket_connections": self.websocket_connections,
+                "websocket_messages": self.websocket_messages,
+                "websocket_keepalives": self.websocket_keepalives,
+                "items": len(self.library.records),
+                "persons": len(self.library.persons),
+            }
+
+
+def param(query: Dict[str, List[str]], name: str, default=None):
+    """Return a query parameter, matched case-insensitively like Emby."""
+    for key, values in query.items():
+        if key.lower() == name.lower():
+            return values[0]
+    return default
+
+
+def type_set(value: Optional[str]) -> Optional[frozenset]:
+    """Parse a comma-separated item type filter."""
+    if not value:
+        return None
+    return frozenset(t.strip().lower() for t in value.split(",") if t.strip())
+
+
+# Route patterns, most specific first; the name is used in /stub/stats
+ROUTES = (
+    ("image", re.compile(r"^/emby/Items/([^/]+)/Images/([^/]+)$")),
+    ("user_item", re.compile(r"^/emby/Users/([^/]+)/Items/([^/]+)$")),
+    ("item", re.compile(r"^/emby/Items/([^/]+)$")),
+    ("items", re.compile(r"^/emby/Items$")),
+    ("persons", re.compile(r"^/emby/Persons$")),
+    ("users", re.compile(r"^/emby/Users$")),
+    ("virtual_folders", re.compile(r"^/emby/Library/VirtualFolders$")),
+    ("task", re.compile(r"^/emby/ScheduledTasks/([^/]+)$")),
+    ("tasks", re.compile(r"^/emby/ScheduledTasks$")),
+    ("sessions", re.compile(r"^/emby/Sessions$")),
+    ("system_info", re.compile(r"^/emby/System/Info(?:/Public)?$")),
+    ("system_endpoint", re.compile(r"^/emby/System/Endpoint$")),
+    ("activity_log", re.compile(r"^/emby/System/ActivityLog/Entries$")),
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve one client connection (HTTP keep-alive or a WebSocket)."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "EmbyStub/1.0"
+    # Headers and body go out as separate writes; without TCP_NODELAY
+    # the body waits on the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+    state: StubState = None
+
+    def log_message(self, *args):
+        pass
+
+    # HTTP plumbing
+
+    def send_body(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str = "application/json",
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Send a complete response with Content-Length."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        with self.state.lock:
+            self.state.bytes_sent += len(body)
+
+    def send_json(self, value, status: int = 200):
+        self.send_body(status, json.dumps(value).encode("utf-8"))
+
+    def authorized(self, query: Dict[str, List[str]]) -> bool:
+        """Check the API key, if the stub was started with one."""
+        if not self.state.api_key:
+            return True
+        token = self.headers.get("X-Emby-Token") or param(query, "api_key")
+        return token == self.state.api_key
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path == "/stub/reset":
+            self.state.reset()
+            self.send_json({"reset": True})
+        else:
+            self.send_json({"error": "Not found"}, 404)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path.rstrip("/") or "/"
+
+        if path == "/stub/stats":
+            self.send_json(self.state.stats())
+            return
+        if path == "/embywebsocket":
+            self.serve_websocket(query)
+            return
+        if not self.authorized(query):
+            self.send_json({"error": "Access token is invalid"}, 401)
+            return
+
+        for name, pattern in ROUTES:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            name, match = "unknown", None
+        with self.state.lock:
+            self.state.requests[name] += 1
+
+        delay = self.state.delay()
+        if delay:
+            time.sleep(delay)
+        if self.state.should_fail():
+            self.send_json({"error": "Injected failure"}, 500)
+            return
+        if match is None:
+            self.send_json({"error": "Not found"}, 404)
+            return
+        getattr(self, f"route_{name}")(query, *match.groups())
+
+    # Routes
+
+    def route_users(self, query):
+        self.send_json([{
+            "Name": "stub",
+            "ServerId": SERVER_ID,
+            "Id": USER_ID,
+            "HasPassword": False,
+            "Policy": {"IsAdministrator": True},
+        }])
+
+    def route_virtual_folders(self, query):
+        library = self.state.library
+        self.send_json([
+            {
+                "Name": name,
+                "Locations": [f"/media/{folder}"],
+                "CollectionType": collection,
+                "ItemId": library.library_id(number),
+                "LibraryOptions": {},
+                "RefreshStatus": "Idle",
+            }
+            for number, (name, collection, folder, _) in enumerate(LIBRARIES)
+        ])
+
+    def route_items(self, query):
+        library = self.state.library
+        fields = frozenset(
+            f.strip() for f in (param(query, "Fields") or "").split(",")
+        )
+        start = int(param(query, "StartIndex", 0))
+        limit = param(query, "Limit")
+        ids = param(query, "Ids")
+        if ids:
+            matches = [
+                index for index in map(library.item_index, ids.split(","))
+                if index is not None
+            ]
+        else:
+            person_ids = param(query, "PersonIds")
+            person = (
+                library.person_index(person_ids.split(",")[0])
+                if person_ids else None
+            )
+            if person_ids and person is None:
+                matches = []
+            else:
+                sort_by = param(query, "SortBy") or "SortName"
+                matches = library.query(
+                    sort_by=sort_by.split(",")[0],
+                    descending=param(query, "SortOrder") == "Descending",
+                    types=type_set(param(query, "IncludeItemTypes")),
+                    exclude_types=type_set(param(query, "ExcludeItemTypes")),
+                    parent=param(query, "ParentId"),
+                    search=param(query, "SearchTerm"),
+                    person=person,
+                )
+        end = len(matches) if limit is None else start + int(limit)
+        self.send_json({
+            "Items": [library.item(i, fields) for i in matches[start:end]],
+            "TotalRecordCount": len(matches),
+        })
+
+    def route_persons(self, query):
+        library = self.state.library
+        fields = frozenset((param(query, "Fields") or "").split(","))
+        matches = library.search_persons(param(query, "SearchTerm"))
+        start = int(param(query, "StartIndex", 0))
+        limit = param(query, "Limit")
+        end = len(matches) if limit is None else start + int(limit)
+        self.send_json({
+            "Items": [library.person(p, fields) for p in matches[start:end]],
+            "TotalRecordCount": len(matches),
+        })
+
+    def route_item(self, query, item_id):
+        self.route_user_item(query, USER_ID, item_id)
+
+    def route_user_item(self, query, user_id, item_id):
+        library = self.state.library
+        index = library.item_index(item_id)
+        if index is not None:
+            self.send_json(library.item(index, ALL_FIELDS))
+            return
+        person = library.person_index(item_id)
+        if person is not None:
+            self.send_json(library.person(person, ALL_FIELDS))
+            return
+        self.send_json({"error": "Item not found"}, 404)
+
+    def route_image(self, query, item_id, image_type):
+        library = self.state.library
+        index = library.item_index(item_id)
+        person = library.person_index(item_id)
+        if index is not None and library.records[index][10]:
+            tag = library.image_tag("item", index)
+            square = library.records[index][0] in ("MusicAlbum", "Audio")
+        elif person is not None and library.persons[person][3]:
+            tag = library.image_tag("person", person)
+            square = False
+        else:
+            tag = None
+        if tag is None or image_type not in ("Primary", "Thumb"):
+            self.send_body(404, b"", content_type="text/plain")
+            return
+
+        etag = f'"{tag}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": "Wed, 01 Jan 2020 00:00:00 GMT",
+            "Cache-Control": "public",
+        }
+        if self.headers.get("If-None-Match") == etag:
+            with self.state.lock:
+                self.state.not_modified += 1
+            self.send_body(304, b"", content_type="image/png", headers=headers)
+            return
+        height = int(
+            param(query, "maxHeight") or param(query, "height") or 450
+        )
+        body = poster(tag, min(max(height, 1), 2000), square)
+        self.send_body(200, body, content_type="image/png", headers=headers)
+
+    def route_tasks(self, query):
+        self.send_json(self.state.library.tasks())
+
+    def route_task(self, query, task_id):
+        for task in self.state.library.tasks():
+            if task["Id"] == task_id:
+                self.send_json(task)
+                return
+        self.send_json({"error": "Task not found"}, 404)
+
+    def route_sessions(self, query):
+        self.send_json(self.state.library.sessions())
+
+    def route_system_info(self, query):
+        host, port = self.server.server_address[:2]
+        self.send_json({
+            "ServerName": "Emby Stub",
+            "Version": "4.8.0.0",
+            "ProductName": "Emby Server",
+            "Id": SERVER_ID,
+            "OperatingSystem": "Linux",
+            "OperatingSystemDisplayName": "Linux",
+            "SystemArchitecture": "X64",
+            "RuntimeVersion": "stub",
+            "LocalAddress": f"http://{host}:{port}",
+            "WanAddress": f"http://{host}:{port}",
+            "HttpServerPortNumber": port,
+            "HttpsPortNumber": 8920,
+            "WebSocketPortNumber": port,
+            "HasPendingRestart": False,
+            "IsShuttingDown": False,
+            "CanSelfRestart": True,
+            "CanSelfUpdate": False,
+            "HardwareAccelerationRequiresPremiere": False,
+            "ProgramDataPath": "/var/lib/emby",
+            "CachePath": "/var/lib/emby/cache",
+            "LogPath": "/var/lib/emby/logs",
+            "InternalMetadataPath": "/var/lib/emby/metadata",
+            "TranscodingTempPath": "/var/lib/emby/transcoding-temp",
+            "PackageName": "stub",
+            "CompletedInstallations": [],
+        })
+
+    def route_system_endpoint(self, query):
+        self.send_json({"IsLocal": True, "IsInNetwork": True})
+
+    def route_activity_log(self, query):
+        limit = int(param(query, "Limit", 50))
+        entries = [
+            {
+                "Id": number,
+                "Name": f"{task['Name']} completed",
+                "Type": "ScheduledTaskCompleted",
+                "Date": task["LastExecutionResult"]["EndTimeUtc"],
+                "Severity": "Info",
+            }
+            for number, task in enumerate(self.state.library.tasks())
+        ]
+        self.send_json({
+            "Items": entries[:limit],
+            "TotalRecordCount": len(entries),
+        })
+
+    # WebSocket
+
+    def serve_websocket(self, query):
+        """Upgrade to a WebSocket and push task/session updates."""
+        key = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or not key:
+            self.send_json({"error": "Expected a WebSocket upgrade"}, 400)
+            return
+        if not self.authorized(query):
+            self.send_json({"error": "Access token is invalid"}, 401)
+            return
+        accept = base64.b64encode(
+            hashlib.sha1(
+                (key + "258EAFA5-E914-47DA-95CA-C5AB0DC85B11").encode()
+            ).digest()
+        ).decode()
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+
+        self.ws_lock = threading.Lock()
+        self.ws_buffer = b""
+        with self.state.lock:
+            self.state.websocket_connections += 1
+            self.state.listeners.append(self)
+        try:
+            self.websocket_loop()
+        except OSError:
+            pass
+        finally:
+            with self.state.lock:
+                self.state.listeners.remove(self)
+
+    def websocket_loop(self):
+        """
+        Answer client messages and push subscribed updates on time.
+
+        Like Emby, the connection is closed when no KeepAlive arrived
+        within the ForceKeepAlive timeout.
+        """
+        sock = self.connection
+        subscriptions = {}  # message type -> [interval s, next due]
+        producers = {
+            "ScheduledTasksInfo": self.state.library.tasks,
+            "Sessions": self.state.library.sessions,
+        }
+        keepalive_timeout = self.state.keepalive_timeout
+        self.ws_send(
+            {"MessageType": "ForceKeepAlive", "Data": keepalive_timeout}
+        )
+        last_keepalive = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now - last_keepalive > keepalive_timeout:
+                self.ws_write_frame(0x8, struct.pack(">H", 1000))
+                return
+            for message_type, due in subscriptions.items():
+                if now >= due[1]:
+                    self.ws_send({
+                        "MessageType": message_type,
+                        "Data": producers[message_type](),
+                    })
+                    due[1] = now + due[0]
+            timeout = min(
+                [due[1] for due in subscriptions.values()]
+                + [now + 1, last_keepalive + keepalive_timeout]
+            ) - time.monotonic()
+            if not self.ws_buffer:
+                readable, _, _ = select.select([sock], [], [], max(timeout, 0))
+                if not readable:
+                    continue
+            frame = self.ws_read_frame()
+            if frame is None:
+                return
+            opcode, payload = frame
+            if opcode == 0x8:
+                self.ws_write_frame(0x8, payload[:2])
+                return
+            if opcode == 0x9:
+                self.ws_write_frame(0xA, payload)
+                continue
+            if opcode != 0x1:
+                continue
+            try:
+                message = json.loads(payload.decode("utf-8"))
+            except ValueError:
+                continue
+            message_type = message.get("MessageType", "")
+            if message_type == "KeepAlive":
+                last_keepalive = time.monotonic()
+                with self.state.lock:
+                    self.state.websocket_keepalives += 1
+            elif message_type.endswith("Start"):
+                name = message_type[:-len("Start")]
+                if name in producers:
+                    interval_ms = str(message.get("Data") or "0,1000")
+                    interval = int(interval_ms.split(",")[-1]) / 1000
+                    subscriptions[name] = [max(interval, 0.05), 0]
+            elif message_type.endswith("Stop"):
+                subscriptions.pop(message_type[:-len("Stop")], None)
+
+    def ws_send(self, message: Dict):
+        """Send one JSON text message."""
+        self.ws_write_frame(0x1, json.dumps(message).encode("utf-8"))
+        with self.state.lock:
+            self.state.websocket_messages += 1
+
+    def ws_write_frame(self, opcode: int, payload: bytes):
+        """Write one unmasked server frame."""
+        length = len(payload)
+        if length < 126:
+            header = struct.pack(">BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack(">BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack(">BBQ", 0x80 | opcode, 127, length)
+        with self.ws_lock:
+            self.connection.sendall(header + payload)
+        with self.state.lock:
+            self.state.bytes_sent += len(header) + length
+
+    def ws_read_exact(self, size: int) -> Optional[bytes]:
+        """Read exactly size bytes from the socket, or None on EOF."""
+        while len(self.ws_buffer) < size:
+            chunk = self.connection.recv(65536)
+            if not chunk:
+                return None
+            self.ws_buffer += chunk
+        data, self.ws_buffer = self.ws_buffer[:size], self.ws_buffer[size:]
+        return data
+
+    def ws_read_frame(self) -> Optional[Tuple[int, bytes]]:
+        """Read one (masked) client frame as (opcode, payload)."""
+        header = self.ws_read_exact(2)
+        if header is None:
+            return None
+        opcode = header[0] & 0x0F
+        masked = header[1] & 0x80
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self.ws_read_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self.ws_read_exact(8))[0]
+        mask = self.ws_read_exact(4) if masked else b"\0\0\0\0"
+        payload = self.ws_read_exact(length) if length else b""
+        if mask is None or payload is None:
+            return None
+        if masked:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return opcode, payload
+
+
+# Every optional field, used for single-item lookups
+ALL_FIELDS = frozenset((
+    "ImageTags", "BackdropImageTags", "ProductionYear", "CommunityRating",
+    "CriticRating", "OfficialRating", "RunTimeTicks", "DateCreated",
+    "DateModified", "PremiereDate", "ParentId", "Path", "Container", "Size",
+    "SortName", "OriginalTitle", "Overview", "Genres", "Studios", "Tags",
+    "ProviderIds", "People", "MediaStreams", "PrimaryImageAspectRatio",
+    "ProductionLocations",
+))
+
+
+class StubServer:
+    """Run the stub on a background thread, e.g. from a benchmark."""
+
+    def __init__(
+        self,
+        library: SyntheticLibrary,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        **state_options,
+    ):
+        """
+        Bind the server (port 0 picks a free port).
+
+        Args:
+            library: Library to serve
+            host: Interface to listen on
+            port: TCP port
+            **state_options: latency, jitter (seconds), error_rate,
+                api_key, churn_interval and keepalive_timeout, see
+                StubState
+        """
+        self.state = StubState(library, **state_options)
+        handler = type(
+            "BoundStubHandler", (StubHandler,), {"state": self.state}
+        )
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        """Serve requests (and library churn) on daemon threads."""
+        targets = [self.httpd.serve_forever]
+        if self.state.churn_interval > 0:
+            targets.append(self._churn)
+        for target in targets:
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        self._stop.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _churn(self):
+        """Update a few random items periodically and announce it."""
+        library = self.state.library
+        rng = random.Random(library.seed + 1)
+        while not self._stop.wait(self.state.churn_interval):
+            if not library.records:
+                continue
+            indices = [
+                rng.randrange(len(library.records))
+                for _ in range(rng.randint(1, 5))
+            ]
+            library.touch(indices)
+            message = {
+                "MessageType": "LibraryChanged",
+                "Data": {
+                    "ItemsAdded": [],
+                    "ItemsUpdated": [library.item_id(i) for i in indices],
+                    "ItemsRemoved": [],
+                    "FoldersAddedTo": [],
+                    "FoldersRemovedFrom": [],
+                },
+            }
+            with self.state.lock:
+                listeners = list(self.state.listeners)
+            for listener in listeners:
+                try:
+                    listener.ws_send(message)
+                except OSError:
+                    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8096)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--persons", type=int, default=20_000)
+    parser.add_argument("--sessions", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0,
+        help="fraction of requests answered with HTTP 500",
+    )
+    parser.add_argument(
+        "--churn-interval", type=float, default=0,
+        help="seconds between LibraryChanged pushes (0 disables)",
+    )
+    parser.add_argument(
+        "--keepalive-timeout", type=float, default=60,
+        help="seconds without a WebSocket KeepAlive before disconnecting",
+    )
+    parser.add_argument(
+        "--api-key", default="",
+        help="require this token (default: accept any)",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    library = SyntheticLibrary(
+        items=args.items,
+        persons=args.persons,
+        sessions=args.sessions,
+        seed=args.seed,
+    )
+    server = StubServer(
+        library,
+        host=args.host,
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        api_key=args.api_key,
+        churn_interval=args.churn_interval,
+        keepalive_timeout=args.keepalive_timeout,
+    )
+    print(
+        f"Generated {len(library.records)} items and "
+        f"{len(library.persons)} people in "
+        f"{time.perf_counter() - started:.1f} s"
+    )
+    print(f"Emby stub listening on {server.url}")
+    print(f"Request counters: {server.url}/stub/stats")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Measure peak Python memory of the image proxy under concurrent requests.
+
+Starts a throwaway upstream serving synthetic posters, puts the Flask app
+in front of it and compares the tracemalloc peak of the streaming
+/api/image route with a route that buffers each body the way the proxy
+used to.
+
+Usage:
+    python benchmarks/image_proxy_memory.py [--requests 64] [--concurrency 32]
+        [--image-kb 512]
+"""
+
+# Standard library imports
+import argparse
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+# Third-party imports
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class PosterHandler(BaseHTTPRequestHandler):
+    """Serve a fixed-size fake JPEG for every image request."""
+
+    body = b""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        # Trickle the body so concurrent proxies overlap
+        for start in range(0, len(self.body), 64 * 1024):
+            self.wfile.write(self.body[start:start + 64 * 1024])
+            time.sleep(0.002)
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """
+    Threaded stdlib WSGI server.
+
+    Used instead of the Werkzeug development server, which reads up to
+    10 MB per request while draining the socket and would dominate the
+    tracemalloc peak.
+    """
+
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    """WSGI handler without per-request logging."""
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(server):
+    """Run a server on a daemon thread."""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def measure(base_url, route, total, concurrency):
+    """Fetch total images concurrently and return (peak bytes, seconds)."""
+    def fetch(i):
+        with requests.get(f"{base_url}{route}/item{i}", stream=True) as r:
+            for _ in r.iter_content(chunk_size=16 * 1024):
+                pass
+            return r.status_code
+
+    # Warm up so one-time imports and lazy initialisation are not counted
+    fetch("warmup")
+    tracemalloc.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        statuses = set(pool.map(fetch, range(total)))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if statuses != {200}:
+        raise RuntimeError(f"Unexpected statuses from {route}: {statuses}")
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--image-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    PosterHandler.body = os.urandom(args.image_kb * 1024)
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), PosterHandler)
+    serve(upstream)
+
+    os.environ["EMBY_SERVER_URL"] = f"http://127.0.0.1:{upstream.server_port}"
+    os.environ.setdefault("EMBY_API_KEY", "benchmark")
+    os.environ["IMAGE_CACHE_ENABLED"] = "False"
+    os.environ["EMBY_WEBSOCKET_ENABLED"] = "False"
+
+    from flask import Response
+
+    import app as web
+
+    @web.app.route("/bench/buffered-image/<item_id>")
+    def buffered_image(item_id):
+        response = web.get_emby_client().get_image(
+            item_id, params={"maxHeight": 450, "quality": 95}
+        )
+        return Response(response.content, mimetype="image/jpeg")
+
+    proxy = make_server(
+        "127.0.0.1",
+        0,
+        web.app,
+        server_class=ThreadingWSGIServer,
+        handler_class=QuietHandler,
+    )
+    serve(proxy)
+    base_url = f"http://127.0.0.1:{proxy.server_port}"
+
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"{args.image_kb} KiB images, "
+        f"IMAGE_FETCH_CONCURRENCY={web.config.IMAGE_FETCH_CONCURRENCY}"
+    )
+    for label, route in (
+        ("buffered", "/bench/buffered-image"),
+        ("streamed", "/api/image"),
+    ):
+        peak, elapsed = measure(base_url, route, args.requests, args.concurrency)
+        print(
+            f"  {label:<9} peak {peak / (1024 * 1024):7.2f} MiB"
+            f"  {elapsed:6.2f} s"
+        )
+
+    proxy.shutdown()
+    upstream.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,698 @@
+"""
+Simulate concurrent browser tabs on the web dashboard and measure the
+load they put on the app and on Emby.
+
+Each tab follows static/js/app.js: it opens a page (dashboard, media or
+cast), makes that page's initial requests, then either polls on the
+app.js schedule (status every 30 s, now-playing and processing every
+5 s, server time every 4 s) or holds the /api/events stream, depending
+on --mode. On the media and cast pages it scrolls and opens detail
+dialogs now and then. Images are fetched six at a time like a browser;
+tagged image URLs are cached per tab for good and untagged ones are
+revalidated with If-None-Match. After a random dwell time the tab moves
+on to another page.
+
+By default the Emby stub and app.py are started as child processes, so
+the run is fully local; any EMBY_* or other app settings in the
+environment are passed on to app.py, which makes it easy to compare
+configurations. The report gives throughput and latency percentiles per
+route and, when the stub is known, the upstream Emby requests per
+viewer. Routes that answered with a 5xx, or only with errors, are
+reported as failed and the run exits with status 1.
+
+Usage:
+    python benchmarks/loadgen.py [--tabs 20] [--duration 60] [--ramp 10]
+        [--mode poll|sse] [--pages dashboard=3,media=2,cast=1]
+        [--dwell 60] [--browse-interval 15] [--items 20000]
+        [--app-url http://127.0.0.1:5000] [--stub-url http://...]
+        [--output loadgen.json]
+
+    EMBY_CACHE_ENABLED=False python benchmarks/loadgen.py --tabs 50
+"""
+
+# Standard library imports
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from typing import Dict, List, Optional
+from urllib.parse import quote, urlsplit
+
+# Third-party imports
+import requests
+
+# Local imports
+from suite import ROOT, free_port, percentile, start_stub
+
+# Connections a browser opens per host, and so parallel image loads
+BROWSER_CONNECTIONS = 6
+
+# Intervals from setupRefreshIntervals() in static/js/app.js (seconds)
+STATUS_INTERVAL = 30
+NOW_PLAYING_INTERVAL = 5
+PROCESSING_INTERVAL = 5
+SERVER_TIME_INTERVAL = 4
+
+# Page sizes and image heights used by app.js
+MEDIA_PAGE_SIZE = 24
+CAST_PAGE_SIZE = 50
+
+# Route segments followed by an id, grouped as one route in the report
+ID_ROUTES = ("image", "person-image", "person", "item")
+
+
+def route_name(path: str) -> str:
+    """Return the route of a request path, with ids and query removed."""
+    parts = urlsplit(path).path.split("/")
+    if len(parts) > 3 and parts[1] == "api" and parts[2] in ID_ROUTES:
+        parts[3] = "<id>"
+    return "/".join(parts)
+
+
+class Stats:
+    """Thread-safe per-route request log."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.server_errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[int, int] = defaultdict(int)
+        self.bytes = 0
+        self.sse_events: Dict[str, int] = defaultdict(int)
+        self.sse_connections = 0
+
+    def record(self, route: str, status: int, seconds: float, size: int):
+        with self.lock:
+            self.latencies[route].append(seconds)
+            self.statuses[status] += 1
+            self.bytes += size
+            if status >= 400 or status == 0:
+                self.errors[route] += 1
+            if status >= 500 or status == 0:
+                self.server_errors[route] += 1
+
+    def record_event(self, event: str):
+        with self.lock:
+            self.sse_events[event] += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        """
+        Return throughput and latency percentiles per route.
+
+        Routes that returned a 5xx (or no response) at all, or only
+        errors, are listed under "failed_routes". Some 4xx are expected,
+        e.g. 404 for people without an image.
+        """
+        with self.lock:
+            routes = {}
+            failed = []
+            for route, latencies in sorted(self.latencies.items()):
+                latencies = sorted(latencies)
+                errors = self.errors.get(route, 0)
+                server_errors = self.server_errors.get(route, 0)
+                if server_errors or errors == len(latencies):
+                    failed.append(route)
+                routes[route] = {
+                    "requests": len(latencies),
+                    "per_second": round(len(latencies) / elapsed, 3),
+                    "errors": errors,
+                    "server_errors": server_errors,
+                    "p50_ms": round(percentile(latencies, 0.50) * 1e3, 3),
+                    "p95_ms": round(percentile(latencies, 0.95) * 1e3, 3),
+                    "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3),
+                    "max_ms": round(latencies[-1] * 1e3, 3),
+                }
+            total = sum(route["requests"] for route in routes.values())
+            return {
+                "requests": total,
+                "per_second": round(total / elapsed, 3),
+                "errors": sum(self.errors.values()),
+                "failed_routes": failed,
+                "bytes": self.bytes,
+                "statuses": dict(sorted(self.statuses.items())),
+                "sse_connections": self.sse_connections,
+                "sse_events": dict(self.sse_events),
+                "routes": routes,
+            }
+
+
+class Tab:
+    """One simulated browser tab, run on its own thread."""
+
+    def __init__(
+        self,
+        number: int,
+        base_url: str,
+        stats: Stats,
+        stop: threading.Event,
+        args: argparse.Namespace,
+        pages: Dict[str, float],
+    ):
+        self.number = number
+        self.base_url = base_url
+        self.stats = stats
+        self.stop = stop
+        self.args = args
+        self.pages = pages
+        self.rng = random.Random(args.seed * 1000 + number)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=BROWSER_CONNECTIONS + 1
+        )
+        self.session.mount("http://", adapter)
+        self.images = ThreadPoolExecutor(BROWSER_CONNECTIONS)
+        # Browser HTTP cache: tagged URLs never expire, untagged ones are
+        # revalidated with their ETag
+        self.cached_images = set()
+        self.etags: Dict[str, str] = {}
+        self.timers: List[list] = []
+        self.page = ""
+        self.events = None
+        self.libraries: List[Dict] = []
+        self.media_offsets: Dict[str, Optional[int]] = {}
+        self.media_items: List[Dict] = []
+        self.people: List[Dict] = []
+        self.cast_offset: Optional[int] = None
+
+    # Requests
+
+    def get(self, path: str, headers: Optional[Dict] = None):
+        """GET path, record it and return the response (None on error)."""
+        started = time.perf_counter()
+        try:
+            response = self.session.get(
+                self.base_url + path, headers=headers, timeout=30
+            )
+            status, size = response.status_code, len(response.content)
+        except requests.RequestException:
+            response, status, size = None, 0, 0
+        self.stats.record(
+            route_name(path), status, time.perf_counter() - started, size
+        )
+        return response
+
+    def get_json(self, path: str, default=None):
+        response = self.get(path)
+        if response is None or response.status_code != 200:
+            return default
+        try:
+            return response.json()
+        except ValueError:
+            return default
+
+    def image_url(self, item_id: str, tag: Optional[str], height: int) -> str:
+        """Build an image URL the way imageUrl() in app.js does."""
+        size = ceil(height * self.args.device_pixel_ratio)
+        if tag:
+            return f"/api/image/{item_id}?tag={quote(tag)}&size={size}"
+        return f"/api/image/{item_id}?size={size}"
+
+    def load_image(self, url: str):
+        if url in self.cached_images:
+            return
+        headers = {"Accept": "image/avif,image/webp,image/*,*/*;q=0.8"}
+        if url in self.etags:
+            headers["If-None-Match"] = self.etags[url]
+        response = self.get(url, headers)
+        if response is None or response.status_code not in (200, 304):
+            return
+        if "tag=" in url:
+            self.cached_images.add(url)
+        elif response.headers.get("ETag"):
+            self.etags[url] = response.headers["ETag"]
+
+    def load_images(self, urls: List[str]):
+        """Load images in parallel and wait for all of them."""
+        list(self.images.map(self.load_image, urls))
+
+    # Pages
+
+    def open_page(self, page: str):
+        """Navigate: reset timers and make the page's initial requests."""
+        self.close_events()
+        self.page = page
+        self.timers = []
+        self.get({"dashboard": "/", "media": "/media", "cast": "/cast"}[page])
+
+        if page == "dashboard":
+            self.get("/api/completed-tasks")
+            self.get("/api/indexed-media?limit=50")
+            self.get("/api/server-details")
+        elif page == "media":
+            self.open_media()
+        else:
+            self.load_cast(0)
+
+        # Like app.js, fall back to polling when the stream is refused
+        if not (self.args.mode == "sse" and self.open_events()):
+            self.start_polling()
+        if page != "dashboard":
+            self.every(
+                self.rng.expovariate(1 / self.args.browse_interval),
+                self.browse,
+                random_interval=self.args.browse_interval,
+            )
+        self.every(
+            self.rng.expovariate(1 / self.args.dwell), self.navigate, once=True
+        )
+
+    def start_polling(self):
+        """Mirror setupRefreshIntervals(): load once, then poll."""
+        self.load_status()
+        self.load_now_playing()
+        self.every(STATUS_INTERVAL, self.load_status)
+        self.every(NOW_PLAYING_INTERVAL, self.load_now_playing)
+        if self.page == "dashboard":
+            self.load_processing()
+            self.every(PROCESSING_INTERVAL, self.load_processing)
+            self.every(SERVER_TIME_INTERVAL, self.load_server_time)
+
+    def load_status(self):
+        self.get("/api/status")
+
+    def load_processing(self):
+        self.get("/api/current-processing")
+
+    def load_server_time(self):
+        self.get("/api/server-time")
+
+    def load_now_playing(self):
+        self.show_now_playing(self.get_json("/api/now-playing", []))
+
+    def show_now_playing(self, sessions: List[Dict]):
+        self.load_images([
+            self.image_url(
+                session["item"]["id"],
+                session["item"].get("primary_image_tag"),
+                150,
+            )
+            for session in sessions
+            if session.get("item", {}).get("id")
+        ])
+
+    def open_media(self):
+        """Load every library row, as loadLibrarySections() does."""
+        self.libraries = self.get_json("/api/libraries", [])
+        self.media_offsets = {}
+        self.media_items = []
+        for library in self.libraries:
+            self.media_offsets[library["id"]] = 0
+            self.load_media_page(library)
+
+    def load_media_page(self, library: Dict):
+        start = self.media_offsets[library["id"]]
+        if start is None:
+            return
+        items = self.get_json(
+            f"/api/media?libraryId={library['id']}"
+            f"&collectionType={library['collection_type']}"
+            f"&limit={MEDIA_PAGE_SIZE}&startIndex={start}"
+            "&sortBy=DateCreated&sortOrder=Descending",
+            [],
+        )
+        self.media_offsets[library["id"]] = (
+            start + len(items) if len(items) >= MEDIA_PAGE_SIZE else None
+        )
+        self.media_items += items
+        # Cards are lazy-loaded; only those near the viewport fetch images
+        self.load_images([
+            self.image_url(item["id"], item["primary_image_tag"], 300)
+            for item in items[:self.args.visible_images]
+            if item.get("primary_image_tag")
+        ])
+
+    def open_item(self, item_id: str):
+        """Open the movie details dialog (showMovieDetails)."""
+        item = self.get_json(f"/api/item/{item_id}")
+        if not item or "error" in item:
+            return
+        urls = [self.image_url(item["id"], item.get("primary_image_tag"), 450)]
+        actors = [
+            person for person in item.get("people", [])
+            if person.get("Type") == "Actor"
+        ]
+        urls += [
+            self.image_url(actor["Id"], actor.get("PrimaryImageTag"), 80)
+            for actor in actors[:10]
+        ]
+        self.load_images(urls)
+
+    def load_cast(self, start: int):
+        people = self.get_json(
+            f"/api/cast?limit={CAST_PAGE_SIZE}&startIndex={start}", []
+        )
+        if start == 0:
+            self.people = []
+        self.people += people
+        self.cast_offset = (
+            start + len(people) if len(people) >= CAST_PAGE_SIZE else None
+        )
+        self.load_images([
+            self.image_url(person["id"], person["primary_image_tag"], 250)
+            for person in people[:self.args.visible_images]
+            if person.get("primary_image_tag")
+        ])
+
+    def open_person(self, person_id: str):
+        """Open the person dialog: details and credits load in parallel."""
+        credits_future = self.images.submit(
+            self.get_json, f"/api/person/{person_id}/credits", []
+        )
+        person = self.get_json(f"/api/person/{person_id}") or {}
+        credits = credits_future.result()
+        urls = [
+            self.image_url(item["id"], item["primary_image_tag"], 200)
+            for item in credits[:self.args.visible_images]
+            if item.get("primary_image_tag")
+        ]
+        if person.get("primary_image_tag"):
+            urls.append(
+                self.image_url(person_id, person["primary_image_tag"], 300)
+            )
+        self.load_images(urls)
+
+    def browse(self):
+        """Scroll a row or open a detail dialog on the current page."""
+        if self.page == "media":
+            if self.media_items and self.rng.random() < 0.3:
+                self.open_item(self.rng.choice(self.media_items)["id"])
+            elif self.libraries:
+                self.load_media_page(self.rng.choice(self.libraries))
+        elif self.page == "cast":
+            if self.people and self.rng.random() < 0.4:
+                self.open_person(self.rng.choice(self.people)["id"])
+            elif self.cast_offset is not None:
+                self.load_cast(self.cast_offset)
+
+    def navigate(self):
+        pages = list(self.pages)
+        weights = [self.pages[page] for page in pages]
+        self.open_page(self.rng.choices(pages, weights)[0])
+
+    # Server-Sent Events
+
+    def open_events(self) -> bool:
+        """Hold /api/events like EventSource; False if the app refuses."""
+        started = time.perf_counter()
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/events", stream=True, timeout=30
+            )
+        except requests.RequestException:
+            self.stats.record("/api/events", 0, 0, 0)
+            return False
+        self.stats.record(
+            "/api/events", response.status_code,
+            time.perf_counter() - started, 0,
+        )
+        if response.status_code != 200:
+            response.close()
+            return False
+        with self.stats.lock:
+            self.stats.sse_connections += 1
+        self.events = response
+        threading.Thread(
+            target=self.read_events, args=(response,), daemon=True
+        ).start()
+        return True
+
+    def read_events(self, response):
+        """Count events and load the images now-playing updates show."""
+        event = None
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if self.stop.is_set() or response is not self.events:
+                    break
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                    self.stats.record_event(event)
+                elif line.startswith("data:") and event == "now-playing":
+                    diff = json.loads(line[len("data:"):])
+                    self.show_now_playing(diff.get("upserted", []))
+        except (
+            requests.RequestException, ValueError, RuntimeError, AttributeError
+        ):
+            # Closing the stream from the tab thread (navigation or exit)
+            # surfaces as AttributeError inside urllib3; RuntimeError comes
+            # from the image pool being shut down
+            pass
+
+    def close_events(self):
+        if self.events is not None:
+            events, self.events = self.events, None
+            events.close()
+
+    # Scheduling
+
+    def every(
+        self,
+        interval: float,
+        action,
+        once: bool = False,
+        random_interval: float = 0,
+    ):
+        """Run action after interval, then repeatedly unless once."""
+        self.timers.append(
+            [time.monotonic() + interval, interval, action, once,
+             random_interval]
+        )
+
+    def run(self):
+        try:
+            self.navigate()
+            while not self.stop.is_set():
+                timer = min(self.timers, key=lambda t: t[0])
+                if self.stop.wait(max(timer[0] - time.monotonic(), 0)):
+                    break
+                due, interval, action, once, random_interval = timer
+                if once:
+                    self.timers.remove(timer)
+                elif random_interval:
+                    timer[0] = time.monotonic() + self.rng.expovariate(
+                        1 / random_interval
+                    )
+                else:
+                    # setInterval keeps its cadence but never fires twice
+                    # to catch up
+                    timer[0] = max(due + interval, time.monotonic())
+                action()
+        finally:
+            self.close_events()
+            self.images.shutdown(wait=False, cancel_futures=True)
+            self.session.close()
+
+
+def start_app(stub_url: str):
+    """Start app.py against the stub; return (process, url)."""
+    port = free_port()
+    env = dict(os.environ)
+    env.update({
+        "EMBY_SERVER_URL": stub_url,
+        "EMBY_API_KEY": env.get("EMBY_API_KEY") or "loadgen",
+        "FLASK_HOST": "127.0.0.1",
+        "FLASK_PORT": str(port),
+        "FLASK_DEBUG": "False",
+    })
+    env.setdefault("IMAGE_CACHE_DIR", tempfile.mkdtemp(prefix="emby-loadgen-"))
+    log = tempfile.NamedTemporaryFile(
+        prefix="emby-loadgen-app-", suffix=".log", delete=False
+    )
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "app.py")],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app.py exited during startup, see {log.name}")
+        try:
+            requests.get(f"{url}/api/server-time", timeout=1)
+            return process, url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"app.py did not start within 60 s, see {log.name}")
+
+
+def parse_pages(value: str) -> Dict[str, float]:
+    """Parse the page mix, e.g. "dashboard=3,media=2,cast=1"."""
+    pages = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("dashboard", "media", "cast"):
+            raise argparse.ArgumentTypeError(f"Unknown page: {name}")
+        pages[name] = float(weight or 1)
+    return pages
+
+
+def print_report(report: Dict):
+    load = report["load"]
+    print(
+        f"\n{report['tabs']} tabs ({report['mode']}) for "
+        f"{report['elapsed_seconds']:.0f} s: {load['requests']} requests, "
+        f"{load['per_second']:.1f}/s, {load['errors']} errors, "
+        f"{load['bytes'] / (1024 * 1024):.1f} MiB"
+    )
+    print(
+        f"{'route':<34}{'req':>7}{'req/s':>8}{'p50 ms':>9}"
+        f"{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'err':>6}"
+    )
+    for route, row in load["routes"].items():
+        print(
+            f"{route:<34}{row['requests']:>7}{row['per_second']:>8.2f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            f"{row['max_ms']:>9.1f}{row['errors']:>6}"
+        )
+    if load["sse_connections"]:
+        print(f"SSE: {load['sse_connections']} streams, {load['sse_events']}")
+    for route in load["failed_routes"]:
+        row = load["routes"][route]
+        print(
+            f"FAILED: {route} returned {row['errors']} errors "
+            f"({row['server_errors']} 5xx or no response) in "
+            f"{row['requests']} requests; its timings are not meaningful"
+        )
+
+    upstream = report.get("upstream")
+    if upstream:
+        print(
+            f"\nUpstream Emby: {upstream['requests']} requests, "
+            f"{upstream['per_viewer_per_minute']:.2f} per viewer per minute, "
+            f"{upstream['per_app_request']:.3f} per app request"
+        )
+        for route, count in upstream["by_route"].items():
+            print(f"  {route:<20}{count:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tabs", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument(
+        "--ramp", type=float, default=10,
+        help="seconds over which tabs are opened",
+    )
+    parser.add_argument(
+        "--mode", choices=("poll", "sse"), default="poll",
+        help="poll on the app.js schedule or hold /api/events",
+    )
+    parser.add_argument(
+        "--pages", type=parse_pages, default=parse_pages(
+            "dashboard=3,media=2,cast=1"
+        ),
+        help="relative weights of the pages tabs open",
+    )
+    parser.add_argument(
+        "--dwell", type=float, default=60,
+        help="mean seconds before a tab moves to another page",
+    )
+    parser.add_argument(
+        "--browse-interval", type=float, default=15,
+        help="mean seconds between scrolls/dialogs on media and cast",
+    )
+    parser.add_argument(
+        "--visible-images", type=int, default=8,
+        help="images a lazy-loaded row or page fetches",
+    )
+    parser.add_argument("--device-pixel-ratio", type=float, default=1)
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--app-url", default="",
+        help="load an already running app instead of starting app.py",
+    )
+    parser.add_argument(
+        "--stub-url", default="",
+        help="emby_stub.py to use (or read upstream counters from)",
+    )
+    parser.add_argument(
+        "--output", default="", help="write the report as JSON"
+    )
+    args = parser.parse_args()
+
+    processes = []
+    stub_url = args.stub_url.rstrip("/")
+    app_url = args.app_url.rstrip("/")
+    try:
+        if not app_url:
+            if not stub_url:
+                process, stub_url = start_stub(args.items, args.seed)
+                processes.append(process)
+            process, app_url = start_app(stub_url)
+            processes.append(process)
+        print(f"Loading {app_url} with {args.tabs} tabs ({args.mode})")
+
+        if stub_url:
+            requests.post(f"{stub_url}/stub/reset")
+        stats = Stats()
+        stop = threading.Event()
+        threads = []
+        started = time.monotonic()
+        for number in range(args.tabs):
+            tab = Tab(number, app_url, stats, stop, args, args.pages)
+            thread = threading.Thread(target=tab.run, daemon=True)
+            threads.append(thread)
+            if stop.wait(args.ramp / max(args.tabs, 1)):
+                break
+            thread.start()
+        stop.wait(max(args.duration - (time.monotonic() - started), 0))
+        stop.set()
+        elapsed = time.monotonic() - started
+        for thread in threads:
+            thread.join(timeout=30)
+
+        report = {
+            "tabs": args.tabs,
+            "mode": args.mode,
+            "pages": args.pages,
+            "elapsed_seconds": round(elapsed, 3),
+            "load": stats.summary(elapsed),
+        }
+        if stub_url:
+            upstream = requests.get(f"{stub_url}/stub/stats").json()
+            report["upstream"] = {
+                "requests": upstream["requests"],
+                "per_viewer_per_minute": round(
+                    upstream["requests"] / args.tabs / (elapsed / 60), 3
+                ),
+                "per_app_request": round(
+                    upstream["requests"]
+                    / max(report["load"]["requests"], 1),
+                    4,
+                ),
+                "by_route": upstream["by_route"],
+                "bytes": upstream["bytes_sent"],
+            }
+        try:
+            report["app_cache_stats"] = requests.get(
+                f"{app_url}/api/cache-stats", timeout=5
+            ).json()
+        except (requests.RequestException, ValueError):
+            pass
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    if report["load"]["failed_routes"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,550 @@
+"""
+Benchmark the Emby client, the Flask formatters and routes, date parsing
+and the image proxy against the local Emby stub, and flag regressions.
+
+The stub (emby_stub.py) runs in a child process so its work does not
+share the GIL with the code being timed. Every benchmark is timed over
+many samples for p50/p95/p99, run again under tracemalloc for its peak
+and retained allocations, and tagged with the upstream requests it made
+per call. Results are written as JSON and compared with a stored
+baseline (from --save-baseline); a benchmark whose p50, p95 or peak
+memory grew by more than --threshold is reported as a regression and
+the run exits with status 1.
+
+Usage:
+    python benchmarks/suite.py [--filter route.] [--samples 200]
+        [--items 5000] [--output benchmarks/results.json]
+        [--baseline benchmarks/baseline.json] [--save-baseline]
+        [--threshold 0.2] [--stub-url http://127.0.0.1:8096]
+"""
+
+# Standard library imports
+import argparse
+import gc
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# Third-party imports
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+DEFAULT_OUTPUT = os.path.join(HERE, "results.json")
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+# Differences below these are noise, whatever the relative change
+MIN_TIME_DELTA = 2e-6
+MIN_MEMORY_DELTA = 16 * 1024
+
+# Registered benchmarks: name -> (setup, calls per sample)
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, number: int = 1):
+    """
+    Register a benchmark.
+
+    The decorated function receives the Context, does any setup and
+    returns the operation to time; number calls make up one sample.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+
+class Context:
+    """Shared fixtures: the stub, an uncached client and the Flask app."""
+
+    def __init__(self, stub_url: str):
+        self.stub_url = stub_url
+        self.stub = requests.Session()
+
+        from emby_client import EmbyClient
+        from response_cache import ResponseCache
+
+        import app as web
+
+        self.web = web
+        self.flask = web.app.test_client()
+        # Without cache or coalescing every call reaches the stub
+        self.client = EmbyClient(
+            stub_url, "benchmark", cache=None, coalesce_requests=False
+        )
+        self.cached_client = EmbyClient(
+            stub_url, "benchmark", cache=ResponseCache()
+        )
+        libraries = self.client.get_libraries()
+        self.movies_id = next(
+            lib["ItemId"] for lib in libraries
+            if lib.get("CollectionType") == "movies"
+        )
+
+    def stub_stats(self) -> Dict:
+        return self.stub.get(f"{self.stub_url}/stub/stats").json()
+
+    def reset_stub(self):
+        self.stub.post(f"{self.stub_url}/stub/reset")
+
+    def movies(self, limit: int, profile: str) -> List[Dict]:
+        return self.client.get_items_by_library(
+            parent_id=self.movies_id, limit=limit, profile=profile
+        )
+
+    def get(self, path: str, headers: Optional[Dict] = None):
+        """Run one request through the Flask app and read the whole body."""
+        response = self.flask.get(path, headers=headers)
+        try:
+            response.get_data()
+            if response.status_code >= 400:
+                raise RuntimeError(f"{path} returned {response.status_code}")
+            return response
+        finally:
+            response.close()
+
+
+# EmbyClient call overhead (each call is one uncached round trip)
+
+@benchmark("client.get_system_info")
+def client_system_info(ctx):
+    return ctx.client.get_system_info
+
+
+@benchmark("client.get_system_info[cached]", number=100)
+def client_system_info_cached(ctx):
+    ctx.cached_client.get_system_info()
+    return ctx.cached_client.get_system_info
+
+
+@benchmark("client.get_scheduled_tasks")
+def client_tasks(ctx):
+    return ctx.client.get_scheduled_tasks
+
+
+@benchmark("client.get_sessions")
+def client_sessions(ctx):
+    return ctx.client.get_sessions
+
+
+@benchmark("client.get_items_by_library[100,card]")
+def client_items_card(ctx):
+    return lambda: ctx.movies(100, "card")
+
+
+@benchmark("client.get_items_by_library[100,detail]")
+def client_items_detail(ctx):
+    return lambda: ctx.movies(100, "detail")
+
+
+@benchmark("client.stream_items_by_library[1000,card]")
+def client_stream_items(ctx):
+    def op():
+        stream = ctx.client.stream_items_by_library(
+            parent_id=ctx.movies_id, limit=1000, profile="card"
+        )
+        for _ in stream:
+            pass
+    return op
+
+
+# Formatting loops of the dashboard routes, on canned Emby data
+
+@benchmark("format.media_item[100,card]", number=10)
+def format_media_card(ctx):
+    items = ctx.movies(100, "card")
+    return lambda: [ctx.web.format_media_item(item) for item in items]
+
+
+@benchmark("format.media_item[100,detail]", number=10)
+def format_media_detail(ctx):
+    items = ctx.movies(100, "detail")
+    return lambda: [ctx.web.format_media_item(item) for item in items]
+
+
+@benchmark("format.indexed_media[50]", number=10)
+def format_indexed(ctx):
+    items = ctx.client.get_recently_added(limit=50)
+    return lambda: ctx.web.format_indexed_media(items)
+
+
+@benchmark("format.all_tasks", number=50)
+def format_all_tasks(ctx):
+    tasks = ctx.client.get_scheduled_tasks()
+    return lambda: ctx.web.format_all_tasks(tasks)
+
+
+@benchmark("format.now_playing", number=50)
+def format_now_playing(ctx):
+    sessions = ctx.client.get_sessions()
+    return lambda: ctx.web.format_now_playing(sessions)
+
+
+# Date handling, called for every formatted row
+
+@benchmark("datetime.parse_iso_datetime", number=1000)
+def parse_datetime(ctx):
+    return lambda: ctx.web.parse_iso_datetime("2024-05-01T12:34:56.1234567Z")
+
+
+@benchmark("datetime.format_datetime", number=1000)
+def format_datetime(ctx):
+    return lambda: ctx.web.format_datetime("2024-05-01T12:34:56.1234567Z")
+
+
+@benchmark("datetime.format_datetime[invalid]", number=1000)
+def format_datetime_invalid(ctx):
+    return lambda: ctx.web.format_datetime("not a date")
+
+
+# Flask routes end to end, including their upstream calls
+
+@benchmark("route./api/media[100]")
+def route_media(ctx):
+    path = f"/api/media?libraryId={ctx.movies_id}&limit=100"
+    return lambda: ctx.get(path)
+
+
+@benchmark("route./api/media[1000,streamed]")
+def route_media_streamed(ctx):
+    path = f"/api/media?libraryId={ctx.movies_id}&limit=1000"
+    return lambda: ctx.get(path)
+
+
+@benchmark("route./api/indexed-media[50]")
+def route_indexed_media(ctx):
+    return lambda: ctx.get("/api/indexed-media?limit=50")
+
+
+@benchmark("route./api/all-tasks")
+def route_all_tasks(ctx):
+    return lambda: ctx.get("/api/all-tasks")
+
+
+@benchmark("route./api/now-playing")
+def route_now_playing(ctx):
+    return lambda: ctx.get("/api/now-playing")
+
+
+# Image proxy
+
+def image_target(ctx) -> Dict:
+    """Return a movie that has a primary image."""
+    return next(
+        item for item in ctx.movies(50, "card")
+        if item.get("ImageTags", {}).get("Primary")
+    )
+
+
+@benchmark("image.proxy[untagged]")
+def image_untagged(ctx):
+    item_id = image_target(ctx)["Id"]
+    return lambda: ctx.get(f"/api/image/{item_id}?size=300")
+
+
+@benchmark("image.proxy[upstream-304]")
+def image_upstream_not_modified(ctx):
+    item_id = image_target(ctx)["Id"]
+    etag = ctx.get(f"/api/image/{item_id}?size=300").headers["ETag"]
+    return lambda: ctx.get(
+        f"/api/image/{item_id}?size=300", headers={"If-None-Match": etag}
+    )
+
+
+@benchmark("image.proxy[disk-hit]")
+def image_disk_hit(ctx):
+    item = image_target(ctx)
+    path = f"/api/image/{item['Id']}?size=300&tag={item['ImageTags']['Primary']}"
+    ctx.get(path)
+    return lambda: ctx.get(path)
+
+
+@benchmark("image.proxy[tagged-304]")
+def image_tagged_not_modified(ctx):
+    item = image_target(ctx)
+    path = f"/api/image/{item['Id']}?size=300&tag={item['ImageTags']['Primary']}"
+    etag = ctx.get(path).headers["ETag"]
+    return lambda: ctx.get(path, headers={"If-None-Match": etag})
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return a percentile by linear interpolation between samples."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (
+        sorted_values[high] - sorted_values[low]
+    ) * (position - low)
+
+
+def run_benchmark(
+    ctx: Context,
+    op: Callable[[], object],
+    number: int,
+    samples: int,
+    warmup: int,
+    alloc_runs: int,
+) -> Dict:
+    """Time op and measure its allocations; times are seconds per call."""
+    for _ in range(warmup):
+        op()
+
+    ctx.reset_stub()
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(samples):
+            started = time.perf_counter()
+            for _ in range(number):
+                op()
+            times.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    upstream = ctx.stub_stats()["requests"] / (samples * number)
+
+    # Allocations are measured in a separate pass; tracemalloc would
+    # otherwise inflate the timings several times over
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        peak = 0
+        for _ in range(alloc_runs):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            op()
+            _, run_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, run_peak - before)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times.sort()
+    return {
+        "calls": samples * number,
+        "p50": percentile(times, 0.50),
+        "p95": percentile(times, 0.95),
+        "p99": percentile(times, 0.99),
+        "mean": statistics.fmean(times),
+        "min": times[0],
+        "max": times[-1],
+        "peak_bytes": peak,
+        "retained_bytes_per_call": max(retained - baseline, 0) // alloc_runs,
+        "upstream_requests_per_call": round(upstream, 3),
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Return per-metric changes beyond threshold against a baseline."""
+    changes = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, floor in (
+            ("p50", MIN_TIME_DELTA),
+            ("p95", MIN_TIME_DELTA),
+            ("peak_bytes", MIN_MEMORY_DELTA),
+        ):
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None or abs(new - old) < floor:
+                continue
+            ratio = new / old
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+            else:
+                continue
+            changes.append({
+                "benchmark": name,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "ratio": round(ratio, 3),
+                "status": status,
+            })
+    return changes
+
+
+def format_seconds(value: float) -> str:
+    if value < 1e-3:
+        return f"{value * 1e6:8.1f} us"
+    return f"{value * 1e3:8.2f} ms"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub(items: int, seed: int):
+    """Start emby_stub.py in a child process; return (process, url)."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, os.path.join(HERE, "emby_stub.py"),
+            "--port", str(port),
+            "--items", str(items),
+            "--persons", str(max(items // 5, 100)),
+            "--seed", str(seed),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Emby stub exited during startup")
+        try:
+            requests.get(f"{url}/stub/stats", timeout=1)
+            return process, url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Emby stub did not start within 120 s")
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--filter", default="",
+        help="only run benchmarks whose name contains this",
+    )
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--alloc-runs", type=int, default=20)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="write these results as the new baseline",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="relative change reported as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--stub-url", default="",
+        help="use an already running emby_stub.py instead of starting one",
+    )
+    args = parser.parse_args()
+
+    process = None
+    stub_url = args.stub_url.rstrip("/")
+    if not stub_url:
+        process, stub_url = start_stub(args.items, args.seed)
+
+    # The app reads its configuration at import time
+    os.environ["EMBY_SERVER_URL"] = stub_url
+    os.environ["EMBY_API_KEY"] = "benchmark"
+    os.environ["EMBY_WEBSOCKET_ENABLED"] = "False"
+    os.environ["IMAGE_CACHE_DIR"] = tempfile.mkdtemp(prefix="emby-bench-")
+
+    try:
+        ctx = Context(stub_url)
+        results = {}
+        for name, (setup, number) in BENCHMARKS.items():
+            if args.filter not in name:
+                continue
+            results[name] = run_benchmark(
+                ctx,
+                setup(ctx),
+                number,
+                args.samples,
+                args.warmup,
+                args.alloc_runs,
+            )
+            result = results[name]
+            print(
+                f"{name:<42} p50 {format_seconds(result['p50'])}"
+                f"  p95 {format_seconds(result['p95'])}"
+                f"  p99 {format_seconds(result['p99'])}"
+                f"  peak {result['peak_bytes'] / 1024:9.1f} KiB"
+                f"  upstream {result['upstream_requests_per_call']:g}"
+            )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    changes = (
+        compare(results, baseline["benchmarks"], args.threshold)
+        if baseline else []
+    )
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "stub_items": args.items,
+            "samples": args.samples,
+            "threshold": args.threshold,
+            "baseline": (
+                {
+                    "path": args.baseline,
+                    "revision": baseline["meta"].get("revision", ""),
+                }
+                if baseline else None
+            ),
+        },
+        "benchmarks": results,
+        "changes": changes,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline")
+
+    for change in changes:
+        print(
+            f"{change['status'].upper():<12} {change['benchmark']} "
+            f"{change['metric']} x{change['ratio']}"
+        )
+    if any(change["status"] == "regression" for change in changes):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,55 @@ load_dotenv()
 EMBY_SERVER_URL = os.getenv('EMBY_SERVER_URL', 'http://localhost:8096')
 EMBY_API_KEY = os.getenv('EMBY_API_KEY', '')
 
+# HTTP connection pool for the Emby client (per-host keep-alive limits)
+EMBY_POOL_CONNECTIONS = int(os.getenv('EMBY_POOL_CONNECTIONS', 4))
+EMBY_POOL_MAXSIZE = int(os.getenv('EMBY_POOL_MAXSIZE', 20))
+EMBY_POOL_BLOCK = os.getenv('EMBY_POOL_BLOCK', 'True').lower() == 'true'
+EMBY_REQUEST_TIMEOUT = float(os.getenv('EMBY_REQUEST_TIMEOUT', 10))
+
+# In-process TTL cache for Emby API responses
+EMBY_CACHE_ENABLED = os.getenv('EMBY_CACHE_ENABLED', 'True').lower() == 'true'
+EMBY_CACHE_MAX_ENTRIES = int(os.getenv('EMBY_CACHE_MAX_ENTRIES', 512))
+
+# Coalesce concurrent identical Emby requests into one upstream call
+EMBY_COALESCE_REQUESTS = (
+    os.getenv('EMBY_COALESCE_REQUESTS', 'True').lower() == 'true'
+)
+
+# Item listings at least this long are decoded and relayed as they
+# download instead of being parsed (and cached) whole
+EMBY_STREAM_MIN_ITEMS = int(os.getenv('EMBY_STREAM_MIN_ITEMS', 500))
+
+# Emby WebSocket push feed for task progress and sessions. The URL is
+# derived from EMBY_SERVER_URL unless overridden (ws://host:port/embywebsocket)
+EMBY_WEBSOCKET_ENABLED = (
+    os.getenv('EMBY_WEBSOCKET_ENABLED', 'True').lower() == 'true'
+)
+EMBY_WEBSOCKET_URL = os.getenv('EMBY_WEBSOCKET_URL', '')
+
+# On-disk cache for tagged images served by /api/image and /api/person-image
+IMAGE_CACHE_ENABLED = os.getenv('IMAGE_CACHE_ENABLED', 'True').lower() == 'true'
+IMAGE_CACHE_DIR = os.getenv('IMAGE_CACHE_DIR', '')
+IMAGE_CACHE_MAX_MB = int(os.getenv('IMAGE_CACHE_MAX_MB', 256))
+
+# Maximum concurrent upstream image downloads streamed by the proxy
+IMAGE_FETCH_CONCURRENCY = int(os.getenv('IMAGE_FETCH_CONCURRENCY', 8))
+
+# Local search index over the library, served by /api/search and used by
+# the GTK search entries; fully reloaded every REFRESH_INTERVAL seconds
+SEARCH_INDEX_ENABLED = os.getenv('SEARCH_INDEX_ENABLED', 'True').lower() == 'true'
+SEARCH_INDEX_REFRESH_INTERVAL = int(os.getenv('SEARCH_INDEX_REFRESH_INTERVAL', 1800))
+
+# GTK app: concurrent thumbnail downloads (fixed worker pool)
+GTK_THUMBNAIL_WORKERS = int(os.getenv('GTK_THUMBNAIL_WORKERS', 4))
+
+# GTK app: memory budget for decoded, scaled thumbnails (encoded bytes are
+# kept on disk in IMAGE_CACHE_DIR)
+GTK_PIXBUF_CACHE_MB = int(os.getenv('GTK_PIXBUF_CACHE_MB', 64))
+
+# GTK app: quiet period after the last keystroke before a search runs
+GTK_SEARCH_DEBOUNCE_MS = int(os.getenv('GTK_SEARCH_DEBOUNCE_MS', 250))
+
 # Flask configuration
 FLASK_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
 FLASK_PORT = int(os.getenv('FLASK_PORT', 5000))
@@ -21,6 +70,15 @@ FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
 PROCESSING_REFRESH_INTERVAL = int(os.getenv('PROCESSING_REFRESH_INTERVAL', 5))
 STATUS_REFRESH_INTERVAL = int(os.getenv('STATUS_REFRESH_INTERVAL', 30))
 
+# Serve dashboard routes from a background-polled snapshot of Emby state
+BACKGROUND_POLLER_ENABLED = (
+    os.getenv('BACKGROUND_POLLER_ENABLED', 'True').lower() == 'true'
+)
+
+# Server-Sent Events push stream (/api/events)
+SSE_HEARTBEAT_INTERVAL = float(os.getenv('SSE_HEARTBEAT_INTERVAL', 4))
+SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', 3000))
+
 
 def validate_config():
     """Validate that required configuration is present."""
@@ -35,4 +93,13 @@ def validate_config():
     if not EMBY_SERVER_URL:
         raise ValueError("EMBY_SERVER_URL is not set")
 
+    if GTK_THUMBNAIL_WORKERS < 1:
+        raise ValueError("GTK_THUMBNAIL_WORKERS must be at least 1")
+
+    if IMAGE_FETCH_CONCURRENCY < 1:
+        raise ValueError("IMAGE_FETCH_CONCURRENCY must be at least 1")
+
+    if EMBY_POOL_MAXSIZE < 1:
+        raise ValueError("EMBY_POOL_MAXSIZE must be at least 1")
+
     return True
@@ -1,16 +1,253 @@
 """Emby API Client for interacting with Emby server."""
 
 # Standard library imports
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 
 # Third-party imports
 import requests
+from requests.adapters import HTTPAdapter
+
+# Local imports
+from emby_websocket import EmbyWebSocket, websocket_url
+from json_stream import ItemStream
+from paging import PagedQuery
+from response_cache import ResponseCache
+from single_flight import SingleFlight
+
+
+def extract_items(result: Optional[Dict]) -> List[Dict]:
+    """Return the Items array of an Emby query result, or an empty list."""
+    if result and "Items" in result:
+        return result["Items"]
+    return []
+
+
+# Optional item fields requested per kind of view. Emby always returns
+# Id, Name, Type, SeriesName and index numbers; other fields are only
+# sent when listed, and People, MediaStreams and Overview make up most
+# of a response. Pick the smallest profile a view needs.
+FIELD_PROFILES = {
+    # List rows (recently added): name, type, date, path and thumbnail
+    "row": "DateCreated,Path,ImageTags",
+    # Grid cards: poster, year, rating and runtime
+    "card": "ProductionYear,CommunityRating,OfficialRating,RunTimeTicks,ParentId,ImageTags",
+    # Full metadata for a single item or a detailed listing
+    "detail": "Path,MediaStreams,Overview,Genres,People,CommunityRating,OfficialRating,RunTimeTicks,ProductionYear,PremiereDate,DateCreated,ParentId,ImageTags",
+    # Everything worth keeping when dumping a whole library
+    "export": "Path,MediaStreams,Overview,Genres,People,Studios,Tags,ProviderIds,OriginalTitle,SortName,CommunityRating,CriticRating,OfficialRating,RunTimeTicks,ProductionYear,PremiereDate,DateCreated,ParentId,Container,Size,ImageTags",
+    # Text the local search index matches on
+    "index": "OriginalTitle,Overview,Genres,People,ProductionYear,CommunityRating,ImageTags",
+}
+
+
+def profile_fields(profile: str) -> str:
+    """Return the Fields parameter of a FIELD_PROFILES entry."""
+    try:
+        return FIELD_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown field profile: {profile}") from None
+
+
+def library_items_params(
+    limit: int, sort_by: str, sort_order: str, profile: str = "row"
+) -> Dict:
+    """Build query parameters for recently added/indexed library items."""
+    return {
+        "Recursive": "true",
+        "Limit": limit,
+        "SortBy": sort_by,
+        "SortOrder": sort_order,
+        "Fields": profile_fields(profile),
+    }
+
+
+def movies_params(
+    limit: int, sort_by: str, sort_order: str, profile: str = "detail"
+) -> Dict:
+    """Build query parameters for the movie listing."""
+    return {
+        "IncludeItemTypes": "Movie",
+        "Recursive": "true",
+        "Limit": limit,
+        "SortBy": sort_by,
+        "SortOrder": sort_order,
+        "Fields": profile_fields(profile),
+    }
+
+
+def items_by_library_params(
+    parent_id: Optional[str],
+    limit: int,
+    sort_by: str,
+    sort_order: str,
+    include_item_types: str,
+    start_index: int,
+    search_term: Optional[str],
+    profile: str = "detail",
+) -> Dict:
+    """Build query parameters for items filtered by library."""
+    params = {
+        "IncludeItemTypes": include_item_types,
+        "Recursive": "true",
+        "Limit": limit,
+        "StartIndex": start_index,
+        "SortBy": sort_by,
+        "SortOrder": sort_order,
+        "Fields": profile_fields(profile),
+    }
+
+    # Add parent ID filter if specified
+    if parent_id:
+        params["ParentId"] = parent_id
+
+    # Add search term if specified
+    if search_term:
+        params["SearchTerm"] = search_term
+
+    return params
+
+
+def persons_params(
+    limit: int, start_index: int, search_term: Optional[str]
+) -> Dict:
+    """Build query parameters for the persons listing."""
+    params = {
+        "Limit": limit,
+        "StartIndex": start_index,
+        "SortBy": "SortName",
+        "SortOrder": "Ascending",
+        "Recursive": "true",
+        "Fields": "ImageTags,DateCreated",
+        "ExcludeItemTypes": "Series",
+    }
+    if search_term:
+        params["SearchTerm"] = search_term
+    return params
+
+
+# Item types loaded into the local search index
+INDEXED_ITEM_TYPES = "Movie,Series,Episode,BoxSet,MusicAlbum,Audio,Video,MusicVideo"
+
+
+def index_items_params(
+    parent_id: Optional[str],
+    start_index: int,
+    limit: int,
+    ids: Optional[List[str]] = None,
+) -> Dict:
+    """Build query parameters for a page of items to search-index."""
+    params = {
+        "IncludeItemTypes": INDEXED_ITEM_TYPES,
+        "Recursive": "true",
+        "StartIndex": start_index,
+        "Limit": limit,
+        "SortBy": "SortName",
+        "SortOrder": "Ascending",
+        "Fields": profile_fields("index"),
+    }
+    if parent_id:
+        params["ParentId"] = parent_id
+    if ids:
+        params["Ids"] = ",".join(ids)
+    return params
+
+
+def person_credits_params(person_id: str) -> Dict:
+    """Build query parameters for the items a person appears in."""
+    return {
+        "PersonIds": person_id,
+        "IncludeItemTypes": "Movie,Series,MusicAlbum",
+        "Recursive": "true",
+        "Fields": "PrimaryImageAspectRatio,DateCreated,ProductionYear",
+        "SortBy": "ProductionYear",
+        "SortOrder": "Descending"
+    }
+
+
+def filter_active_tasks(tasks: Optional[List[Dict]]) -> List[Dict]:
+    """Return the running/cancelling tasks from a scheduled task list."""
+    if not tasks:
+        return []
+
+    active_tasks = []
+    for task in tasks:
+        if task.get("State") in ["Running", "Cancelling"]:
+            active_tasks.append(task)
+
+    return active_tasks
+
+
+def build_processing_media(active_tasks: List[Dict]) -> List[Dict]:
+    """Summarize active tasks as processing entries."""
+    processing_info = []
+
+    for task in active_tasks:
+        task_name = task.get("Name", "")
+        current_progress = task.get("CurrentProgressPercentage", 0)
+        state = task.get("State", "")
+
+        # Extract media info from task description or current item
+        media_info = {
+            "task_name": task_name,
+            "state": state,
+            "progress": current_progress,
+            "category": task.get("Category", "Unknown"),
+            "description": task.get("Description", ""),
+            "last_execution_time": task.get("LastExecutionResult", {}).get(
+                "StartTimeUtc", ""
+            ),
+            "id": task.get("Id", ""),
+        }
+
+        processing_info.append(media_info)
+
+    return processing_info
+
+
+def build_completed_tasks(
+    all_tasks: Optional[List[Dict]], limit: int
+) -> List[Dict]:
+    """Summarize the most recently completed tasks, newest first."""
+    if not all_tasks:
+        return []
+
+    completed = []
+    for task in all_tasks:
+        if task.get("State") == "Idle" and task.get("LastExecutionResult"):
+            last_result = task["LastExecutionResult"]
+            if last_result.get("Status") == "Completed":
+                completed.append(
+                    {
+                        "name": task.get("Name", ""),
+                        "end_time": last_result.get("EndTimeUtc", ""),
+                        "start_time": last_result.get("StartTimeUtc", ""),
+                        "status": last_result.get("Status", ""),
+                        "category": task.get("Category", ""),
+                    }
+                )
+
+    # Sort by end time
+    completed.sort(key=lambda x: x.get("end_time", ""), reverse=True)
+    return completed[:limit]
 
 
 class EmbyClient:
     """Client for interacting with Emby server API."""
 
-    def __init__(self, server_url: str, api_key: str):
+    def __init__(
+        self,
+        server_url: str,
+        api_key: str,
+        pool_connections: int = 4,
+        pool_maxsize: int = 20,
+        pool_block: bool = True,
+        timeout: float = 10,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        fan_out_workers: int = 8,
+    ):
         """
         Initialize Emby client.
 
@@ -18,15 +255,94 @@ class EmbyClient:
             server_url: Base URL of the Emby server
                 (e.g., http://localhost:8096)
             api_key: API key for authentication
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum keep-alive connections per host
+            pool_block: Block callers once a host's pool is exhausted
+                instead of opening extra throwaway connections
+            timeout: Default request timeout in seconds
+            cache: Optional shared TTL cache for GET responses
+            coalesce_requests: Share one in-flight upstream request between
+                concurrent identical GET calls
+            fan_out_workers: Threads fan_out() runs independent calls on
         """
         self.server_url = server_url.rstrip("/")
         self.api_key = api_key
+        self.timeout = timeout
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce_requests else None
         self.headers = {
             "X-Emby-Token": api_key,
             "Content-Type": "application/json"
         }
         self.user_id = None
 
+        # One pooled keep-alive session shared by every caller (Flask
+        # request threads, GTK workers). The urllib3 pool underneath is
+        # thread-safe, so connections are reused instead of reopened.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Started on first use; fan_out() calls share it
+        self.fan_out_workers = fan_out_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def close(self):
+        """Close all pooled connections."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def fan_out(self, calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """
+        Run independent calls concurrently over the pooled session.
+
+        The first call runs on the calling thread and the rest on a
+        shared worker pool, so the whole batch takes about as long as
+        the slowest call instead of the sum of all of them.
+
+        Args:
+            calls: Zero-argument callables by name
+
+        Returns:
+            Each call's result under its name. If a call raised, the
+            first such exception is re-raised once all calls finished.
+        """
+        names = list(calls)
+        if len(names) < 2:
+            return {name: calls[name]() for name in names}
+
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.fan_out_workers,
+                    thread_name_prefix="emby-fan-out",
+                )
+        futures = {
+            name: self._executor.submit(calls[name]) for name in names[1:]
+        }
+        error = None
+        results = {}
+        try:
+            results[names[0]] = calls[names[0]]()
+        except Exception as e:
+            error = e
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
     def _get_user_id(self) -> Optional[str]:
         """Get the first available user ID."""
         if self.user_id:
@@ -52,10 +368,39 @@ class EmbyClient:
         Returns:
             JSON response or None on error
         """
+        if method.upper() != "GET":
+            return self._send_request(endpoint, method, params)
+
+        ttl = self.cache.ttl_for(endpoint) if self.cache is not None else 0
+        if ttl <= 0 and self.single_flight is None:
+            return self._send_request(endpoint, method, params)
+
+        key = ResponseCache.make_key(method, endpoint, params)
+        if ttl > 0:
+            hit, value = self.cache.get(key)
+            if hit:
+                return value
+
+        def fetch():
+            result = self._send_request(endpoint, method, params)
+            # Errors are not cached so the next caller retries upstream
+            if ttl > 0 and result is not None:
+                self.cache.set(key, result, ttl)
+            return result
+
+        if self.single_flight is None:
+            return fetch()
+        # Concurrent identical calls wait on this one upstream request
+        return self.single_flight.do(key, fetch)
+
+    def _send_request(
+        self, endpoint: str, method: str = "GET", params: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """Send a request upstream, bypassing the response cache."""
         url = f"{self.server_url}{endpoint}"
         try:
-            response = requests.request(
-                method, url, headers=self.headers, params=params, timeout=10
+            response = self.session.request(
+                method, url, params=params, timeout=self.timeout
             )
             # Only raise for server errors (5xx), not client errors like 404
             if response.status_code >= 500:
@@ -73,7 +418,190 @@ class EmbyClient:
                 print(f"Error making request to {url}: {e}")
             return None
 
-    # ... (existing methods)
+    def stream_query(
+        self, endpoint: str, params: Optional[Dict] = None
+    ) -> Optional[ItemStream]:
+        """
+        Send a GET request and decode its Items array as it downloads.
+
+        Unlike _make_request, the body is never held whole: items are
+        yielded one at a time while bytes arrive, so large pages with
+        People, MediaStreams or Overview keep memory flat. Bypasses the
+        response cache.
+
+        Args:
+            endpoint: API endpoint returning Items (or a bare array)
+            params: Query parameters
+
+        Returns:
+            Stream of items (TotalRecordCount in its fields once read),
+            or None on error
+        """
+        url = f"{self.server_url}{endpoint}"
+        try:
+            response = self.session.get(
+                url, params=params, timeout=self.timeout, stream=True
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"Error making request to {url}: {e}")
+            return None
+        if response.status_code >= 400:
+            if response.status_code >= 500:
+                print(
+                    f"Error making request to {url}: "
+                    f"HTTP {response.status_code}"
+                )
+            response.close()
+            return None
+        return ItemStream(
+            response.iter_content(chunk_size=64 * 1024),
+            close=response.close,
+        )
+
+    def iter_query(
+        self,
+        endpoint: str,
+        params: Dict,
+        page_size: int = 500,
+        prefetch: bool = True,
+        stream: bool = False,
+    ) -> PagedQuery:
+        """
+        Lazily page through every item of a GET query.
+
+        Pages bypass the response cache: they are read once and would only
+        evict the entries the UI relies on.
+
+        Args:
+            endpoint: API endpoint returning Items/TotalRecordCount
+            params: Query parameters; StartIndex and Limit are set per page
+            page_size: Items requested per page
+            prefetch: Fetch the next page while the current one is consumed
+            stream: Decode each page while it downloads (see stream_query)
+                instead of prefetching whole pages
+
+        Returns:
+            Iterable over the items, exposing total_record_count
+        """
+        def fetch_page(start_index: int, limit: int):
+            page_params = dict(params, StartIndex=start_index, Limit=limit)
+            if stream:
+                return self.stream_query(endpoint, page_params)
+            return self._send_request(endpoint, params=page_params)
+
+        return PagedQuery(fetch_page, page_size=page_size, prefetch=prefetch)
+
+    def cache_stats(self) -> Dict:
+        """Return response cache and request coalescing counters."""
+        stats = self.cache.stats() if self.cache is not None else {}
+        if self.single_flight is not None:
+            stats["single_flight"] = self.single_flight.stats()
+        return stats
+
+    def _prime_cache(self, endpoint: str, value):
+        """Store a pushed value as the cached GET response for endpoint."""
+        if self.cache is None:
+            return
+        ttl = self.cache.ttl_for(endpoint)
+        self.cache.set(ResponseCache.make_key("GET", endpoint), value, ttl)
+
+    def create_websocket(
+        self,
+        on_tasks: Optional[Callable[[List[Dict]], None]] = None,
+        on_sessions: Optional[Callable[[List[Dict]], None]] = None,
+        on_library_changed: Optional[Callable[[Dict], None]] = None,
+        on_connection_change: Optional[Callable[[bool], None]] = None,
+        url: Optional[str] = None,
+        device_id: str = "emby-assistant",
+    ) -> EmbyWebSocket:
+        """
+        Create (but do not start) a WebSocket subscription to this server.
+
+        Only the message types with a handler are subscribed to. Pushed
+        task and session lists also refresh the response cache, so REST
+        callers read them without an upstream request, and LibraryChanged
+        drops the cached library listings.
+
+        Args:
+            on_tasks: Called with the scheduled task list on each update
+            on_sessions: Called with the session list on each update
+            on_library_changed: Called with LibraryChanged message data
+            on_connection_change: Called with True/False on (dis)connect
+            url: Optional ws(s):// URL overriding the one derived from
+                server_url
+            device_id: Device ID reported to Emby for this connection
+
+        Returns:
+            The EmbyWebSocket; call start() to connect
+        """
+        def handle_tasks(tasks):
+            self._prime_cache("/emby/ScheduledTasks", tasks)
+            if on_tasks:
+                on_tasks(tasks)
+
+        def handle_sessions(sessions):
+            self._prime_cache("/emby/Sessions", sessions)
+            if on_sessions:
+                on_sessions(sessions)
+
+        def handle_library_changed(data):
+            if self.cache is not None:
+                for prefix in ("/emby/Items", "/emby/Persons", "/emby/Library"):
+                    self.cache.invalidate(prefix)
+            if on_library_changed:
+                on_library_changed(data)
+
+        return EmbyWebSocket(
+            url or websocket_url(self.server_url, self.api_key, device_id),
+            on_tasks=handle_tasks if on_tasks else None,
+            on_sessions=handle_sessions if on_sessions else None,
+            on_library_changed=handle_library_changed,
+            on_connection_change=on_connection_change,
+        )
+
+    def get_image(
+        self,
+        item_id: str,
+        params: Optional[Dict] = None,
+        timeout: float = 5,
+        headers: Optional[Dict] = None,
+        stream: bool = False,
+    ) -> Optional[requests.Response]:
+        """
+        Fetch an item image, falling back from Primary to Thumb.
+
+        Args:
+            item_id: The item or person ID
+            params: Image query parameters (maxHeight, quality, ...)
+            timeout: Request timeout in seconds
+            headers: Extra request headers, e.g. If-None-Match or
+                If-Modified-Since validators to revalidate a cached copy
+            stream: Defer downloading the body; the caller reads it with
+                iter_content() and must close() the response
+
+        Returns:
+            The image response (200, or 304 when validators matched) or
+            None if no image exists
+        """
+        for image_type in ("Primary", "Thumb"):
+            url = f"{self.server_url}/emby/Items/{item_id}/Images/{image_type}"
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout,
+                    stream=stream,
+                )
+            except requests.exceptions.RequestException:
+                return None
+            if response.status_code in (200, 304):
+                return response
+            # Release the pooled connection before trying the next type
+            response.close()
+            if response.status_code != 404:
+                break
+        return None
 
     def get_item_details(self, item_id: str) -> Optional[Dict]:
         """
@@ -98,12 +626,17 @@ class EmbyClient:
 
     def get_detailed_server_info(self) -> Optional[Dict]:
         """Get detailed server information including drives and endpoint info."""
-        system_info = self.get_system_info()
+        # Both requests are independent, so they are sent together
+        results = self.fan_out(
+            {
+                "system": self.get_system_info,
+                "endpoint": lambda: self._make_request("/emby/System/Endpoint"),
+            }
+        )
+        system_info = results["system"]
         if not system_info:
             return None
-
-        # Get additional endpoint information
-        endpoint_info = self._make_request("/emby/System/Endpoint")
+        endpoint_info = results["endpoint"]
 
         # Combine all information
         detailed_info = {
@@ -124,16 +657,7 @@ class EmbyClient:
 
     def get_active_tasks(self) -> List[Dict]:
         """Get currently running/active tasks."""
-        tasks = self.get_scheduled_tasks()
-        if not tasks:
-            return []
-
-        active_tasks = []
-        for task in tasks:
-            if task.get("State") in ["Running", "Cancelling"]:
-                active_tasks.append(task)
-
-        return active_tasks
+        return filter_active_tasks(self.get_scheduled_tasks())
 
     def get_task_details(self, task_id: str) -> Optional[Dict]:
         """Get detailed information about a specific task."""
@@ -144,6 +668,7 @@ class EmbyClient:
         limit: int = 100,
         sort_by: str = "DateCreated",
         sort_order: str = "Descending",
+        profile: str = "row",
     ) -> Optional[Dict]:
         """
         Get library items (recently added/indexed media).
@@ -152,25 +677,18 @@ class EmbyClient:
             limit: Maximum number of items to return
             sort_by: Field to sort by
             sort_order: Sort order (Ascending/Descending)
+            profile: FIELD_PROFILES entry naming the fields to fetch
 
         Returns:
             Dictionary containing items and total count
         """
-        params = {
-            "Recursive": "true",
-            "Limit": limit,
-            "SortBy": sort_by,
-            "SortOrder": sort_order,
-            "Fields": "DateCreated,Path,MediaStreams,Overview",
-        }
+        params = library_items_params(limit, sort_by, sort_order, profile)
         return self._make_request("/emby/Items", params=params)
 
     def get_recently_added(self, limit: int = 20) -> List[Dict]:
         """Get recently added/indexed media items."""
         result = self.get_library_items(limit=limit, sort_by="DateCreated")
-        if result and "Items" in result:
-            return result["Items"]
-        return []
+        return extract_items(result)
 
     def get_activity_log(self, limit: int = 50) -> Optional[Dict]:
         """Get server activity log."""
@@ -184,61 +702,18 @@ class EmbyClient:
         Get media that is currently being processed.
         This includes scanning, metadata refresh, etc.
         """
-        active_tasks = self.get_active_tasks()
-        processing_info = []
-
-        for task in active_tasks:
-            task_name = task.get("Name", "")
-            current_progress = task.get("CurrentProgressPercentage", 0)
-            state = task.get("State", "")
-
-            # Extract media info from task description or current item
-            media_info = {
-                "task_name": task_name,
-                "state": state,
-                "progress": current_progress,
-                "category": task.get("Category", "Unknown"),
-                "description": task.get("Description", ""),
-                "last_execution_time": task.get("LastExecutionResult", {}).get(
-                    "StartTimeUtc", ""
-                ),
-                "id": task.get("Id", ""),
-            }
-
-            processing_info.append(media_info)
-
-        return processing_info
+        return build_processing_media(self.get_active_tasks())
 
     def get_completed_tasks(self, limit: int = 10) -> List[Dict]:
         """Get recently completed tasks."""
-        all_tasks = self.get_scheduled_tasks()
-        if not all_tasks:
-            return []
-
-        completed = []
-        for task in all_tasks:
-            if task.get("State") == "Idle" and task.get("LastExecutionResult"):
-                last_result = task["LastExecutionResult"]
-                if last_result.get("Status") == "Completed":
-                    completed.append(
-                        {
-                            "name": task.get("Name", ""),
-                            "end_time": last_result.get("EndTimeUtc", ""),
-                            "start_time": last_result.get("StartTimeUtc", ""),
-                            "status": last_result.get("Status", ""),
-                            "category": task.get("Category", ""),
-                        }
-                    )
-
-        # Sort by end time
-        completed.sort(key=lambda x: x.get("end_time", ""), reverse=True)
-        return completed[:limit]
+        return build_completed_tasks(self.get_scheduled_tasks(), limit)
 
     def get_movies(
         self,
         limit: int = 100,
         sort_by: str = "SortName",
         sort_order: str = "Ascending",
+        profile: str = "detail",
     ) -> List[Dict]:
         """
         Get all movies with detailed metadata.
@@ -247,23 +722,25 @@ class EmbyClient:
             limit: Maximum number of movies to return
             sort_by: Field to sort by (SortName, DateCreated, PremiereDate, etc.)
             sort_order: Sort order (Ascending/Descending)
+            profile: FIELD_PROFILES entry naming the fields to fetch
 
         Returns:
             List of movies with full metadata
         """
-        params = {
-            "IncludeItemTypes": "Movie",
-            "Recursive": "true",
-            "Limit": limit,
-            "SortBy": sort_by,
-            "SortOrder": sort_order,
-            "Fields": "Path,MediaStreams,Overview,Genres,People,CommunityRating,OfficialRating,RunTimeTicks,ProductionYear,PremiereDate,DateCreated",
-        }
+        params = movies_params(limit, sort_by, sort_order, profile)
         result = self._make_request("/emby/Items", params=params)
-        if result and "Items" in result:
-            return result["Items"]
-        return []
+        return extract_items(result)
 
+    def iter_movies(
+        self,
+        sort_by: str = "SortName",
+        sort_order: str = "Ascending",
+        page_size: int = 500,
+        profile: str = "detail",
+    ) -> PagedQuery:
+        """Lazily page through every movie (see iter_query)."""
+        params = movies_params(page_size, sort_by, sort_order, profile)
+        return self.iter_query("/emby/Items", params, page_size=page_size)
 
     def get_libraries(self) -> List[Dict]:
         """
@@ -286,6 +763,7 @@ class EmbyClient:
         include_item_types: str = "Movie",
         start_index: int = 0,
         search_term: Optional[str] = None,
+        profile: str = "detail",
     ) -> List[Dict]:
         """
         Get media items filtered by library with detailed metadata.
@@ -298,32 +776,80 @@ class EmbyClient:
             include_item_types: Comma-separated list of item types (Movie, MusicAlbum, BoxSet, etc.)
             start_index: Starting index for pagination
             search_term: Optional search term
+            profile: FIELD_PROFILES entry naming the fields to fetch
 
         Returns:
             List of items with full metadata
         """
-        params = {
-            "IncludeItemTypes": include_item_types,
-            "Recursive": "true",
-            "Limit": limit,
-            "StartIndex": start_index,
-            "SortBy": sort_by,
-            "SortOrder": sort_order,
-            "Fields": "Path,MediaStreams,Overview,Genres,People,CommunityRating,OfficialRating,RunTimeTicks,ProductionYear,PremiereDate,DateCreated,ParentId,ImageTags",
-        }
+        params = items_by_library_params(
+            parent_id,
+            limit,
+            sort_by,
+            sort_order,
+            include_item_types,
+            start_index,
+            search_term,
+            profile,
+        )
+        result = self._make_request("/emby/Items", params=params)
+        return extract_items(result)
 
-        # Add parent ID filter if specified
-        if parent_id:
-            params["ParentId"] = parent_id
-        
-        # Add search term if specified
-        if search_term:
-            params["SearchTerm"] = search_term
+    def stream_items_by_library(
+        self,
+        parent_id: Optional[str] = None,
+        limit: int = 100,
+        sort_by: str = "SortName",
+        sort_order: str = "Ascending",
+        include_item_types: str = "Movie",
+        start_index: int = 0,
+        search_term: Optional[str] = None,
+        profile: str = "detail",
+    ) -> Optional[ItemStream]:
+        """
+        Like get_items_by_library, but decode items as they download.
+
+        Meant for large pages, which are not worth caching; see
+        stream_query.
+        """
+        params = items_by_library_params(
+            parent_id,
+            limit,
+            sort_by,
+            sort_order,
+            include_item_types,
+            start_index,
+            search_term,
+            profile,
+        )
+        return self.stream_query("/emby/Items", params)
+
+    def iter_items_by_library(
+        self,
+        parent_id: Optional[str] = None,
+        sort_by: str = "SortName",
+        sort_order: str = "Ascending",
+        include_item_types: str = "Movie",
+        search_term: Optional[str] = None,
+        page_size: int = 500,
+        profile: str = "detail",
+    ) -> PagedQuery:
+        """
+        Lazily page through every item of a library (see iter_query).
+
+        Takes the same filters as get_items_by_library, without a limit.
+        """
+        params = items_by_library_params(
+            parent_id,
+            page_size,
+            sort_by,
+            sort_order,
+            include_item_types,
+            0,
+            search_term,
+            profile,
+        )
+        return self.iter_query("/emby/Items", params, page_size=page_size)
 
-        result = self._make_request("/emby/Items", params=params)
-        if result and "Items" in result:
-            return result["Items"]
-        return []
     def get_sessions(self) -> List[Dict]:
         """
         Get all active sessions.
@@ -350,36 +876,56 @@ class EmbyClient:
         Returns:
             List of person items
         """
-        params = {
-            "Limit": limit,
-            "StartIndex": start_index,
-            "SortBy": "SortName",
-            "SortOrder": "Ascending",
-            "Recursive": "true",
-            "Fields": "ImageTags,DateCreated",
-            "ExcludeItemTypes": "Series", 
-        }
-        if search_term:
-            params["SearchTerm"] = search_term
-
+        params = persons_params(limit, start_index, search_term)
         result = self._make_request("/emby/Persons", params=params)
-        if result and "Items" in result:
-            return result["Items"]
-        return []
+        return extract_items(result)
+
+    def iter_persons(
+        self, search_term: Optional[str] = None, page_size: int = 500
+    ) -> PagedQuery:
+        """Lazily page through every person (see iter_query)."""
+        params = persons_params(page_size, 0, search_term)
+        return self.iter_query("/emby/Persons", params, page_size=page_size)
+
+    def get_index_items(
+        self,
+        parent_id: Optional[str] = None,
+        start_index: int = 0,
+        limit: int = 500,
+        ids: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Get a page of items with the fields the search index needs.
+
+        Bypasses the response cache: bulk pages are read once and would
+        only evict the entries the UI relies on.
+
+        Args:
+            parent_id: Library ID to page through (None for all items)
+            start_index: Pagination start
+            limit: Max items
+            ids: Only return these item IDs
+
+        Returns:
+            List of items
+        """
+        params = index_items_params(parent_id, start_index, limit, ids)
+        return extract_items(self._send_request("/emby/Items", params=params))
+
+    def iter_index_items(
+        self, parent_id: Optional[str] = None, page_size: int = 500
+    ) -> PagedQuery:
+        """Lazily page through every item to search-index in a library."""
+        params = index_items_params(parent_id, 0, page_size)
+        # Index pages carry People and Overview; never hold one whole
+        return self.iter_query(
+            "/emby/Items", params, page_size=page_size, stream=True
+        )
 
     def get_person_credits(self, person_id: str) -> List[Dict]:
         """
         Get items where the person appears (credits).
         """
-        params = {
-            "PersonIds": person_id,
-            "IncludeItemTypes": "Movie,Series,MusicAlbum",
-            "Recursive": "true",
-            "Fields": "PrimaryImageAspectRatio,DateCreated,ProductionYear",
-            "SortBy": "ProductionYear",
-            "SortOrder": "Descending"
-        }
+        params = person_credits_params(person_id)
         result = self._make_request("/emby/Items", params=params)
-        if result and "Items" in result:
-            return result["Items"]
-        return []
+        return extract_items(result)
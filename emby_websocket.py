@@ -0,0 +1,193 @@
+"""Emby WebSocket subscription for pushed task, session and library events."""
+
+# Standard library imports
+import json
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode, urlparse, urlunparse
+
+# Third-party imports
+import websocket
+
+
+def websocket_url(server_url: str, api_key: str, device_id: str) -> str:
+    """Build the /embywebsocket URL for an http(s) Emby server URL."""
+    parsed = urlparse(server_url.rstrip("/"))
+    scheme = "wss" if parsed.scheme == "https" else "ws"
+    query = urlencode({"api_key": api_key, "deviceId": device_id})
+    return urlunparse(
+        (scheme, parsed.netloc, f"{parsed.path}/embywebsocket", "", query, "")
+    )
+
+
+class EmbyWebSocket:
+    """
+    Maintain one Emby WebSocket subscription on a background thread.
+
+    After connecting it subscribes to ScheduledTasksInfo and Sessions
+    updates and dispatches every pushed message to the registered
+    handlers. Dropped connections are retried with exponential backoff
+    and jitter until stop() is called.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        on_tasks: Optional[Callable[[List[Dict]], None]] = None,
+        on_sessions: Optional[Callable[[List[Dict]], None]] = None,
+        on_library_changed: Optional[Callable[[Dict], None]] = None,
+        on_connection_change: Optional[Callable[[bool], None]] = None,
+        tasks_interval_ms: int = 1000,
+        sessions_interval_ms: int = 1500,
+        min_backoff: float = 1,
+        max_backoff: float = 60,
+        keepalive_interval: float = 30,
+    ):
+        """
+        Initialize the subscription.
+
+        Args:
+            url: Full ws(s):// URL, see websocket_url()
+            on_tasks: Called with the scheduled task list on each update
+            on_sessions: Called with the session list on each update
+            on_library_changed: Called with LibraryChanged message data
+            on_connection_change: Called with True/False on (dis)connect
+            tasks_interval_ms: Requested ScheduledTasksInfo push interval
+            sessions_interval_ms: Requested Sessions push interval
+            min_backoff: First reconnect delay in seconds
+            max_backoff: Upper bound for the reconnect delay in seconds
+            keepalive_interval: Seconds between KeepAlive messages
+        """
+        self.url = url
+        self.handlers = {
+            "ScheduledTasksInfo": on_tasks,
+            "Sessions": on_sessions,
+            "LibraryChanged": on_library_changed,
+        }
+        self.on_connection_change = on_connection_change
+        self.tasks_interval_ms = tasks_interval_ms
+        self.sessions_interval_ms = sessions_interval_ms
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.keepalive_interval = keepalive_interval
+        self.connected = False
+        self.messages_received = 0
+        self.keepalives_sent = 0
+        self._ws: Optional[websocket.WebSocket] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the subscription thread if it is not running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="emby-websocket", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Close the connection and stop reconnecting."""
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _send(self, ws: websocket.WebSocket, message_type: str, data=""):
+        """Send one Emby message frame."""
+        ws.send(json.dumps({"MessageType": message_type, "Data": data}))
+
+    def _subscribe(self, ws: websocket.WebSocket):
+        """Ask Emby to start pushing task and session updates."""
+        if self.handlers["ScheduledTasksInfo"]:
+            self._send(
+                ws, "ScheduledTasksInfoStart", f"0,{self.tasks_interval_ms}"
+            )
+        if self.handlers["Sessions"]:
+            self._send(ws, "SessionsStart", f"0,{self.sessions_interval_ms}")
+
+    def _set_connected(self, connected: bool):
+        """Record the connection state and notify the listener."""
+        if connected == self.connected:
+            return
+        self.connected = connected
+        if self.on_connection_change:
+            try:
+                self.on_connection_change(connected)
+            except Exception as e:
+                print(f"Error in WebSocket connection handler: {e}")
+
+    def _dispatch(self, raw: str):
+        """Decode one message and call its handler."""
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        self.messages_received += 1
+        message_type = message.get("MessageType")
+        if message_type == "ForceKeepAlive" and message.get("Data"):
+            # Emby asks for keep-alives at half its timeout
+            self.keepalive_interval = max(float(message["Data"]) / 2, 1)
+            if self._ws is not None:
+                self._ws.settimeout(self.keepalive_interval)
+            return
+        handler = self.handlers.get(message_type)
+        if handler:
+            try:
+                handler(message.get("Data"))
+            except Exception as e:
+                print(f"Error handling WebSocket {message_type}: {e}")
+
+    def _run(self):
+        """Connect, pump messages and reconnect with backoff until stopped."""
+        backoff = self.min_backoff
+        while not self._stop.is_set():
+            try:
+                ws = websocket.create_connection(
+                    self.url, timeout=self.keepalive_interval
+                )
+                self._ws = ws
+                self._subscribe(ws)
+                self._set_connected(True)
+                backoff = self.min_backoff
+                last_keepalive = time.monotonic()
+
+                while not self._stop.is_set():
+                    try:
+                        raw = ws.recv()
+                    except websocket.WebSocketTimeoutException:
+                        pass
+                    else:
+                        if not raw:
+                            break
+                        self._dispatch(raw)
+                    # Subscribed pushes arrive faster than the recv
+                    # timeout, so keep-alives are sent by the clock
+                    now = time.monotonic()
+                    if now - last_keepalive >= self.keepalive_interval:
+                        self._send(ws, "KeepAlive")
+                        self.keepalives_sent += 1
+                        last_keepalive = now
+            except (websocket.WebSocketException, OSError) as e:
+                if not self._stop.is_set():
+                    print(f"Emby WebSocket error: {e}")
+            finally:
+                if self._ws is not None:
+                    try:
+                        self._ws.close()
+                    except Exception:
+                        pass
+                    self._ws = None
+                self._set_connected(False)
+
+            # Full jitter keeps many clients from reconnecting in lockstep
+            self._stop.wait(random.uniform(self.min_backoff, backoff))
+            backoff = min(backoff * 2, self.max_backoff)
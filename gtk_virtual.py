@@ -0,0 +1,387 @@
+"""Virtualized GTK list and grid views that only build visible rows."""
+
+# Standard library imports
+import bisect
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+# Third-party imports
+import gi
+
+gi.require_version("Gtk", "3.0")
+gi.require_version("GLib", "2.0")
+# noqa: E402 - gi.require_version must be called before importing from gi
+from gi.repository import GLib, Gtk  # noqa: E402
+
+
+class VirtualView(Gtk.ScrolledWindow):
+    """
+    Scrolled view over a list of items that materializes rows lazily.
+
+    Items are plain Python objects; create_widget(item) builds the widget
+    for one of them. Only items inside the viewport plus an overscan
+    margin have widgets at any time, positioned on a Gtk.Layout sized to
+    the full content height, so the scrollbar behaves as if every row
+    existed. Widgets that leave the margin are destroyed after
+    release_widget(widget) runs, e.g. to cancel a pending thumbnail.
+
+    With a key function, set_items() reconciles instead of rebuilding:
+    built widgets whose item key survives are handed to
+    update_widget(widget, item) and kept if it returns True.
+
+    Subclasses define the geometry (see VirtualList and VirtualGrid).
+    """
+
+    def __init__(
+        self,
+        create_widget: Callable[[Any], Gtk.Widget],
+        release_widget: Optional[Callable[[Gtk.Widget], None]] = None,
+        placeholder: str = "",
+        overscan: float = 0.5,
+        key: Optional[Callable[[Any], Hashable]] = None,
+        update_widget: Optional[Callable[[Gtk.Widget, Any], bool]] = None,
+    ):
+        """
+        Initialize the view.
+
+        Args:
+            create_widget: Builds the widget for one item
+            release_widget: Called before a widget is dropped
+            placeholder: Text shown when there are no items
+            overscan: Pages above and below the viewport to keep built
+            key: Returns a stable identity for an item, e.g. its Id
+            update_widget: Updates a built widget in place for a changed
+                item; returns False if the widget must be rebuilt
+        """
+        super().__init__()
+        self.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        self.create_widget = create_widget
+        self.release_widget = release_widget
+        self.overscan = overscan
+        self.key = key
+        self.update_widget = update_widget
+        self.items: List[Any] = []
+        self._widgets = {}
+        self._width = 0
+        self._update_pending = False
+
+        self.layout = Gtk.Layout()
+        self.add(self.layout)
+        self.placeholder = Gtk.Label(label=placeholder)
+        self.placeholder.set_margin_top(50)
+        self.placeholder.set_margin_bottom(50)
+        self.placeholder.set_no_show_all(True)
+        self.layout.put(self.placeholder, 0, 0)
+
+        self.get_vadjustment().connect(
+            "value-changed", lambda _: self.update()
+        )
+        self.layout.connect("size-allocate", self._on_size_allocate)
+
+    def set_items(self, items: Sequence[Any], reset_scroll: bool = False):
+        """
+        Replace the items shown by the view.
+
+        Args:
+            items: New items, in display order
+            reset_scroll: Scroll back to the top (e.g. for a new search)
+        """
+        items = list(items)
+        moved = {}
+        if self.key is not None:
+            new_index = {self.key(item): i for i, item in enumerate(items)}
+            for old, item in enumerate(self.items):
+                index = new_index.get(self.key(item))
+                if index is not None:
+                    moved[old] = index
+
+        # Keep built widgets whose item survived and could be updated
+        kept = {}
+        for old in list(self._widgets):
+            index = moved.get(old)
+            if (
+                index is not None
+                and self.update_widget is not None
+                and self.update_widget(self._widgets[old], items[index])
+            ):
+                kept[index] = self._widgets.pop(old)
+        self.clear_widgets()
+        self._widgets = kept
+
+        self.items = items
+        self._reset_geometry(moved)
+        if self._width:
+            for index, widget in kept.items():
+                self._measure(index, widget, self._width)
+        if reset_scroll:
+            self.get_vadjustment().set_value(0)
+        self.placeholder.set_visible(not self.items)
+        self.update()
+
+    def extend_items(self, items: Sequence[Any]):
+        """
+        Append items, keeping every built widget and the scroll position.
+
+        Args:
+            items: Items to add after the current ones
+        """
+        start = len(self.items)
+        self.items.extend(items)
+        self._extend_geometry(start)
+        self.placeholder.set_visible(not self.items)
+        self._queue_update()
+
+    def clear_widgets(self):
+        """Release and destroy every materialized widget."""
+        for index in list(self._widgets):
+            self._drop(index)
+
+    def visible_widgets(self):
+        """Return {item index: widget} for the materialized rows."""
+        return dict(self._widgets)
+
+    def update(self):
+        """Build rows that entered the viewport and drop those that left."""
+        self._update_pending = False
+        width = self.layout.get_allocated_width()
+        if width <= 1:
+            # Not allocated yet; size-allocate schedules the first pass
+            return False
+        if width != self._width:
+            self._width = width
+            self._on_width_changed(width)
+            self.placeholder.set_size_request(width, -1)
+
+        adjustment = self.get_vadjustment()
+        page = adjustment.get_page_size() or self.get_allocated_height()
+        view_top = adjustment.get_value()
+        view_bottom = view_top + page
+        margin = page * self.overscan
+
+        wanted = self._range(view_top - margin, view_bottom + margin)
+        for index in list(self._widgets):
+            if index not in wanted:
+                self._drop(index)
+
+        # Build rows inside the viewport first so they queue work first
+        in_view = self._range(view_top, view_bottom)
+        order = [i for i in wanted if i in in_view]
+        order += [i for i in wanted if i not in in_view]
+        resized = False
+        for index in order:
+            if index not in self._widgets:
+                widget = self.create_widget(self.items[index])
+                widget.show_all()
+                self._widgets[index] = widget
+                self.layout.put(widget, 0, 0)
+                resized |= self._measure(index, widget, width)
+
+        for index, widget in self._widgets.items():
+            x, y, cell_width, cell_height = self._geometry(index)
+            widget.set_size_request(cell_width, cell_height)
+            self.layout.move(widget, x, y)
+        self.layout.set_size(width, max(self._content_height(), 1))
+        if resized:
+            # Measured rows moved their neighbours; fill any gap left
+            self._queue_update()
+        return False
+
+    def _queue_update(self):
+        """Run update() once from the main loop."""
+        if not self._update_pending:
+            self._update_pending = True
+            GLib.idle_add(self.update)
+
+    def _on_size_allocate(self, layout, allocation):
+        """Re-layout after the view is resized."""
+        if allocation.width != self._width:
+            self._queue_update()
+
+    def _drop(self, index: int):
+        """Release and destroy the widget for one item."""
+        widget = self._widgets.pop(index)
+        if self.release_widget:
+            self.release_widget(widget)
+        self.layout.remove(widget)
+        widget.destroy()
+
+    # Geometry hooks
+
+    def _reset_geometry(self, moved: Dict[int, int]):
+        """Carry per-item geometry over to new indices after set_items()."""
+
+    def _extend_geometry(self, start: int):
+        """Add geometry for the items appended from index start."""
+
+    def _on_width_changed(self, width: int):
+        """Recompute geometry that depends on the view width."""
+
+    def _measure(self, index: int, widget: Gtk.Widget, width: int) -> bool:
+        """Record the real size of a built widget; True if it changed."""
+        return False
+
+    def _range(self, top: float, bottom: float) -> range:
+        """Return the indices of items overlapping [top, bottom]."""
+        raise NotImplementedError
+
+    def _geometry(self, index: int):
+        """Return (x, y, width, height) of an item's widget."""
+        raise NotImplementedError
+
+    def _content_height(self) -> int:
+        """Return the total height of all rows."""
+        raise NotImplementedError
+
+
+class VirtualList(VirtualView):
+    """
+    Single-column virtual view with variable row heights.
+
+    Rows that have not been built yet are assumed to be estimated_height
+    tall; each row's natural height is measured when it is built, so the
+    scrollbar converges on the real content height while scrolling.
+    """
+
+    def __init__(
+        self,
+        create_widget: Callable[[Any], Gtk.Widget],
+        estimated_height: int = 80,
+        spacing: int = 0,
+        **kwargs,
+    ):
+        """
+        Initialize the list.
+
+        Args:
+            create_widget: Builds the widget for one item
+            estimated_height: Assumed height of rows not built yet
+            spacing: Vertical gap between rows
+            **kwargs: See VirtualView
+        """
+        self.estimated_height = estimated_height
+        self.spacing = spacing
+        self._heights: List[int] = []
+        self._offsets: List[int] = [0]
+        self._offsets_stale = False
+        super().__init__(create_widget, **kwargs)
+
+    def _reset_geometry(self, moved: Dict[int, int]):
+        heights = [self.estimated_height] * len(self.items)
+        for old, index in moved.items():
+            heights[index] = self._heights[old]
+        self._heights = heights
+        self._rebuild_offsets()
+
+    def _extend_geometry(self, start: int):
+        # Bring the existing offsets up to date before adding rows, or a
+        # rebuild would already cover the new rows and they get appended twice
+        total = self._current_offsets()[-1]
+        added = len(self.items) - start
+        self._heights.extend([self.estimated_height] * added)
+        for height in self._heights[start:]:
+            total += height + self.spacing
+            self._offsets.append(total)
+
+    def _rebuild_offsets(self):
+        """Recompute each row's top edge from the row heights."""
+        offsets = [0]
+        total = 0
+        for height in self._heights:
+            total += height + self.spacing
+            offsets.append(total)
+        self._offsets = offsets
+        self._offsets_stale = False
+
+    def _current_offsets(self) -> List[int]:
+        """Return row offsets, rebuilding them once after measurements."""
+        if self._offsets_stale:
+            self._rebuild_offsets()
+        return self._offsets
+
+    def _on_width_changed(self, width: int):
+        # Wrapped labels change height with the width; re-measure
+        for index, widget in self._widgets.items():
+            self._measure(index, widget, width)
+
+    def _measure(self, index: int, widget: Gtk.Widget, width: int) -> bool:
+        widget.set_size_request(width, -1)
+        _, natural = widget.get_preferred_height_for_width(width)
+        if natural == self._heights[index]:
+            return False
+        self._heights[index] = natural
+        self._offsets_stale = True
+        return True
+
+    def _range(self, top: float, bottom: float) -> range:
+        offsets = self._current_offsets()
+        first = max(bisect.bisect_right(offsets, top) - 1, 0)
+        last = min(bisect.bisect_left(offsets, bottom), len(self.items))
+        return range(min(first, last), last)
+
+    def _geometry(self, index: int):
+        offsets = self._current_offsets()
+        return 0, offsets[index], self._width, self._heights[index]
+
+    def _content_height(self) -> int:
+        return self._current_offsets()[-1]
+
+
+class VirtualGrid(VirtualView):
+    """
+    Virtual grid of fixed-size cells, wrapping to the view width.
+
+    Cells are laid out row by row like a homogeneous Gtk.FlowBox, with as
+    many columns as fit and the grid centered horizontally.
+    """
+
+    def __init__(
+        self,
+        create_widget: Callable[[Any], Gtk.Widget],
+        cell_width: int,
+        cell_height: int,
+        spacing: int = 0,
+        **kwargs,
+    ):
+        """
+        Initialize the grid.
+
+        Args:
+            create_widget: Builds the widget for one item
+            cell_width: Width of every cell
+            cell_height: Height of every cell
+            spacing: Gap between cells in both directions
+            **kwargs: See VirtualView
+        """
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.spacing = spacing
+        self._columns = 1
+        self._left = 0
+        super().__init__(create_widget, **kwargs)
+
+    def _on_width_changed(self, width: int):
+        step = self.cell_width + self.spacing
+        self._columns = max((width + self.spacing) // step, 1)
+        used = self._columns * step - self.spacing
+        self._left = max((width - used) // 2, 0)
+
+    def _range(self, top: float, bottom: float) -> range:
+        step = self.cell_height + self.spacing
+        first_row = max(int(top // step), 0)
+        last_row = max(int(bottom // step) + 1, 0)
+        return range(
+            min(first_row * self._columns, len(self.items)),
+            min(last_row * self._columns, len(self.items)),
+        )
+
+    def _geometry(self, index: int):
+        row, column = divmod(index, self._columns)
+        return (
+            self._left + column * (self.cell_width + self.spacing),
+            row * (self.cell_height + self.spacing),
+            self.cell_width,
+            self.cell_height,
+        )
+
+    def _content_height(self) -> int:
+        rows = -(-len(self.items) // self._columns)
+        return max(rows * (self.cell_height + self.spacing) - self.spacing, 0)
@@ -0,0 +1,231 @@
+"""Content-addressed on-disk cache for proxied Emby images."""
+
+# Standard library imports
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+
+def default_cache_dir() -> str:
+    """Return the per-user image cache directory (XDG cache home)."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "emby-assistant", "images")
+
+
+class ImageCache:
+    """
+    Size-bounded LRU cache of image bodies stored on disk.
+
+    Each entry is a body file plus a small JSON sidecar with its metadata
+    (content type), both named after a SHA-256 key of the request. Files
+    are written atomically, so a crash never leaves a truncated image in
+    the cache. Recency is kept in memory and persisted through the body
+    file's mtime, which rebuilds the LRU order on startup.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache, indexing any entries already on disk.
+
+        Args:
+            directory: Cache directory, created if missing
+            max_bytes: Total body size kept before LRU eviction
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(
+        item_id: str,
+        image_type: str,
+        size: int,
+        tag: str,
+        image_format: str = "",
+    ) -> str:
+        """Build the content address for one image variant."""
+        raw = f"{item_id}\0{image_type}\0{size}\0{tag}\0{image_format}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Return the body path for a key (sharded by its first byte)."""
+        return os.path.join(self.directory, key[:2], key)
+
+    def _load_index(self):
+        """Rebuild the LRU index from the files on disk, oldest first."""
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith((".json", ".tmp")):
+                    continue
+                if not os.path.exists(entry.path + ".json"):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Look up an image.
+
+        Returns:
+            (body path, metadata dict) on a hit, otherwise None
+        """
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+        path = self._path(key)
+        try:
+            with open(path + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self._remove(key)
+            return None
+        return path, meta
+
+    def put(self, key: str, content: bytes, meta: Dict) -> str:
+        """
+        Store an image body and its metadata, evicting LRU entries if full.
+
+        Returns:
+            Path of the stored body file
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._write_atomic(path, content)
+        self._commit(key, len(content), meta)
+        return path
+
+    def tee(
+        self, key: str, chunks: Iterable[bytes], meta: Dict
+    ) -> Iterator[bytes]:
+        """
+        Yield chunks unchanged while writing them into the cache.
+
+        The entry is only committed once the stream has been consumed to
+        the end; an abandoned or failed stream leaves nothing behind. A
+        disk error stops caching but never interrupts the stream.
+        """
+        path = self._path(key)
+        tmp_file = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), suffix=".tmp"
+            )
+            tmp_file = os.fdopen(fd, "wb")
+        except OSError:
+            pass
+
+        size = 0
+        complete = False
+        try:
+            for chunk in chunks:
+                if tmp_file is not None:
+                    try:
+                        tmp_file.write(chunk)
+                    except OSError:
+                        tmp_file.close()
+                        os.unlink(tmp_path)
+                        tmp_file = None
+                size += len(chunk)
+                yield chunk
+            complete = True
+        finally:
+            if tmp_file is not None:
+                tmp_file.close()
+                try:
+                    if complete:
+                        os.replace(tmp_path, path)
+                        self._commit(key, size, meta)
+                    else:
+                        os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def _commit(self, key: str, size: int, meta: Dict):
+        """Write the metadata sidecar and add a stored body to the index."""
+        self._write_atomic(
+            self._path(key) + ".json", json.dumps(meta).encode("utf-8")
+        )
+        with self._lock:
+            self.total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self._evict()
+
+    def _write_atomic(self, path: str, data: bytes):
+        """Write data to a temp file next to path, then rename it in place."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes."""
+        while self.total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            self._unlink(key)
+
+    def _remove(self, key: str):
+        """Forget and delete a single entry."""
+        with self._lock:
+            size = self._index.pop(key, None)
+            if size is None:
+                return
+            self.total_bytes -= size
+        self._unlink(key)
+
+    def _unlink(self, key: str):
+        """Delete an entry's body and sidecar files if present."""
+        path = self._path(key)
+        for file_path in (path, path + ".json"):
+            try:
+                os.unlink(file_path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current disk usage."""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
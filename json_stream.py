@@ -0,0 +1,163 @@
+"""Incremental decoding of the Items array of large Emby responses."""
+
+# Standard library imports
+import codecs
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+_WHITESPACE = " \t\n\r"
+
+# Consumed text is dropped from the buffer once this much has piled up
+_COMPACT_AT = 64 * 1024
+
+
+class ItemStream:
+    """
+    Iterate the items of an Emby query result while its body downloads.
+
+    The body is decoded one array element at a time from byte chunks, so
+    the first item is usable as soon as it has arrived and memory holds
+    one item plus the undecoded tail of the last chunk, regardless of the
+    page size. Other top-level keys (TotalRecordCount, ...) are collected
+    into fields as they are passed; Emby sends them after Items, so they
+    are complete once iteration ends. A bare top-level array is streamed
+    the same way.
+
+    A truncated or malformed body ends iteration early with complete left
+    False, like a failed request elsewhere in the client.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        close: Optional[Callable[[], None]] = None,
+        array_key: str = "Items",
+    ):
+        """
+        Initialize the stream; nothing is read until iteration starts.
+
+        Args:
+            chunks: Raw (already content-decoded) body chunks
+            close: Called once when iteration ends, e.g. response.close
+            array_key: Top-level key of the array to stream
+        """
+        self.array_key = array_key
+        self.fields: Dict[str, Any] = {}
+        self.count = 0
+        self.complete = False
+        self._chunks = iter(chunks)
+        self._close = close
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            for item in self._parse():
+                self.count += 1
+                yield item
+            self.complete = True
+        except (ValueError, OSError) as e:
+            print(f"Error decoding streamed response: {e}")
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the underlying response."""
+        if self._close is not None:
+            close, self._close = self._close, None
+            close()
+
+    def _parse(self) -> Iterator[Any]:
+        """Walk the top-level value, yielding elements of the item array."""
+        if self._peek() == "[":
+            yield from self._array()
+            return
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == self.array_key and self._peek() == "[":
+                yield from self._array()
+            else:
+                self.fields[key] = self._value()
+            if self._next_char() == "}":
+                return
+            self._pos -= 1
+            self._expect(",")
+
+    def _array(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the cursor."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._next_char() == "]":
+                return
+            self._pos -= 1
+            self._expect(",")
+
+    def _value(self) -> Any:
+        """Decode one complete JSON value at the cursor."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number ending at the buffer edge may continue in the next
+            # chunk; decode it again once more text has arrived
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            buffer = self._buffer
+            while self._pos < len(buffer) and buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buffer):
+                return buffer[self._pos]
+            if not self._fill():
+                raise ValueError("unexpected end of response body")
+
+    def _next_char(self) -> str:
+        """Consume and return the next non-whitespace character."""
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, char: str):
+        """Consume the next non-whitespace character, which must be char."""
+        found = self._next_char()
+        if found != char:
+            raise ValueError(
+                f"expected {char!r} at offset {self._pos - 1}, got {found!r}"
+            )
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; False at end of body."""
+        if self._eof:
+            return False
+        if self._pos >= _COMPACT_AT:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._eof = True
+        self._buffer += self._text.decode(b"", final=True)
+        return False
@@ -0,0 +1,121 @@
+"""Lazy page-by-page iteration over Emby query results."""
+
+# Standard library imports
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Local imports
+from json_stream import ItemStream
+
+
+class PagedQuery:
+    """
+    Iterate every item of an Emby query, one StartIndex/Limit page at a
+    time.
+
+    Only the current page and, with prefetch, the next one are held in
+    memory, so a 100k-item library streams at constant memory. While the
+    caller works through a page, the next one is already being fetched on
+    a background thread. Iteration ends at the first short or empty page,
+    at TotalRecordCount, or when a page fails to load; complete tells the
+    last two cases apart.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], Optional[Dict]],
+        page_size: int = 500,
+        prefetch: bool = True,
+        start_index: int = 0,
+    ):
+        """
+        Initialize the query; nothing is fetched until iteration starts.
+
+        Args:
+            fetch_page: Returns the raw query result (with Items and
+                TotalRecordCount) or an ItemStream over it for
+                (start_index, limit), or None on error
+            page_size: Items requested per page
+            prefetch: Fetch the next page while the current one is consumed
+            start_index: Index of the first item to return
+        """
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.start_index = start_index
+        self.total_record_count: Optional[int] = None
+        self.complete = False
+
+    def __iter__(self) -> Iterator[Dict]:
+        pages = self._pages()
+        try:
+            for page in pages:
+                yield from page
+        finally:
+            pages.close()
+
+    def pages(self) -> Iterator[List[Dict]]:
+        """
+        Yield the items page by page.
+
+        total_record_count is set once the first page has arrived.
+        Closing the iterator early cancels the prefetched page.
+        """
+        pages = self._pages()
+        try:
+            for page in pages:
+                yield list(page)
+        finally:
+            pages.close()
+
+    def _pages(self) -> Iterator[Iterable[Dict]]:
+        """
+        Yield each page's items; every page must be consumed in full.
+
+        fetch_page may also return an ItemStream, whose items are decoded
+        while they download. Its TotalRecordCount is only known once the
+        page has been read, so the next page is requested after that.
+        """
+        self.complete = False
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        start = self.start_index
+        pending = self._submit(executor, start)
+        result = None
+        try:
+            while True:
+                result = pending.result() if executor else pending()
+                if result is None:
+                    return
+                if isinstance(result, ItemStream):
+                    yield result
+                    if not result.complete:
+                        return
+                    count, fields = result.count, result.fields
+                else:
+                    items = result.get("Items") or []
+                    count, fields = len(items), result
+                total = fields.get("TotalRecordCount")
+                if total is not None:
+                    self.total_record_count = total
+                start += count
+                more = count >= self.page_size and (
+                    total is None or start < total
+                )
+                if more:
+                    pending = self._submit(executor, start)
+                if not isinstance(result, ItemStream) and items:
+                    yield items
+                if not more:
+                    self.complete = True
+                    return
+        finally:
+            if isinstance(result, ItemStream):
+                result.close()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, executor: Optional[ThreadPoolExecutor], start: int):
+        """Start fetching the page at start (or defer it without prefetch)."""
+        if executor is None:
+            return lambda: self.fetch_page(start, self.page_size)
+        return executor.submit(self.fetch_page, start, self.page_size)
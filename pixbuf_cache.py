@@ -0,0 +1,88 @@
+"""In-memory LRU cache of decoded, scaled thumbnails for the GTK app."""
+
+# Standard library imports
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def pixbuf_size(pixbuf) -> int:
+    """Return the pixel buffer size of a GdkPixbuf in bytes."""
+    return pixbuf.get_byte_length()
+
+
+class PixbufCache:
+    """
+    Thread-safe LRU of scaled pixbufs bounded by their total byte size.
+
+    Keys are (item id, size, image tag) so a changed image (new tag) or a
+    different display size never returns a stale pixbuf. Pixbufs are
+    immutable once scaled, so the same object can be shown in several
+    Gtk.Image widgets at once.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        size_of: Callable[[Any], int] = pixbuf_size,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total pixel memory kept before LRU eviction
+            size_of: Returns the memory cost of a cached value
+        """
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached pixbuf for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, pixbuf: Any):
+        """Cache a pixbuf, evicting least recently used ones if over budget."""
+        size = self.size_of(pixbuf)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (pixbuf, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached pixbuf."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current memory use."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
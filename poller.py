@@ -0,0 +1,162 @@
+"""Background poller that owns a versioned snapshot of Emby state."""
+
+# Standard library imports
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+# Local imports
+from emby_client import EmbyClient
+
+
+class EmbyPoller:
+    """
+    Refresh Emby state on a background thread and serve it from memory.
+
+    Each source (system info, scheduled tasks, sessions) is fetched on its
+    own interval. Readers get the latest value together with a version
+    number that only increases when the value actually changes, so
+    callers can cheaply memoize anything derived from it. Sources marked
+    as pushed (e.g. fed by the Emby WebSocket) are not polled until the
+    push feed drops again.
+    """
+
+    def __init__(
+        self,
+        client: EmbyClient,
+        processing_interval: float = 5,
+        status_interval: float = 30,
+    ):
+        """
+        Initialize the poller.
+
+        Args:
+            client: Emby client used for upstream requests
+            processing_interval: Seconds between task and session refreshes
+            status_interval: Seconds between system info refreshes
+        """
+        self.client = client
+        self.sources: Dict[str, Tuple[Callable[[], Any], float]] = {
+            "system_info": (client.get_system_info, status_interval),
+            "tasks": (client.get_scheduled_tasks, processing_interval),
+            "sessions": (client.get_sessions, processing_interval),
+        }
+        self.version = 0
+        self._data: Dict[str, Any] = {name: None for name in self.sources}
+        self._versions: Dict[str, int] = {name: 0 for name in self.sources}
+        self._next_due: Dict[str, float] = {name: 0.0 for name in self.sources}
+        self._pushed: Set[str] = set()
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background refresh thread if it is not running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="emby-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def refresh(self, name: str):
+        """Fetch one source from Emby now and publish the result."""
+        fetch, interval = self.sources[name]
+        try:
+            value = fetch()
+        except Exception as e:
+            print(f"Error refreshing {name}: {e}")
+            value = None
+        self._next_due[name] = time.monotonic() + interval
+        self.update(name, value)
+
+    def set_pushed(
+        self, active: bool, names: Iterable[str] = ("tasks", "sessions")
+    ):
+        """
+        Mark sources as pushed or polled.
+
+        While active, the named sources are only updated via update().
+        When the push feed drops they are polled again immediately.
+        """
+        with self._condition:
+            if active:
+                self._pushed.update(names)
+            else:
+                self._pushed.difference_update(names)
+                for name in names:
+                    self._next_due[name] = 0.0
+        self._wake.set()
+
+    def update(self, name: str, value: Any):
+        """
+        Publish a new value for a source.
+
+        The source and global versions are only bumped when the value
+        differs from the current one; waiters are woken either way.
+        """
+        with self._condition:
+            first_load = self._versions[name] == 0
+            if first_load or value != self._data[name]:
+                self._data[name] = value
+                self.version += 1
+                self._versions[name] = self.version
+            self._condition.notify_all()
+
+    def get(self, name: str) -> Tuple[Any, int]:
+        """
+        Return (value, version) for a source.
+
+        A source that has never been loaded is fetched synchronously once,
+        so the first request after startup still gets real data.
+        """
+        if self._versions[name] == 0:
+            self.refresh(name)
+        with self._condition:
+            return self._data[name], self._versions[name]
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """
+        Block until the global version moves past version or timeout.
+
+        Returns:
+            The current global version
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.version != version, timeout=timeout
+            )
+            return self.version
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all current values plus the global version."""
+        with self._condition:
+            snapshot = dict(self._data)
+            snapshot["version"] = self.version
+            return snapshot
+
+    def _run(self):
+        """Refresh each source when due until stopped."""
+        while not self._stop.is_set():
+            self._wake.clear()
+            now = time.monotonic()
+            polled = [name for name in self.sources if name not in self._pushed]
+            due = [name for name in polled if self._next_due[name] <= now]
+            # Sources due together (e.g. all of them at startup) are
+            # fetched concurrently rather than one after another
+            self.client.fan_out(
+                {name: (lambda name=name: self.refresh(name)) for name in due}
+            )
+            next_due = min(
+                (self._next_due[name] for name in polled), default=now + 1
+            )
+            self._wake.wait(max(next_due - time.monotonic(), 0.1))
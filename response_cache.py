@@ -0,0 +1,130 @@
+"""In-process TTL response cache shared by Emby client callers."""
+
+# Standard library imports
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+# Per-endpoint time-to-live policies in seconds. The first matching
+# pattern wins; endpoints that match nothing are not cached.
+DEFAULT_TTL_POLICIES = (
+    # Live state: short enough that progress bars still move
+    (r"^/emby/ScheduledTasks", 1),
+    (r"^/emby/Sessions$", 1),
+    (r"^/emby/System/ActivityLog/", 10),
+    # Library listings change only when the library is rescanned
+    (r"^/emby/Items$", 30),
+    (r"^/emby/Persons$", 300),
+    (r"^/emby/Library/VirtualFolders$", 300),
+    # Server metadata
+    (r"^/emby/System/Info$", 120),
+    (r"^/emby/System/Endpoint$", 300),
+    # Users and item/person details
+    (r"^/emby/Users$", 3600),
+    (r"^/emby/Users/[^/]+/Items/[^/]+$", 3600),
+    (r"^/emby/Items/[^/]+$", 3600),
+)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of decoded Emby responses with per-endpoint TTLs.
+
+    Cached values are shared between callers and must be treated as
+    read-only; copy a result before mutating it.
+    """
+
+    def __init__(
+        self,
+        policies: Iterable[Tuple[str, float]] = DEFAULT_TTL_POLICIES,
+        max_entries: int = 512,
+        clock=time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            policies: (regex, ttl seconds) pairs matched against endpoints
+            max_entries: Maximum number of cached responses before the
+                least recently used entry is evicted
+            clock: Monotonic time source, injectable for benchmarks
+        """
+        self.policies = [
+            (re.compile(pattern), ttl) for pattern, ttl in policies
+        ]
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL for an endpoint, or 0 if it is not cacheable."""
+        for pattern, ttl in self.policies:
+            if pattern.search(endpoint):
+                return ttl
+        return 0
+
+    @staticmethod
+    def make_key(
+        method: str, endpoint: str, params: Optional[Dict] = None
+    ) -> Hashable:
+        """Build a cache key from the request method, endpoint and params."""
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return (method.upper(), endpoint, items)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+
+        Returns:
+            (True, value) on a fresh hit, otherwise (False, None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """Store a value for ttl seconds, evicting LRU entries if full."""
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, endpoint_prefix: Optional[str] = None):
+        """Drop all entries, or only those whose endpoint has the prefix."""
+        with self._lock:
+            if endpoint_prefix is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[1].startswith(endpoint_prefix)]:
+                del self._entries[key]
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,550 @@
+"""Local full-text search index over the Emby library."""
+
+# Standard library imports
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Relative weight of a term by the field it came from
+FIELD_WEIGHTS = {
+    "Name": 10.0,
+    "OriginalTitle": 8.0,
+    "SeriesName": 6.0,
+    "People": 4.0,
+    "Genres": 3.0,
+    "Overview": 1.0,
+}
+
+# Fields whose terms are also matched with one typo. Overview terms are
+# left out: they would multiply the size of the deletes table.
+FUZZY_FIELDS = ("Name", "OriginalTitle", "SeriesName", "People")
+
+# Item fields kept per document and returned by search()
+SUMMARY_FIELDS = (
+    "Id",
+    "Name",
+    "Type",
+    "ProductionYear",
+    "CommunityRating",
+    "ImageTags",
+    "SeriesName",
+    "LibraryId",
+)
+
+# Score multipliers by how a query token matched an indexed term
+MATCH_EXACT = 1.0
+MATCH_PREFIX = 0.6
+MATCH_FUZZY = 0.4
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and strip accents, so "Amélie" matches "amelie"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        c for c in decomposed if not unicodedata.combining(c)
+    ).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized word tokens."""
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def field_texts(item: Dict) -> Iterator[Tuple[str, str]]:
+    """Yield (field name, text) for every searchable value of an item."""
+    for field in ("Name", "OriginalTitle", "SeriesName", "Overview"):
+        value = item.get(field)
+        if value:
+            yield field, value
+    for genre in item.get("Genres") or ():
+        yield "Genres", genre
+    for person in item.get("People") or ():
+        if person.get("Name"):
+            yield "People", person["Name"]
+
+
+def single_deletes(term: str) -> Set[str]:
+    """Return every string obtained by deleting one character of term."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by at most one edit (incl. a transposition)."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and a[diffs[0]] == b[diffs[1]]
+            and a[diffs[1]] == b[diffs[0]]
+        )
+    if len(a) > len(b):
+        a, b = b, a
+    # b has one extra character; find it and compare the rest
+    for i in range(len(a)):
+        if a[i] != b[i]:
+            return a[i:] == b[i + 1:]
+    return True
+
+
+class SearchIndex:
+    """
+    Thread-safe inverted index of library items with prefix and fuzzy
+    matching.
+
+    Every query token must match (AND). A token matches indexed terms
+    exactly, within one edit when the word itself is not indexed
+    (SymSpell-style lookups in a table of single-character deletes) and,
+    for the last token of the query, by prefix through a sorted term
+    list, so results update while typing.
+    Documents are ranked by the summed field weights of their best
+    match per token.
+    """
+
+    def __init__(
+        self,
+        fuzzy_min_length: int = 4,
+        prefix_min_length: int = 2,
+        max_prefix_terms: int = 64,
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            fuzzy_min_length: Shortest query token matched with a typo
+            prefix_min_length: Shortest query token matched as a prefix
+            max_prefix_terms: Most indexed terms a prefix expands to
+        """
+        self.fuzzy_min_length = fuzzy_min_length
+        self.prefix_min_length = prefix_min_length
+        self.max_prefix_terms = max_prefix_terms
+        self.loaded = False
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Dict] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_fuzzy: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._fuzzy_refs: Dict[str, int] = {}
+        self._deletes: Dict[str, Set[str]] = {}
+        self._sorted_terms: List[str] = []
+        self._sorted_stale = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def load(self, items: Iterable[Dict]):
+        """Add many items, sorting the term list once at the end."""
+        with self._lock:
+            self._sorted_stale = True
+            for item in items:
+                self._add(item)
+
+    def add(self, item: Dict):
+        """Index an item, replacing any earlier version with the same Id."""
+        with self._lock:
+            self._add(item)
+
+    def remove(self, item_id: str):
+        """Drop an item from the index if present."""
+        with self._lock:
+            self._remove(item_id)
+
+    def swap(self, other: "SearchIndex"):
+        """Take over the contents of a freshly built index atomically."""
+        with other._lock:
+            # Sort outside our lock so searches are not held up
+            if other._sorted_stale:
+                other._sorted_terms = sorted(other._postings)
+                other._sorted_stale = False
+        with self._lock, other._lock:
+            for name in (
+                "_docs",
+                "_doc_terms",
+                "_doc_fuzzy",
+                "_postings",
+                "_fuzzy_refs",
+                "_deletes",
+                "_sorted_terms",
+                "_sorted_stale",
+            ):
+                setattr(self, name, getattr(other, name))
+            self.loaded = True
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        """Return the stored summary of an item, or None."""
+        with self._lock:
+            doc = self._docs.get(item_id)
+            return dict(doc) if doc is not None else None
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        item_types: Optional[Iterable[str]] = None,
+        library_id: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Find items matching every token of query.
+
+        Args:
+            query: Free text typed by the user
+            limit: Maximum number of results
+            item_types: Only return these Types (case-insensitive)
+            library_id: Only return items of this library
+
+        Returns:
+            Item summaries (see SUMMARY_FIELDS), best match first
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        types = {t.lower() for t in item_types} if item_types else None
+
+        with self._lock:
+            if self._sorted_stale:
+                self._sorted_terms = sorted(self._postings)
+                self._sorted_stale = False
+
+            expanded = [
+                self._expand(token, position == len(tokens) - 1)
+                for position, token in enumerate(tokens)
+            ]
+            # Start from the most selective token to keep candidates few
+            expanded.sort(
+                key=lambda matches: sum(
+                    len(self._postings[term]) for term in matches
+                )
+            )
+            scores: Optional[Dict[str, float]] = None
+            for matches in expanded:
+                scores = self._score(matches, scores)
+                if not scores:
+                    return []
+
+            candidates = scores
+            if types is not None or library_id is not None:
+                docs = self._docs
+                candidates = [
+                    doc_id
+                    for doc_id in scores
+                    if (
+                        types is None
+                        or docs[doc_id].get("Type", "").lower() in types
+                    )
+                    and (
+                        library_id is None
+                        or docs[doc_id].get("LibraryId") == library_id
+                    )
+                ]
+            best = heapq.nlargest(limit, candidates, key=scores.__getitem__)
+            return [dict(self._docs[doc_id]) for doc_id in best]
+
+    def stats(self) -> Dict:
+        """Return document and vocabulary counts."""
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "fuzzy_terms": len(self._fuzzy_refs),
+            }
+
+    def _expand(self, token: str, is_last: bool) -> Dict[str, float]:
+        """Return {indexed term: match factor} for one query token."""
+        matches: Dict[str, float] = {}
+        # Typo matching only kicks in for words the library does not have
+        if token not in self._postings and len(token) >= self.fuzzy_min_length:
+            candidates: Set[str] = set()
+            for variant in single_deletes(token) | {token}:
+                candidates |= self._deletes.get(variant, set())
+            for term in candidates:
+                if within_one_edit(token, term):
+                    matches[term] = MATCH_FUZZY
+
+        if is_last and len(token) >= self.prefix_min_length:
+            start = bisect.bisect_left(self._sorted_terms, token)
+            for term in self._sorted_terms[start:start + self.max_prefix_terms]:
+                if not term.startswith(token):
+                    break
+                matches[term] = max(matches.get(term, 0), MATCH_PREFIX)
+
+        if token in self._postings:
+            matches[token] = MATCH_EXACT
+        return matches
+
+    def _score(
+        self, matches: Dict[str, float], scores: Optional[Dict[str, float]]
+    ) -> Dict[str, float]:
+        """Intersect the running scores with the docs matching one token."""
+        postings_size = sum(len(self._postings[t]) for t in matches)
+        if scores is not None and len(scores) * len(matches) < postings_size:
+            # Few candidates left: probe postings per candidate instead
+            lists = [(self._postings[term], f) for term, f in matches.items()]
+            if len(lists) == 1:
+                postings, factor = lists[0]
+                return {
+                    doc_id: score + postings[doc_id] * factor
+                    for doc_id, score in scores.items()
+                    if doc_id in postings
+                }
+            narrowed = {}
+            for doc_id, score in scores.items():
+                best = 0
+                for postings, factor in lists:
+                    weight = postings.get(doc_id)
+                    if weight is not None and weight * factor > best:
+                        best = weight * factor
+                if best:
+                    narrowed[doc_id] = score + best
+            return narrowed
+
+        token_scores: Dict[str, float] = {}
+        for term, factor in matches.items():
+            for doc_id, weight in self._postings[term].items():
+                value = weight * factor
+                if value > token_scores.get(doc_id, 0):
+                    token_scores[doc_id] = value
+        if scores is None:
+            return token_scores
+        return {
+            doc_id: scores[doc_id] + value
+            for doc_id, value in token_scores.items()
+            if doc_id in scores
+        }
+
+    def _add(self, item: Dict):
+        """Index an item; the caller holds the lock."""
+        item_id = item.get("Id")
+        if not item_id:
+            return
+        if item_id in self._docs:
+            self._remove(item_id)
+
+        terms: Dict[str, float] = {}
+        fuzzy: Set[str] = set()
+        for field, text in field_texts(item):
+            weight = FIELD_WEIGHTS[field]
+            for term in tokenize(text):
+                if weight > terms.get(term, 0):
+                    terms[term] = weight
+                if field in FUZZY_FIELDS and len(term) >= self.fuzzy_min_length:
+                    fuzzy.add(term)
+
+        self._docs[item_id] = {
+            field: item[field] for field in SUMMARY_FIELDS if field in item
+        }
+        self._doc_terms[item_id] = terms
+        self._doc_fuzzy[item_id] = fuzzy
+        for term, weight in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if not self._sorted_stale:
+                    bisect.insort(self._sorted_terms, term)
+            postings[item_id] = weight
+        for term in fuzzy:
+            refs = self._fuzzy_refs.get(term, 0)
+            self._fuzzy_refs[term] = refs + 1
+            if refs == 0:
+                for variant in single_deletes(term) | {term}:
+                    self._deletes.setdefault(variant, set()).add(term)
+
+    def _remove(self, item_id: str):
+        """Unindex an item; the caller holds the lock."""
+        if self._docs.pop(item_id, None) is None:
+            return
+        for term in self._doc_terms.pop(item_id):
+            postings = self._postings[term]
+            del postings[item_id]
+            if not postings:
+                del self._postings[term]
+                if not self._sorted_stale:
+                    index = bisect.bisect_left(self._sorted_terms, term)
+                    del self._sorted_terms[index]
+        for term in self._doc_fuzzy.pop(item_id):
+            refs = self._fuzzy_refs[term] - 1
+            if refs:
+                self._fuzzy_refs[term] = refs
+                continue
+            del self._fuzzy_refs[term]
+            for variant in single_deletes(term) | {term}:
+                terms = self._deletes[variant]
+                terms.discard(term)
+                if not terms:
+                    del self._deletes[variant]
+
+
+class LibraryIndexer:
+    """
+    Keep a SearchIndex in sync with an Emby server.
+
+    A background thread bulk-loads every library and the person list,
+    then reloads them every refresh_interval seconds into a fresh index
+    that is swapped in whole. Until the first load succeeds it is retried
+    with a backoff that starts at retry_delay and doubles up to
+    max_retry_delay. LibraryChanged WebSocket messages are
+    applied in between, so new and removed items show up right away;
+    those that arrive during a reload are replayed once it is swapped in.
+    """
+
+    def __init__(
+        self,
+        client,
+        index: SearchIndex,
+        refresh_interval: float = 1800,
+        page_size: int = 500,
+        retry_delay: float = 1,
+        max_retry_delay: float = 60,
+    ):
+        """
+        Initialize the indexer.
+
+        Args:
+            client: EmbyClient used to page through the library
+            index: Index to fill and keep updated
+            refresh_interval: Seconds between full reloads
+            page_size: Items requested per page
+            retry_delay: Seconds before the first retry of a failed
+                initial load
+            max_retry_delay: Cap on the doubling retry delay
+        """
+        self.client = client
+        self.index = index
+        self.refresh_interval = refresh_interval
+        self.page_size = page_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.library_ids: List[str] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Changes seen while a rebuild runs; None when none is running
+        self._pending: Optional[List[Dict]] = None
+        self._pending_lock = threading.Lock()
+
+    def start(self):
+        """Start the background load/refresh thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="search-indexer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop refreshing the index."""
+        self._stop.set()
+
+    def rebuild(self):
+        """
+        Load every library and person into a fresh index and swap it in.
+
+        Changes applied while the fresh index loads may have missed it,
+        so they are replayed against it after the swap.
+        """
+        fresh = SearchIndex(
+            fuzzy_min_length=self.index.fuzzy_min_length,
+            prefix_min_length=self.index.prefix_min_length,
+            max_prefix_terms=self.index.max_prefix_terms,
+        )
+        with self._pending_lock:
+            self._pending = []
+        try:
+            library_ids = [
+                lib["ItemId"]
+                for lib in self.client.get_libraries()
+                if lib.get("ItemId")
+            ]
+            for library_id in library_ids:
+                fresh.load(self._library_items(library_id))
+            fresh.load(self._persons())
+            with self._pending_lock:
+                self.library_ids = library_ids
+                self.index.swap(fresh)
+                pending = self._pending
+        finally:
+            with self._pending_lock:
+                self._pending = None
+        for data in pending:
+            self._update(data)
+
+    def on_library_changed(self, data: Optional[Dict]):
+        """Apply a LibraryChanged message without blocking the caller."""
+        if data and (self.index.loaded or self._pending is not None):
+            threading.Thread(
+                target=self._apply_change, args=(data,), daemon=True
+            ).start()
+
+    def _apply_change(self, data: Dict):
+        """Apply a change now and again after a running rebuild's swap."""
+        with self._pending_lock:
+            if self._pending is not None:
+                self._pending.append(data)
+        self._update(data)
+
+    def _update(self, data: Dict):
+        """Drop removed items and (re)index added or updated ones."""
+        for item_id in data.get("ItemsRemoved") or ():
+            self.index.remove(item_id)
+        changed = list(data.get("ItemsAdded") or ()) + list(
+            data.get("ItemsUpdated") or ()
+        )
+        # Query per library so every item keeps its LibraryId
+        for start in range(0, len(changed), self.page_size):
+            ids = changed[start:start + self.page_size]
+            for library_id in self.library_ids:
+                for item in self.client.get_index_items(
+                    parent_id=library_id, ids=ids, limit=len(ids)
+                ):
+                    self.index.add(dict(item, LibraryId=library_id))
+
+    def _library_items(self, library_id: str) -> Iterator[Dict]:
+        """Yield every indexable item of a library, tagged with its id."""
+        pager = self.client.iter_index_items(
+            parent_id=library_id, page_size=self.page_size
+        )
+        for item in self._drain(pager):
+            yield dict(item, LibraryId=library_id)
+
+    def _persons(self) -> Iterator[Dict]:
+        """Yield every person, typed so searches can filter on them."""
+        pager = self.client.iter_persons(page_size=self.page_size)
+        for person in self._drain(pager):
+            yield dict(person, Type=person.get("Type") or "Person")
+
+    def _drain(self, pager) -> Iterator[Dict]:
+        """Yield a pager's items; raise if it stopped short of the end."""
+        for item in pager:
+            if self._stop.is_set():
+                raise RuntimeError("indexer stopped")
+            yield item
+        if not pager.complete:
+            # Never swap in a partial index; keep serving the old one
+            raise RuntimeError("library listing failed part way")
+
+    def _run(self):
+        """Rebuild the index now and then every refresh_interval seconds."""
+        retry_delay = self.retry_delay
+        while not self._stop.is_set():
+            try:
+                self.rebuild()
+            except Exception as e:
+                if not self._stop.is_set():
+                    print(f"Error building search index: {e}")
+            if self.index.loaded:
+                self._stop.wait(self.refresh_interval)
+            else:
+                # Searches fall back to Emby until the first load succeeds
+                self._stop.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, self.max_retry_delay)
@@ -19,6 +19,14 @@ const ThemeManager = {
     }
 };
 
+// Tagged image URLs are immutable, so the browser can cache them for good.
+// height is the CSS height shown; the server snaps it to a size bucket.
+function imageUrl(id, tag, height) {
+    const size = Math.ceil(height * (window.devicePixelRatio || 1));
+    const query = tag ? `tag=${encodeURIComponent(tag)}&size=${size}` : `size=${size}`;
+    return `/api/image/${id}?${query}`;
+}
+
 // Data Loading Functions
 const App = {
     currentTab: 'recent',
@@ -26,13 +34,10 @@ const App = {
     init() {
         ThemeManager.init();
         
-        // Common elements
-        this.loadServerStatus();
-        this.loadNowPlaying();
-        this.setupRefreshIntervals();
+        // Live data: prefer server push, poll only if the stream is unavailable
+        if (!this.setupEventStream()) this.setupRefreshIntervals();
         
         // Page specific
-        if($('#currentProcessing').length) this.loadCurrentProcessing();
         if($('#completedTasks').length) this.loadCompletedTasks();
         if($('#indexedMediaList').length) this.loadIndexedMedia();
         if($('#serverDetailsSection').length) this.loadServerDetails();
@@ -54,7 +59,62 @@ const App = {
         });
     },
 
+    setupEventStream() {
+        if (!window.EventSource) return false;
+
+        const source = new EventSource('/api/events');
+        const state = {
+            processing: new Map(),
+            nowPlaying: new Map()
+        };
+
+        // Apply a keyed diff ({upserted, removed, order}) and return rows in order
+        const applyDiff = (map, diff, key) => {
+            diff.removed.forEach(k => map.delete(k));
+            diff.upserted.forEach(entry => map.set(entry[key], entry));
+            return diff.order.map(k => map.get(k)).filter(Boolean);
+        };
+
+        // Every (re)connect starts with a full state from the server
+        source.addEventListener('open', () => {
+            state.processing.clear();
+            state.nowPlaying.clear();
+        });
+
+        source.addEventListener('status', e => this.renderServerStatus(JSON.parse(e.data)));
+
+        source.addEventListener('processing', e => {
+            const rows = applyDiff(state.processing, JSON.parse(e.data), 'id');
+            if ($('#currentProcessing').length) this.renderCurrentProcessing(rows);
+        });
+
+        source.addEventListener('now-playing', e => {
+            this.renderNowPlaying(applyDiff(state.nowPlaying, JSON.parse(e.data), 'session_id'));
+        });
+
+        source.addEventListener('server-time', e => {
+            const data = JSON.parse(e.data);
+            $('#serverTimeDisplay').text(data.server_time);
+        });
+
+        source.onerror = () => {
+            // CLOSED means the browser gave up (e.g. 204 or non-stream response)
+            if (source.readyState === EventSource.CLOSED) {
+                this.setupRefreshIntervals();
+            }
+        };
+
+        return true;
+    },
+
     setupRefreshIntervals() {
+        if (this.pollingStarted) return;
+        this.pollingStarted = true;
+
+        this.loadServerStatus();
+        this.loadNowPlaying();
+        if($('#currentProcessing').length) this.loadCurrentProcessing();
+
         setInterval(() => this.loadServerStatus(), 30000);
         setInterval(() => this.loadNowPlaying(), 5000);
         
@@ -72,30 +132,32 @@ const App = {
     async loadServerStatus() {
         try {
             const response = await fetch('/api/status');
-            const data = await response.json();
-            
-            if (data.error) {
-                this.showToast(data.error, 'danger');
-                $('#statusIndicator').removeClass('status-online').addClass('status-offline');
-                return;
-            }
-
-            $('#statusIndicator').removeClass('status-offline').addClass('status-online');
-            $('#serverInfo').html(`
-                <span class="navbar-text text-white me-3">
-                    <span class="status-indicator status-online"></span>
-                    ${data.server_name} (v${data.version})
-                </span>
-            `);
-            $('#serverDetailsTrigger').show();
-            // Store data for detail modal
-            window.serverData = data; 
+            this.renderServerStatus(await response.json());
         } catch (error) {
             console.error('Status Error:', error);
             $('#statusIndicator').removeClass('status-online').addClass('status-offline');
         }
     },
 
+    renderServerStatus(data) {
+        if (data.error) {
+            this.showToast(data.error, 'danger');
+            $('#statusIndicator').removeClass('status-online').addClass('status-offline');
+            return;
+        }
+
+        $('#statusIndicator').removeClass('status-offline').addClass('status-online');
+        $('#serverInfo').html(`
+            <span class="navbar-text text-white me-3">
+                <span class="status-indicator status-online"></span>
+                ${data.server_name} (v${data.version})
+            </span>
+        `);
+        $('#serverDetailsTrigger').show();
+        // Store data for detail modal
+        window.serverData = data; 
+    },
+
     async updateServerTime() {
         if (!$('#serverTimeDisplay').length) return;
         try {
@@ -110,99 +172,104 @@ const App = {
     async loadNowPlaying() {
         try {
             const response = await fetch('/api/now-playing');
-            const sessions = await response.json();
-            const container = $('#nowPlayingSection');
+            this.renderNowPlaying(await response.json());
+        } catch (error) {
+            console.error('Now Playing Error:', error);
+        }
+    },
 
-            if (sessions.length === 0) {
-                container.slideUp();
-                return;
-            }
+    renderNowPlaying(sessions) {
+        const container = $('#nowPlayingSection');
 
-            container.html(sessions.map(session => {
-                const item = session.item;
-                const progressPercent = (session.play_state.position_ticks / item.runtime_ticks) * 100;
-                
-                return `
-                <div class="card border-primary">
-                    <div class="card-header bg-primary text-white d-flex justify-content-between align-items-center">
-                        <h5 class="mb-0">▶ Now Playing</h5>
-                        <span class="badge bg-light text-dark">${session.user} on ${session.device}</span>
-                    </div>
-                    <div class="card-body">
-                        <div class="row align-items-center">
-                            <div class="col-md-2 text-center">
-                                <img src="/api/image/${item.id}" class="img-fluid rounded shadow" style="max-height: 150px;" alt="${item.name}">
+        if (sessions.length === 0) {
+            container.slideUp();
+            return;
+        }
+
+        container.html(sessions.map(session => {
+            const item = session.item;
+            const progressPercent = (session.play_state.position_ticks / item.runtime_ticks) * 100;
+            
+            return `
+            <div class="card border-primary">
+                <div class="card-header bg-primary text-white d-flex justify-content-between align-items-center">
+                    <h5 class="mb-0">▶ Now Playing</h5>
+                    <span class="badge bg-light text-dark">${session.user} on ${session.device}</span>
+                </div>
+                <div class="card-body">
+                    <div class="row align-items-center">
+                        <div class="col-md-2 text-center">
+                            <img src="${imageUrl(item.id, item.primary_image_tag, 150)}" class="img-fluid rounded shadow" style="max-height: 150px;" alt="${item.name}">
+                        </div>
+                        <div class="col-md-10">
+                            <h4>${item.series_name ? `${item.series_name} - ` : ''}${item.name}</h4>
+                            <div class="mb-2">
+                                ${item.season ? `<span class="badge bg-secondary">S${item.season}:E${item.episode}</span>` : ''}
+                                <span class="badge bg-info">${item.year}</span>
+                                <span class="badge bg-dark">${session.play_state.is_paused ? '⏸ Paused' : '▶ Playing'}</span>
+                                ${session.transcoding.is_transcoding ? 
+                                    `<span class="badge bg-warning text-dark">⚙️ Transcoding (${session.transcoding.video_codec})</span>` : 
+                                    '<span class="badge bg-success">Direct Play</span>'}
                             </div>
-                            <div class="col-md-10">
-                                <h4>${item.series_name ? `${item.series_name} - ` : ''}${item.name}</h4>
-                                <div class="mb-2">
-                                    ${item.season ? `<span class="badge bg-secondary">S${item.season}:E${item.episode}</span>` : ''}
-                                    <span class="badge bg-info">${item.year}</span>
-                                    <span class="badge bg-dark">${session.play_state.is_paused ? '⏸ Paused' : '▶ Playing'}</span>
-                                    ${session.transcoding.is_transcoding ? 
-                                        `<span class="badge bg-warning text-dark">⚙️ Transcoding (${session.transcoding.video_codec})</span>` : 
-                                        '<span class="badge bg-success">Direct Play</span>'}
-                                </div>
-                                <div class="progress mb-2" style="height: 20px;">
-                                    <div class="progress-bar progress-bar-striped progress-bar-animated" 
-                                         role="progressbar" 
-                                         style="width: ${progressPercent}%">
-                                    </div>
-                                </div>
-                                <div class="d-flex justify-content-between small text-muted">
-                                    <span>${session.client} (${session.remote_endpoint})</span>
-                                    <span>${session.transcoding.container ? `Container: ${session.transcoding.container}` : ''}</span>
+                            <div class="progress mb-2" style="height: 20px;">
+                                <div class="progress-bar progress-bar-striped progress-bar-animated" 
+                                     role="progressbar" 
+                                     style="width: ${progressPercent}%">
                                 </div>
                             </div>
+                            <div class="d-flex justify-content-between small text-muted">
+                                <span>${session.client} (${session.remote_endpoint})</span>
+                                <span>${session.transcoding.container ? `Container: ${session.transcoding.container}` : ''}</span>
+                            </div>
                         </div>
                     </div>
                 </div>
-                `;
-            }).join(''));
-
-            container.slideDown();
+            </div>
+            `;
+        }).join(''));
 
-        } catch (error) {
-            console.error('Now Playing Error:', error);
-        }
+        container.slideDown();
     },
 
     async loadCurrentProcessing() {
         try {
             const response = await fetch('/api/current-processing');
-            const data = await response.json();
-            const container = $('#currentProcessing');
+            this.renderCurrentProcessing(await response.json());
+        } catch (error) {
+            console.error('Processing Error:', error);
+        }
+    },
 
-            if (data.length === 0) {
-                container.html(`
-                    <div class="text-center text-muted py-4">
-                        <div style="font-size: 2rem;">✨</div>
-                        <div>No active processing tasks</div>
-                    </div>
-                `);
-                return;
-            }
+    renderCurrentProcessing(data) {
+        const container = $('#currentProcessing');
 
-            container.html(data.map(item => `
-                <div class="task-item">
-                    <div class="d-flex justify-content-between align-items-center mb-2">
-                        <span class="badge badge-custom badge-running">${item.state}</span>
-                        <small class="text-muted">${item.started_at}</small>
-                    </div>
-                    <h6 class="mb-1">${item.task_name}</h6>
-                    <small class="text-muted d-block mb-2">${item.category}</small>
-                    <div class="progress" style="height: 10px;">
-                        <div class="progress-bar progress-bar-striped progress-bar-animated bg-success" 
-                             role="progressbar" 
-                             style="width: ${item.progress}%">
-                        </div>
-                    </div>
-                    <small class="text-end d-block mt-1">${item.progress.toFixed(1)}%</small>
+        if (data.length === 0) {
+            container.html(`
+                <div class="text-center text-muted py-4">
+                    <div style="font-size: 2rem;">✨</div>
+                    <div>No active processing tasks</div>
                 </div>
-            `).join(''));
-        } catch (error) {
-            console.error('Processing Error:', error);
+            `);
+            return;
         }
+
+        container.html(data.map(item => `
+            <div class="task-item">
+                <div class="d-flex justify-content-between align-items-center mb-2">
+                    <span class="badge badge-custom badge-running">${item.state}</span>
+                    <small class="text-muted">${item.started_at}</small>
+                </div>
+                <h6 class="mb-1">${item.task_name}</h6>
+                <small class="text-muted d-block mb-2">${item.category}</small>
+                <div class="progress" style="height: 10px;">
+                    <div class="progress-bar progress-bar-striped progress-bar-animated bg-success" 
+                         role="progressbar" 
+                         style="width: ${item.progress}%">
+                    </div>
+                </div>
+                <small class="text-end d-block mt-1">${item.progress.toFixed(1)}%</small>
+            </div>
+        `).join(''));
     },
 
     async loadCompletedTasks() {
@@ -377,7 +444,7 @@ const App = {
             items.forEach(item => {
                 // Correct image path logic using primary_image_tag
                 const imagePath = item.primary_image_tag 
-                    ? `/api/image/${item.id}?tag=${item.primary_image_tag}` 
+                    ? imageUrl(item.id, item.primary_image_tag, 300)
                     : null;
                 
                 // Fallback icon based on type
@@ -630,7 +697,7 @@ async function loadServerDetails() {
             
             people.forEach(person => {
                  const imagePath = person.primary_image_tag 
-                    ? `/api/image/${person.id}?tag=${person.primary_image_tag}` 
+                    ? imageUrl(person.id, person.primary_image_tag, 250)
                     : null;
                  
                  const imageHtml = imagePath 
@@ -700,7 +767,7 @@ async function loadServerDetails() {
                     <div class="horizontal-scroll-container">
                          ${credits.map(item => {
                              const img = item.primary_image_tag 
-                                ? `/api/image/${item.id}?tag=${item.primary_image_tag}` 
+                                ? imageUrl(item.id, item.primary_image_tag, 200)
                                 : null;
                              const imgHtml = img 
                                 ? `<img src="${img}" class="rounded mb-2" style="width: 100%; height: 200px; object-fit: cover;">`
@@ -734,7 +801,7 @@ async function loadServerDetails() {
             $('#personDetailsContent').html(`
                  <div class="row">
                     <div class="col-md-3 text-center mb-3">
-                        <img src="/api/image/${personId}" class="img-fluid rounded shadow" onerror="this.style.display='none'">
+                        <img src="${imageUrl(personId, person.primary_image_tag, 300)}" class="img-fluid rounded shadow" onerror="this.style.display='none'">
                     </div>
                     <div class="col-md-9">
                         <h4 class="mb-3">${person.name}</h4>
@@ -777,7 +844,7 @@ async function showMovieDetails(itemId) {
                              <div class="cast-carousel">
                                 ${actors.map(actor => `
                                     <div class="cast-member">
-                                        <img src="/api/person-image/${actor.Id}" 
+                                        <img src="${imageUrl(actor.Id, actor.PrimaryImageTag, 80)}" 
                                              onerror="this.src='data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 width=%22100%22 height=%22100%22><text y=%2250%%22 x=%2250%%22 text-anchor=%22middle%22 dy=%22.3em%22 font-size=%2240%22>👤</text></svg>'">
                                         <div class="cast-name">${actor.Name}</div>
                                         <div class="cast-role text-truncate" style="max-width: 100px;">${actor.Role || 'Actor'}</div>
@@ -790,7 +857,7 @@ async function showMovieDetails(itemId) {
         $('#movieDetailsContent').html(`
             <div class="row">
                 <div class="col-md-4 mb-3">
-                    <img src="/api/image/${movie.id}" class="img-fluid rounded shadow" alt="${movie.name}">
+                    <img src="${imageUrl(movie.id, movie.primary_image_tag, 450)}" class="img-fluid rounded shadow" alt="${movie.name}">
                 </div>
                 <div class="col-md-8">
                     <h4>${movie.name} <small class="text-muted">(${movie.year})</small></h4>
@@ -0,0 +1,55 @@
+"""
+Shared pytest fixtures.
+
+Tests run app.py against the local Emby stub from benchmarks/, so no
+Emby server is needed.
+"""
+
+# Standard library imports
+import os
+import sys
+import tempfile
+
+# Third-party imports
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# Local imports
+from emby_stub import StubServer, SyntheticLibrary  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def stub():
+    """A small synthetic Emby server on a free port."""
+    server = StubServer(
+        SyntheticLibrary(items=500, persons=200), api_key="test"
+    ).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def web(stub):
+    """app.py configured for the stub (config is read at import time)."""
+    os.environ.update(
+        {
+            "EMBY_SERVER_URL": stub.url,
+            "EMBY_API_KEY": "test",
+            "EMBY_WEBSOCKET_ENABLED": "False",
+            "BACKGROUND_POLLER_ENABLED": "False",
+            "SEARCH_INDEX_ENABLED": "False",
+            "IMAGE_CACHE_DIR": tempfile.mkdtemp(prefix="emby-test-"),
+        }
+    )
+    import app
+
+    return app
+
+
+@pytest.fixture
+def client(web):
+    """Flask test client."""
+    return web.app.test_client()
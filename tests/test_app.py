@@ -0,0 +1,162 @@
+"""Tests for the Flask routes and formatters in app.py."""
+
+# Third-party imports
+import requests
+
+# Local imports
+from poller import EmbyPoller
+
+
+def test_search_fallback_is_repeatable(client):
+    """The Emby fallback must not grow the cached item listing."""
+    # The limit is above the number of matches, so people are appended
+    url = "/api/search?q=an&limit=200"
+    first = client.get(url).get_json()
+    second = client.get(url).get_json()
+
+    ids = [result["id"] for result in first["results"]]
+    assert first["source"] == "emby"
+    assert "Person" in {result["type"] for result in first["results"]}
+    assert len(ids) == len(set(ids))
+    assert second == first
+
+
+def test_format_now_playing_without_backdrop(web):
+    sessions = [
+        {
+            "Id": "session",
+            "UserName": "user",
+            "NowPlayingItem": {
+                "Id": "1",
+                "Name": "Movie",
+                "Type": "Movie",
+                "ImageTags": {},
+                "BackdropImageTags": [],
+            },
+        }
+    ]
+
+    (session,) = web.format_now_playing(sessions)
+
+    assert session["item"]["backdrop_image_tag"] is None
+    assert session["item"]["primary_image_tag"] is None
+
+
+def test_event_stream_survives_a_failing_view(web, client, monkeypatch):
+    """One view raising must not end the stream for the others."""
+
+    class Poller:
+        def wait_for_change(self, version, timeout=None):
+            return version
+
+    def poller_view(view_name, source, formatter):
+        if view_name == "processing":
+            raise IndexError("list index out of range")
+        return formatter({"sessions": [], "system_info": {}}[source])
+
+    monkeypatch.setattr(web.config, "BACKGROUND_POLLER_ENABLED", True)
+    monkeypatch.setattr(web, "get_poller", Poller)
+    monkeypatch.setattr(web, "poller_view", poller_view)
+
+    response = client.get("/api/events")
+    frames = []
+    for chunk in response.response:
+        frames.append(chunk.decode() if isinstance(chunk, bytes) else chunk)
+        if len(frames) == 8:
+            break
+    response.close()
+
+    events = [f.split("\n")[0] for f in frames if f.startswith("event:")]
+    assert "event: processing" not in events
+    assert "event: now-playing" in events
+    assert events.count("event: server-time") >= 2
+
+
+def test_poller_view_is_memoized_per_snapshot_version(web, monkeypatch):
+    state_poller = EmbyPoller(web.get_emby_client())
+    monkeypatch.setattr(web.config, "BACKGROUND_POLLER_ENABLED", True)
+    monkeypatch.setattr(web, "poller", state_poller)
+    monkeypatch.setattr(web, "_views", {})
+    calls = []
+
+    def formatter(tasks):
+        calls.append(tasks)
+        return {"count": len(tasks)}
+
+    state_poller.update("tasks", [{"Id": "1"}])
+    first = web.poller_view("test", "tasks", formatter)
+    assert web.poller_view("test", "tasks", formatter) is first
+    state_poller.update("tasks", [{"Id": "1"}])
+    assert web.poller_view("test", "tasks", formatter) is first
+    assert len(calls) == 1
+
+    state_poller.update("tasks", [{"Id": "1"}, {"Id": "2"}])
+    assert web.poller_view("test", "tasks", formatter) == {"count": 2}
+    assert len(calls) == 2
+
+
+def test_routes_answer_from_a_stale_snapshot(web, client, stub, monkeypatch):
+    # Never started: the snapshot is never refreshed in the background
+    state_poller = EmbyPoller(web.get_emby_client())
+    monkeypatch.setattr(web.config, "BACKGROUND_POLLER_ENABLED", True)
+    monkeypatch.setattr(web, "poller", state_poller)
+    monkeypatch.setattr(web, "_views", {})
+    state_poller.update("tasks", [])
+    state_poller.update("sessions", [])
+    stats_url = f"{stub.url}/stub/stats"
+    before = requests.get(stats_url).json()["requests"]
+
+    for path in ("/api/current-processing", "/api/now-playing"):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.get_json() == []
+
+    assert requests.get(stats_url).json()["requests"] == before
+
+
+def item_with_image(stub):
+    """Return (item id, image tag) of the first stub item with an image."""
+    library = stub.state.library
+    index = next(i for i, record in enumerate(library.records) if record[10])
+    return library.item_id(index), library.image_tag("item", index)
+
+
+def test_tagged_image_has_an_etag_and_is_immutable(web, client, stub):
+    item_id, tag = item_with_image(stub)
+
+    response = client.get(f"/api/image/{item_id}?tag={tag}&size=200")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "image/png"
+    assert response.headers["ETag"]
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age == web.IMMUTABLE_MAX_AGE
+
+
+def test_matching_etag_gets_a_304(client, stub):
+    item_id, tag = item_with_image(stub)
+    url = f"/api/image/{item_id}?tag={tag}&size=200"
+    etag = client.get(url).headers["ETag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not response.data
+
+
+def test_untagged_image_is_revalidated_not_immutable(client, stub):
+    item_id, _ = item_with_image(stub)
+    url = f"/api/image/{item_id}?size=200"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert not response.cache_control.immutable
+    assert response.cache_control.no_cache
+
+    # The browser's validator is forwarded to Emby, which answers 304
+    revalidated = client.get(
+        url, headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+    assert not revalidated.cache_control.immutable
@@ -0,0 +1,73 @@
+"""Tests for emby_client.py against the Emby stub."""
+
+# Standard library imports
+import time
+
+# Third-party imports
+import pytest
+
+# Local imports
+from emby_client import EmbyClient
+from emby_stub import StubServer, SyntheticLibrary
+
+LATENCY = 0.2
+
+
+@pytest.fixture(scope="module")
+def slow_stub():
+    """A stub that takes LATENCY seconds to answer every request."""
+    server = StubServer(
+        SyntheticLibrary(items=100, persons=20),
+        api_key="test",
+        latency=LATENCY,
+    ).start()
+    yield server
+    server.stop()
+
+
+def test_detailed_server_info_fetches_concurrently(slow_stub):
+    client = EmbyClient(slow_stub.url, "test", cache=None)
+
+    started = time.monotonic()
+    info = client.get_detailed_server_info()
+    elapsed = time.monotonic() - started
+
+    assert info["system"]["Id"]
+    assert "IsLocal" in info["endpoint"]
+    # Serially this takes two round trips
+    assert elapsed < 1.6 * LATENCY
+
+
+def test_fan_out_runs_calls_together(slow_stub):
+    client = EmbyClient(slow_stub.url, "test", cache=None)
+
+    started = time.monotonic()
+    results = client.fan_out(
+        {
+            "system_info": client.get_system_info,
+            "tasks": client.get_scheduled_tasks,
+            "sessions": client.get_sessions,
+        }
+    )
+    elapsed = time.monotonic() - started
+
+    assert set(results) == {"system_info", "tasks", "sessions"}
+    assert results["tasks"] and isinstance(results["sessions"], list)
+    assert elapsed < 2 * LATENCY
+
+
+def test_fan_out_raises_after_all_calls_finish(stub):
+    client = EmbyClient(stub.url, "test", cache=None)
+    finished = []
+
+    def fail():
+        raise ValueError("bad response")
+
+    def succeed():
+        time.sleep(0.05)
+        finished.append(True)
+        return 1
+
+    with pytest.raises(ValueError):
+        client.fan_out({"fail": fail, "succeed": succeed})
+    assert finished == [True]
@@ -0,0 +1,63 @@
+"""Tests for emby_websocket.py against the stub's /embywebsocket."""
+
+# Standard library imports
+import threading
+import time
+
+# Third-party imports
+import pytest
+
+# Local imports
+from emby_stub import StubServer, SyntheticLibrary
+from emby_websocket import EmbyWebSocket, websocket_url
+
+KEEPALIVE_TIMEOUT = 3
+
+
+@pytest.fixture
+def ws_stub():
+    """A stub that drops sockets without a KeepAlive for 3 seconds."""
+    server = StubServer(
+        SyntheticLibrary(items=100, persons=20),
+        api_key="test",
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    ).start()
+    yield server
+    server.stop()
+
+
+def test_subscribe_push_and_keepalive(ws_stub):
+    pushed = {"tasks": 0, "sessions": 0}
+    connected = threading.Event()
+
+    def count(name):
+        def handler(data):
+            assert isinstance(data, list)
+            pushed[name] += 1
+        return handler
+
+    subscription = EmbyWebSocket(
+        websocket_url(ws_stub.url, "test", "pytest"),
+        on_tasks=count("tasks"),
+        on_sessions=count("sessions"),
+        on_connection_change=lambda up: up and connected.set(),
+        # Pushes arrive well inside the recv timeout
+        tasks_interval_ms=100,
+        sessions_interval_ms=100,
+    )
+    subscription.start()
+    try:
+        assert connected.wait(5)
+        time.sleep(2.5 * KEEPALIVE_TIMEOUT)
+        stats = ws_stub.state.stats()
+        assert subscription.connected
+    finally:
+        subscription.stop()
+
+    # Emby asks for keep-alives at half its timeout
+    assert subscription.keepalive_interval == KEEPALIVE_TIMEOUT / 2
+    assert pushed["tasks"] > 10 and pushed["sessions"] > 10
+    assert stats["websocket_keepalives"] >= 3
+    assert subscription.keepalives_sent >= stats["websocket_keepalives"]
+    # The stub never had to drop the socket for a missed keep-alive
+    assert stats["websocket_connections"] == 1
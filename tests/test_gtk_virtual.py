@@ -0,0 +1,29 @@
+"""Tests for gtk_virtual.py (skipped without PyGObject or a display)."""
+
+# Third-party imports
+import pytest
+
+gi = pytest.importorskip("gi")
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk  # noqa: E402
+
+if not Gtk.init_check(None)[0]:
+    pytest.skip("no display available", allow_module_level=True)
+
+# Local imports
+from gtk_virtual import VirtualList  # noqa: E402
+
+
+def test_extend_items_after_a_height_change():
+    view = VirtualList(
+        lambda item: Gtk.Label(label=str(item)), estimated_height=10
+    )
+    view.set_items(range(3))
+    # What _measure records when a built row turns out taller
+    view._heights[1] = 30
+    view._offsets_stale = True
+
+    view.extend_items(range(3, 5))
+
+    assert view._current_offsets() == [0, 10, 40, 50, 60, 70]
+    assert view._content_height() == 70
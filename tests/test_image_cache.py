@@ -0,0 +1,104 @@
+"""Tests for image_cache.py."""
+
+# Standard library imports
+import os
+
+# Third-party imports
+import pytest
+
+# Local imports
+from image_cache import ImageCache
+
+META = {"content_type": "image/png"}
+
+
+def cache_files(directory):
+    """Return {file name: size} of everything under the cache directory."""
+    found = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            found[name] = os.path.getsize(os.path.join(root, name))
+    return found
+
+
+def body_bytes(directory):
+    return sum(
+        size for name, size in cache_files(directory).items()
+        if not name.endswith(".json")
+    )
+
+
+def test_completed_stream_is_committed(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    key = ImageCache.make_key("1", "Primary", 200, "tag")
+
+    assert b"".join(cache.tee(key, [b"ab", b"cd"], META)) == b"abcd"
+
+    path, meta = cache.get(key)
+    assert meta == META
+    with open(path, "rb") as f:
+        assert f.read() == b"abcd"
+
+
+def test_interrupted_stream_leaves_nothing_behind(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    key = ImageCache.make_key("1", "Primary", 200, "tag")
+
+    # The client disconnects after the first chunk
+    stream = cache.tee(key, iter([b"ab", b"cd", b"ef"]), META)
+    assert next(stream) == b"ab"
+    stream.close()
+
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+    assert cache_files(tmp_path) == {}
+
+
+def test_failed_upstream_stream_leaves_nothing_behind(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    key = ImageCache.make_key("1", "Primary", 200, "tag")
+
+    def upstream():
+        yield b"ab"
+        raise ConnectionError("connection reset")
+
+    with pytest.raises(ConnectionError):
+        list(cache.tee(key, upstream(), META))
+
+    assert cache.get(key) is None
+    assert cache_files(tmp_path) == {}
+
+
+def test_eviction_keeps_the_directory_within_its_limit(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=1000)
+    keys = [ImageCache.make_key(str(i), "Primary", 200, "t") for i in range(6)]
+
+    cache.put(keys[0], b"x" * 300, META)
+    for key in keys[1:]:
+        # Keep the first entry recently used
+        assert cache.get(keys[0]) is not None
+        list(cache.tee(key, [b"y" * 150, b"y" * 150], META))
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 1000
+    assert body_bytes(tmp_path) == stats["bytes"]
+    assert stats["entries"] == 3
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[-1]) is not None
+    # Evicted entries take their metadata sidecars with them
+    sidecars = [n for n in cache_files(tmp_path) if n.endswith(".json")]
+    assert len(sidecars) == stats["entries"]
+
+
+def test_reopening_with_a_smaller_limit_evicts(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    for i in range(4):
+        cache.put(
+            ImageCache.make_key(str(i), "Primary", 200, "t"), b"z" * 400, META
+        )
+
+    reopened = ImageCache(str(tmp_path), max_bytes=1000)
+
+    assert reopened.stats()["entries"] == 2
+    assert body_bytes(tmp_path) == 800
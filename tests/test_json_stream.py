@@ -0,0 +1,112 @@
+"""Tests for json_stream.py and EmbyClient.stream_query."""
+
+# Standard library imports
+import json
+
+# Third-party imports
+import pytest
+import requests
+
+# Local imports
+from emby_client import EmbyClient
+from json_stream import ItemStream
+
+ITEMS = [
+    {
+        "Name": 'Quote " and backslash \\ and slash /',
+        "Id": "1",
+        "Overview": "Line\nbreak\ttab été \U0001f3ac café",
+        "RunTimeTicks": 72000000000,
+        "CommunityRating": 7.25,
+        "People": [
+            {"Name": "Ada", "Role": "{not: json}", "ImageTags": {}},
+            {"Name": "Ravi", "Role": "[1, 2]", "ImageTags": {"Primary": "x"}},
+        ],
+        "UserData": {"Played": False, "PlaybackPositionTicks": 0},
+        "Tags": [],
+        "ParentId": None,
+    },
+    {"Name": "Second", "Id": "2", "IndexNumber": 1234567890123},
+    {"Name": "", "Id": "3", "Nested": {"a": {"b": {"c": [[1], [2, [3]]]}}}},
+]
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def encode(value, ensure_ascii=False) -> bytes:
+    return json.dumps(value, ensure_ascii=ensure_ascii).encode("utf-8")
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_items_split_across_chunks_match_json_loads(size, ensure_ascii):
+    """Every chunk size splits items, strings, escapes and UTF-8."""
+    body = encode(
+        {"Items": ITEMS, "TotalRecordCount": 3, "StartIndex": 0},
+        ensure_ascii,
+    )
+    expected = json.loads(body)
+
+    stream = ItemStream(chunked(body, size))
+    items = list(stream)
+
+    assert items == expected["Items"]
+    assert stream.complete
+    assert stream.count == 3
+    assert stream.fields == {"TotalRecordCount": 3, "StartIndex": 0}
+
+
+def test_fields_before_items_and_whitespace():
+    body = json.dumps(
+        {"TotalRecordCount": 2, "Items": ITEMS[:2]}, indent=4
+    ).encode("utf-8")
+
+    stream = ItemStream(chunked(body, 5))
+
+    assert list(stream) == json.loads(body)["Items"]
+    assert stream.fields == {"TotalRecordCount": 2}
+
+
+def test_bare_array_and_empty_results():
+    assert list(ItemStream(chunked(encode(ITEMS), 4))) == ITEMS
+    empty = ItemStream([b'{"Items": [], "TotalRecordCount": 0}'])
+    assert list(empty) == []
+    assert empty.complete and empty.fields == {"TotalRecordCount": 0}
+
+
+def test_truncated_body_is_incomplete_and_closed():
+    body = encode({"Items": ITEMS, "TotalRecordCount": 3})
+    closed = []
+
+    stream = ItemStream(
+        chunked(body[: len(body) // 2], 16), close=lambda: closed.append(1)
+    )
+    items = list(stream)
+
+    assert items == ITEMS[: len(items)]
+    assert not stream.complete
+    assert closed == [1]
+
+
+def test_stream_query_matches_the_buffered_response(stub):
+    client = EmbyClient(stub.url, "test", cache=None)
+    params = {
+        "Recursive": "true",
+        "IncludeItemTypes": "Movie,Series,Episode",
+        "Fields": "Overview,People,Genres,Studios,MediaStreams",
+        "Limit": 200,
+    }
+    buffered = requests.get(
+        f"{stub.url}/emby/Items",
+        params=params,
+        headers={"X-Emby-Token": "test"},
+    ).json()
+
+    stream = client.stream_query("/emby/Items", params)
+    items = list(stream)
+
+    assert items == buffered["Items"]
+    assert stream.complete
+    assert stream.fields["TotalRecordCount"] == buffered["TotalRecordCount"]
@@ -0,0 +1,118 @@
+"""Tests for PagedQuery in paging.py."""
+
+# Standard library imports
+import json
+import threading
+import time
+
+# Third-party imports
+import pytest
+
+# Local imports
+from json_stream import ItemStream
+from paging import PagedQuery
+
+
+class FakePages:
+    """fetch_page over a list of items that records every call."""
+
+    def __init__(self, count, total=True, fail_at=None, stream=False):
+        self.items = [{"Id": str(i)} for i in range(count)]
+        self.total = total
+        self.fail_at = fail_at
+        self.stream = stream
+        self.calls = []
+        self.threads = set()
+
+    def __call__(self, start, limit):
+        self.calls.append((start, limit))
+        self.threads.add(threading.get_ident())
+        if start == self.fail_at:
+            raise ConnectionError("page failed")
+        result = {"Items": self.items[start:start + limit]}
+        if self.total:
+            result["TotalRecordCount"] = len(self.items)
+        if self.stream:
+            return ItemStream([json.dumps(result).encode("utf-8")])
+        return result
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_start_index_and_limit_sequence(prefetch):
+    fetch = FakePages(25, total=False)
+    query = PagedQuery(fetch, page_size=10, prefetch=prefetch)
+
+    pages = list(query.pages())
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [item["Id"] for page in pages for item in page] == [
+        str(i) for i in range(25)
+    ]
+    assert fetch.calls == [(0, 10), (10, 10), (20, 10)]
+    assert query.complete
+
+
+def test_start_index_offsets_the_first_page():
+    fetch = FakePages(25)
+    query = PagedQuery(fetch, page_size=10, start_index=5)
+
+    assert [item["Id"] for item in query] == [str(i) for i in range(5, 25)]
+    assert fetch.calls == [(5, 10), (15, 10)]
+
+
+def test_short_last_page_stops_without_total():
+    fetch = FakePages(20, total=False)
+    query = PagedQuery(fetch, page_size=10)
+
+    assert len(list(query)) == 20
+    # Two full pages give no hint, so the empty third page ends the query
+    assert fetch.calls == [(0, 10), (10, 10), (20, 10)]
+    assert query.complete
+    assert query.total_record_count is None
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_total_record_count_stops_without_an_extra_fetch(stream):
+    fetch = FakePages(20, stream=stream)
+    query = PagedQuery(fetch, page_size=10)
+
+    assert len(list(query)) == 20
+    assert fetch.calls == [(0, 10), (10, 10)]
+    assert query.complete
+    assert query.total_record_count == 20
+
+
+def test_failed_page_ends_the_query_incomplete():
+    def fetch(start, limit):
+        return {"Items": [{"Id": "0"}] * limit} if start == 0 else None
+
+    query = PagedQuery(fetch, page_size=10)
+
+    assert len(list(query)) == 10
+    assert not query.complete
+
+
+def test_prefetch_error_reaches_the_iterator():
+    fetch = FakePages(30, fail_at=10)
+    query = PagedQuery(fetch, page_size=10)
+    seen = []
+
+    with pytest.raises(ConnectionError, match="page failed"):
+        for item in query:
+            seen.append(item)
+
+    assert len(seen) == 10
+    assert threading.get_ident() not in fetch.threads
+    assert not query.complete
+
+
+def test_closing_early_stops_paging():
+    fetch = FakePages(100)
+    pages = PagedQuery(fetch, page_size=10).pages()
+
+    next(pages)
+    pages.close()
+    time.sleep(0.1)
+
+    # At most the page being prefetched when the iterator closed was requested
+    assert fetch.calls in ([(0, 10)], [(0, 10), (10, 10)])
@@ -0,0 +1,97 @@
+"""Tests for poller.py against the Emby stub."""
+
+# Standard library imports
+import time
+
+# Third-party imports
+import requests
+
+# Local imports
+from emby_client import EmbyClient
+from poller import EmbyPoller
+
+
+class FailingClient(EmbyClient):
+    """EmbyClient whose task listing raises once fail is set."""
+
+    fail = False
+
+    def get_scheduled_tasks(self):
+        if self.fail:
+            raise ConnectionError("Emby went away")
+        return super().get_scheduled_tasks()
+
+
+def upstream_requests(stub):
+    return requests.get(f"{stub.url}/stub/stats").json()["requests"]
+
+
+def test_versions_only_change_with_the_value(stub):
+    poller = EmbyPoller(EmbyClient(stub.url, "test", cache=None))
+
+    poller.update("tasks", [{"Id": "1"}])
+    _, first = poller.get("tasks")
+    poller.update("tasks", [{"Id": "1"}])
+    assert poller.get("tasks")[1] == first
+    assert poller.version == first
+
+    poller.update("sessions", [])
+    poller.update("tasks", [{"Id": "2"}])
+    value, version = poller.get("tasks")
+    assert value == [{"Id": "2"}]
+    assert version > first
+    assert poller.version == version
+    assert poller.snapshot()["version"] == version
+
+
+def test_first_get_loads_then_serves_from_memory(stub):
+    poller = EmbyPoller(EmbyClient(stub.url, "test", cache=None))
+    before = upstream_requests(stub)
+
+    tasks, version = poller.get("tasks")
+    assert tasks
+    assert upstream_requests(stub) == before + 1
+
+    # Not started, so the snapshot is stale, yet reads stay local
+    for _ in range(5):
+        assert poller.get("tasks") == (tasks, version)
+    assert upstream_requests(stub) == before + 1
+
+
+def test_failed_refresh_publishes_none_without_blocking_readers(stub):
+    client = FailingClient(stub.url, "test", cache=None)
+    poller = EmbyPoller(client)
+    tasks, version = poller.get("tasks")
+    assert tasks
+
+    client.fail = True
+    poller.refresh("tasks")
+    value, failed_version = poller.get("tasks")
+
+    assert value is None
+    assert failed_version > version
+    # Readers keep getting the published value; only the poller retries
+    assert poller.get("tasks") == (None, failed_version)
+
+
+def test_background_thread_refreshes_due_sources(stub):
+    poller = EmbyPoller(
+        EmbyClient(stub.url, "test", cache=None),
+        processing_interval=0.1,
+        status_interval=0.1,
+    )
+    poller.start()
+    try:
+        version = 0
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            version = poller.wait_for_change(version, timeout=1)
+            snapshot = poller.snapshot()
+            if all(snapshot[name] is not None for name in poller.sources):
+                break
+    finally:
+        poller.stop()
+
+    assert snapshot["system_info"]["Id"]
+    assert snapshot["tasks"]
+    assert isinstance(snapshot["sessions"], list)
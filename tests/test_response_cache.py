@@ -0,0 +1,96 @@
+"""Tests for response_cache.py and its use by EmbyClient."""
+
+# Third-party imports
+import requests
+
+# Local imports
+from emby_client import EmbyClient
+from response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def upstream_requests(stub, route):
+    return requests.get(f"{stub.url}/stub/stats").json()["by_route"].get(
+        route, 0
+    )
+
+
+def test_entries_expire_after_their_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    key = ResponseCache.make_key("GET", "/emby/System/Info")
+    cache.set(key, {"Id": "server"}, ttl=120)
+
+    clock.now += 119
+    assert cache.get(key) == (True, {"Id": "server"})
+    clock.now += 2
+    assert cache.get(key) == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")  # b is now the least recently used
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_keys_ignore_parameter_order():
+    assert ResponseCache.make_key(
+        "get", "/emby/Items", {"Limit": 10, "StartIndex": 0}
+    ) == ResponseCache.make_key(
+        "GET", "/emby/Items", {"StartIndex": 0, "Limit": 10}
+    )
+
+
+def test_uncacheable_endpoints_are_not_stored():
+    cache = ResponseCache()
+    assert cache.ttl_for("/emby/System/Info") > 0
+    assert cache.ttl_for("/emby/System/Info/Public") == 0
+    cache.set("key", "value", ttl=cache.ttl_for("/emby/System/Info/Public"))
+    assert cache.get("key") == (False, None)
+
+
+def test_client_serves_repeated_gets_from_the_cache(stub):
+    client = EmbyClient(stub.url, "test", cache=ResponseCache())
+    before = upstream_requests(stub, "system_info")
+
+    assert client.get_system_info() == client.get_system_info()
+
+    assert upstream_requests(stub, "system_info") == before + 1
+    assert client.cache.stats()["hits"] == 1
+
+
+def test_client_bypasses_the_cache_for_uncacheable_paths(stub):
+    client = EmbyClient(stub.url, "test", cache=ResponseCache())
+    before = upstream_requests(stub, "system_info")
+
+    for _ in range(2):
+        assert client._make_request("/emby/System/Info/Public")
+
+    assert upstream_requests(stub, "system_info") == before + 2
+    assert client.cache.stats()["entries"] == 0
+
+
+def test_client_bypasses_the_cache_for_non_get_requests(stub):
+    client = EmbyClient(stub.url, "test", cache=ResponseCache())
+
+    for _ in range(2):
+        client._make_request("/emby/System/Info", method="POST")
+
+    stats = client.cache.stats()
+    assert stats["entries"] == 0
+    assert stats["hits"] == stats["misses"] == 0
@@ -0,0 +1,72 @@
+"""Tests for search_index.py."""
+
+# Standard library imports
+import time
+
+# Local imports
+from emby_client import EmbyClient
+from search_index import LibraryIndexer, SearchIndex
+
+
+class FlakyClient(EmbyClient):
+    """EmbyClient whose first library listings fail."""
+
+    def __init__(self, *args, failures: int = 2, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures = failures
+
+    def get_libraries(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Emby is starting")
+        return super().get_libraries()
+
+
+def test_first_build_is_retried_with_backoff(stub):
+    client = FlakyClient(stub.url, "test", cache=None)
+    index = SearchIndex()
+    indexer = LibraryIndexer(
+        client, index, refresh_interval=3600, retry_delay=0.05
+    )
+    indexer.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not index.loaded and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        indexer.stop()
+
+    assert index.loaded
+    assert client.failures == 0
+    assert index.search("an")
+
+
+class HookedClient(EmbyClient):
+    """EmbyClient that runs a callback while the person list loads."""
+
+    on_persons = None
+
+    def iter_persons(self, *args, **kwargs):
+        if self.on_persons:
+            self.on_persons()
+        return super().iter_persons(*args, **kwargs)
+
+
+def test_changes_during_a_rebuild_survive_the_swap(stub):
+    client = HookedClient(stub.url, "test", cache=None)
+    index = SearchIndex()
+    indexer = LibraryIndexer(client, index)
+    indexer.rebuild()
+    removed = stub.state.library.item_id(0)
+    assert index.get(removed)
+
+    def remove_during_rebuild():
+        # The libraries are already in the fresh index by now
+        indexer._apply_change({"ItemsRemoved": [removed]})
+        assert index.get(removed) is None
+
+    client.on_persons = remove_during_rebuild
+    indexer.rebuild()
+
+    assert index.get(removed) is None
+    assert index.loaded
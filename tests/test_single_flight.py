@@ -0,0 +1,111 @@
+"""Tests for single_flight.py and request coalescing in EmbyClient."""
+
+# Standard library imports
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party imports
+import pytest
+import requests
+
+# Local imports
+from emby_client import EmbyClient
+from emby_stub import StubServer, SyntheticLibrary
+from response_cache import ResponseCache
+from single_flight import SingleFlight
+
+CALLERS = 8
+
+
+def slow_stub(**options):
+    return StubServer(
+        SyntheticLibrary(items=100, persons=20),
+        api_key="test",
+        latency=0.2,
+        **options,
+    ).start()
+
+
+def upstream_requests(stub, route):
+    return requests.get(f"{stub.url}/stub/stats").json()["by_route"].get(
+        route, 0
+    )
+
+
+def call_together(fn):
+    """Call fn from CALLERS threads released at the same time."""
+    barrier = threading.Barrier(CALLERS)
+
+    def call():
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        futures = [pool.submit(call) for _ in range(CALLERS)]
+    return [future.result() for future in futures]
+
+
+def test_concurrent_identical_gets_make_one_upstream_call():
+    stub = slow_stub()
+    try:
+        client = EmbyClient(stub.url, "test", cache=None)
+        results = call_together(client.get_system_info)
+
+        assert upstream_requests(stub, "system_info") == 1
+        assert all(result == results[0] for result in results)
+        assert results[0]["Id"]
+        assert client.single_flight.stats()["coalesced"] == CALLERS - 1
+    finally:
+        stub.stop()
+
+
+def test_failed_upstream_call_is_shared_but_not_cached():
+    stub = slow_stub(error_rate=1.0)
+    try:
+        client = EmbyClient(stub.url, "test", cache=ResponseCache())
+        assert call_together(client.get_system_info) == [None] * CALLERS
+        assert upstream_requests(stub, "system_info") == 1
+
+        # The error was not cached: the next call goes upstream again
+        assert client.get_system_info() is None
+        assert upstream_requests(stub, "system_info") == 2
+    finally:
+        stub.stop()
+
+
+def test_leader_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        release.wait(5)
+        raise ConnectionError("upstream down")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except ConnectionError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        futures = [pool.submit(call) for _ in range(CALLERS)]
+        deadline = time.monotonic() + 5
+        while (
+            flight.stats()["coalesced"] < CALLERS - 1
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.01)
+        release.set()
+    errors = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(isinstance(e, ConnectionError) for e in errors)
+    assert flight.stats()["in_flight"] == 0
+
+    # Nothing is remembered: a later call runs again
+    with pytest.raises(ConnectionError):
+        flight.do("key", fail)
+    assert len(calls) == 2
@@ -0,0 +1,137 @@
+"""Fixed-size worker pool that loads thumbnails in priority order."""
+
+# Standard library imports
+import itertools
+import queue
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Lower values run first. Within a priority, jobs run in submission order,
+# so cards added top-down load top-down.
+PRIORITY_DIALOG = 0
+PRIORITY_VISIBLE = 1
+PRIORITY_GRID = 2
+
+
+class ThumbnailJob:
+    """A queued thumbnail load that can be cancelled before it runs."""
+
+    def __init__(
+        self,
+        loader: "ThumbnailLoader",
+        fn: Callable,
+        args: tuple,
+        group: Optional[Hashable],
+        generation: int,
+    ):
+        self.loader = loader
+        self.fn = fn
+        self.args = args
+        self.group = group
+        self.generation = generation
+        self.done = False
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        """True if the job or its whole group has been cancelled."""
+        return self._cancelled or (
+            self.group is not None
+            and self.loader.generation(self.group) != self.generation
+        )
+
+    def cancel(self):
+        """Skip this job if it has not started yet."""
+        self._cancelled = True
+
+
+class ThumbnailLoader:
+    """
+    Run thumbnail jobs on a fixed number of worker threads.
+
+    Jobs are taken from a priority queue, so dialog images overtake
+    grid images queued earlier. Jobs submitted with a group can be
+    dropped in bulk with cancel_group() when the widgets they would fill
+    are torn down; cancelled jobs are discarded when dequeued.
+    """
+
+    def __init__(self, workers: int = 4):
+        """
+        Start the worker threads.
+
+        Args:
+            workers: Number of concurrent thumbnail downloads
+        """
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._generations: Dict[Hashable, int] = {}
+        self.completed = 0
+        self.cancelled = 0
+        self._threads = [
+            threading.Thread(
+                target=self._run, name=f"thumbnail-{i}", daemon=True
+            )
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def generation(self, group: Hashable) -> int:
+        """Return the current generation of a cancellation group."""
+        with self._lock:
+            return self._generations.get(group, 0)
+
+    def submit(
+        self,
+        fn: Callable,
+        *args: Any,
+        priority: int = PRIORITY_GRID,
+        group: Optional[Hashable] = None,
+    ) -> ThumbnailJob:
+        """
+        Queue fn(*args) to run on a worker.
+
+        Args:
+            fn: Function doing the download/decode work
+            *args: Arguments for fn
+            priority: One of the PRIORITY_* constants, lowest runs first
+            group: Optional cancellation group, e.g. the grid being filled
+
+        Returns:
+            The queued job
+        """
+        generation = self.generation(group) if group is not None else 0
+        job = ThumbnailJob(self, fn, args, group, generation)
+        self._queue.put((priority, next(self._sequence), job))
+        return job
+
+    def cancel_group(self, group: Hashable):
+        """Drop every not-yet-started job submitted with this group."""
+        with self._lock:
+            self._generations[group] = self._generations.get(group, 0) + 1
+
+    def pending(self) -> int:
+        """Return the number of queued jobs, including cancelled ones."""
+        return self._queue.qsize()
+
+    def stop(self):
+        """Stop the workers once they finish their current job."""
+        for _ in self._threads:
+            self._queue.put((-1, next(self._sequence), None))
+
+    def _run(self):
+        """Worker loop: run queued jobs until a stop sentinel arrives."""
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            if job.cancelled:
+                self.cancelled += 1
+                continue
+            try:
+                job.fn(*job.args)
+            except Exception as e:
+                print(f"Error loading thumbnail: {e}")
+            job.done = True
+            self.completed += 1